@@ -0,0 +1,73 @@
+# game_data/calc_classe/batch_scorer.py
+
+from typing import Dict, Optional
+import numpy as np
+from .champion_class_config import ChampionClass, WeightSet
+
+class BatchScorer:
+    """
+    Version vectorisée de MatchScoreCalculator pour scorer des millions de
+    participants d'un coup (tableaux numpy en colonnes).
+
+    Colonnes attendues (une valeur par participant) :
+        is_tank, kills, assists, team_kills, total_damage_dealt_to_champions,
+        total_damage_taken, damage_self_mitigated, total_time_crowd_control_dealt,
+        vision_score
+    """
+
+    def __init__(self, weight_set: Optional[WeightSet] = None):
+        self.weight_set = weight_set or WeightSet()
+
+        # Pondérations indexées par is_tank (0 = DPS, 1 = TANK)
+        classes = [ChampionClass.DPS, ChampionClass.TANK]
+        self.damage_weights = np.array([self.weight_set.weights[c].damage for c in classes])
+        self.kp_weights = np.array([self.weight_set.weights[c].kill_participation for c in classes])
+        self.tank_weights = np.array([self.weight_set.weights[c].tank for c in classes])
+        self.utility_weights = np.array([self.weight_set.weights[c].utility for c in classes])
+
+        # Tables de points indexées par [victoire, rang]
+        max_rank = max(max(self.weight_set.victory_points), max(self.weight_set.defeat_points))
+        self.points_table = np.zeros((2, max_rank + 1), dtype=np.int64)
+        for rank, points in self.weight_set.defeat_points.items():
+            self.points_table[0, rank] = points
+        for rank, points in self.weight_set.victory_points.items():
+            self.points_table[1, rank] = points
+
+    def performance_scores(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """Calcule le score de performance de chaque participant"""
+        is_tank = columns['is_tank'].astype(np.intp)
+        team_kills = np.where(columns['team_kills'] > 0, columns['team_kills'], 1)
+        kill_participation = (columns['kills'] + columns['assists']) / team_kills * 100
+
+        damage_score = columns['total_damage_dealt_to_champions'].astype(np.float64)
+        tank_score = columns['total_damage_taken'] + columns['damage_self_mitigated'].astype(np.float64)
+        utility_score = columns['total_time_crowd_control_dealt'] + columns['vision_score'] * 100.0
+
+        return (
+            damage_score * self.damage_weights[is_tank] +
+            kill_participation * self.kp_weights[is_tank] +
+            tank_score * self.tank_weights[is_tank] +
+            utility_score * self.utility_weights[is_tank]
+        )
+
+    @staticmethod
+    def rank_in_groups(groups: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        """
+        Rang (1 = meilleur score) de chaque participant dans son groupe (équipe).
+        """
+        order = np.lexsort((-scores, groups))
+        sorted_groups = groups[order]
+
+        # Début de chaque groupe dans l'ordre trié
+        starts = np.ones(len(order), dtype=bool)
+        starts[1:] = sorted_groups[1:] != sorted_groups[:-1]
+        group_start = np.maximum.accumulate(np.where(starts, np.arange(len(order)), 0))
+
+        ranks = np.empty(len(order), dtype=np.int64)
+        ranks[order] = np.arange(len(order)) - group_start + 1
+        return ranks
+
+    def points(self, ranks: np.ndarray, wins: np.ndarray) -> np.ndarray:
+        """Points attribués selon le rang et la victoire/défaite"""
+        clipped = np.where((ranks > 0) & (ranks < self.points_table.shape[1]), ranks, 0)
+        return self.points_table[wins.astype(np.intp), clipped]
@@ -1,5 +1,6 @@
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field, asdict
+from typing import Dict
 
 class ChampionClass(Enum):
     """Types de classes de champions"""
@@ -12,34 +13,65 @@ class ClassCoefficients:
     rd: float  # Coefficient de dégâts
     rt: float  # Coefficient tank
 
+@dataclass(frozen=True)
+class PerformanceWeights:
+    """Pondération des composantes du score de performance"""
+    damage: float = 0.0              # Dégâts aux champions
+    kill_participation: float = 0.0  # Participation aux kills
+    tank: float = 0.0                # Dégâts subis + mitigés
+    utility: float = 0.0             # CC + vision
+
 class ChampionClassConfig:
     """Configuration des coefficients pour chaque classe de champion"""
-    
+
     # Coefficients par classe
     COEFFICIENTS = {
         ChampionClass.DPS: ClassCoefficients(rd=1, rt=1),
         ChampionClass.TANK: ClassCoefficients(rd=1, rt=1)
     }
-    
+
+    # Pondération du score de performance par classe
+    PERFORMANCE_WEIGHTS = {
+        ChampionClass.DPS: PerformanceWeights(damage=0.6, kill_participation=0.3, utility=0.1),
+        ChampionClass.TANK: PerformanceWeights(damage=0.2, kill_participation=0.3, tank=0.5)
+    }
+
+    # Points selon le rang dans l'équipe
+    VICTORY_POINTS = {
+        1: 400,   # 1er
+        2: 300,   # 2ème
+        3: 200,   # 3ème
+        4: 100,   # 4ème
+        5: -100   # 5ème
+    }
+
+    DEFEAT_POINTS = {
+        1: 100,    # 1er
+        2: -100,   # 2ème
+        3: -200,   # 3ème
+        4: -300,   # 4ème
+        5: -400    # 5ème
+    }
+
     @staticmethod
     def get_coefficients(champion_class: ChampionClass) -> ClassCoefficients:
         """
         Récupère les coefficients pour une classe de champion donnée
-        
+
         Args:
             champion_class: La classe du champion (DPS ou TANK)
-            
+
         Returns:
             ClassCoefficients contenant rd et rt
-            
+
         Raises:
             ValueError si la classe n'existe pas
         """
         if champion_class not in ChampionClassConfig.COEFFICIENTS:
             raise ValueError(f"Classe de champion non reconnue: {champion_class}")
-            
+
         return ChampionClassConfig.COEFFICIENTS[champion_class]
-        
+
     @staticmethod
     def is_valid_class(champion_class: str) -> bool:
         """Vérifie si une classe est valide"""
@@ -47,4 +79,63 @@ class ChampionClassConfig:
             ChampionClass(champion_class.upper())
             return True
         except ValueError:
-            return False
\ No newline at end of file
+            return False
+
+@dataclass
+class WeightSet:
+    """
+    Jeu complet de paramètres du scoring : pondérations par classe et
+    tables de points. Permet de tester d'autres réglages sans modifier
+    la configuration.
+    """
+    weights: Dict[ChampionClass, PerformanceWeights] = field(
+        default_factory=lambda: dict(ChampionClassConfig.PERFORMANCE_WEIGHTS)
+    )
+    victory_points: Dict[int, int] = field(
+        default_factory=lambda: dict(ChampionClassConfig.VICTORY_POINTS)
+    )
+    defeat_points: Dict[int, int] = field(
+        default_factory=lambda: dict(ChampionClassConfig.DEFEAT_POINTS)
+    )
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'WeightSet':
+        """
+        Construit un jeu de paramètres depuis un dictionnaire (JSON).
+        Les valeurs absentes reprennent la configuration actuelle.
+
+        Format :
+            {
+                "weights": {"DPS": {"damage": 0.5, ...}, "TANK": {...}},
+                "victory_points": {"1": 400, ...},
+                "defeat_points": {"1": 100, ...}
+            }
+
+        Raises:
+            ValueError si une classe ou une composante est inconnue
+        """
+        weight_set = cls()
+        for class_name, values in data.get('weights', {}).items():
+            if not ChampionClassConfig.is_valid_class(class_name):
+                raise ValueError(f"Classe de champion non reconnue: {class_name}")
+            champion_class = ChampionClass(class_name.upper())
+            try:
+                weight_set.weights[champion_class] = PerformanceWeights(
+                    **{**asdict(weight_set.weights[champion_class]), **values}
+                )
+            except TypeError as e:
+                raise ValueError(f"Pondération invalide pour {class_name}: {e}")
+
+        for key in ('victory_points', 'defeat_points'):
+            table = getattr(weight_set, key)
+            for rank, points in data.get(key, {}).items():
+                table[int(rank)] = int(points)
+        return weight_set
+
+    def to_dict(self) -> Dict:
+        """Représentation sérialisable en JSON"""
+        return {
+            'weights': {c.value: asdict(w) for c, w in self.weights.items()},
+            'victory_points': {str(k): v for k, v in self.victory_points.items()},
+            'defeat_points': {str(k): v for k, v in self.defeat_points.items()},
+        }
@@ -1,25 +1,35 @@
 # game_data/calc_classe/new_calculator.py
 
-from typing import Dict
-from .champion_class_config import ChampionClass, ChampionClassConfig
+from typing import Callable, Dict, Optional
+from .champion_class_config import ChampionClass, ChampionClassConfig, WeightSet
+
+# Configuration actuelle, partagée par tous les calculateurs
+DEFAULT_WEIGHT_SET = WeightSet()
 
 class MatchScoreCalculator:
-    def __init__(self, champion_class: ChampionClass):
+    def __init__(self, champion_class: ChampionClass, weight_set: Optional[WeightSet] = None):
         """
         Initialise le calculateur avec la classe du champion
         
         Args:
             champion_class: ChampionClass.DPS ou ChampionClass.TANK
+            weight_set: Pondérations et tables de points (configuration actuelle par défaut)
         """
         self.champion_class = champion_class
         self.coefficients = ChampionClassConfig.get_coefficients(champion_class)
+        self.weight_set = weight_set or DEFAULT_WEIGHT_SET
+        self.weights = self.weight_set.weights[champion_class]
 
-    def calculate_performance_score(self, stats: Dict) -> float:
+    def calculate_performance_score(self, stats: Dict,
+                                    percentile: Optional[Callable[[str, float], float]] = None) -> float:
         """
         Calcule le score de performance selon la classe du champion
         
         Args:
             stats: Statistiques du joueur
+            percentile: Fonction optionnelle (stat, valeur) -> percentile 0-100 du champion.
+                Si fournie, chaque composante est remplacée par son percentile pour
+                que les dégâts ne dominent pas la participation aux kills.
             
         Returns:
             Score de performance qui servira à classer le joueur
@@ -38,40 +48,25 @@ class MatchScoreCalculator:
         # Score d'utilité (CC + vision)
         utility_score = stats['total_time_crowd_control_dealt'] + (stats['vision_score'] * 100)
 
-        # Calculer le score selon la classe
-        if self.champion_class == ChampionClass.TANK:
-            return (
-                (tank_score * 0.5) +          # 50% tank
-                (kill_participation * 0.3) +   # 30% participation
-                (damage_score * 0.2)          # 20% dégâts
-            )
-        else:  # DPS
-            return (
-                (damage_score * 0.6) +        # 60% dégâts
-                (kill_participation * 0.3) +   # 30% participation
-                (utility_score * 0.1)         # 10% utility
-            )
+        # Normalisation par rapport aux autres parties du même champion
+        if percentile is not None:
+            kill_participation = percentile('kill_participation', kill_participation)
+            damage_score = percentile('total_damage_dealt_to_champions', damage_score)
+            tank_score = percentile('tank_score', tank_score)
+            utility_score = percentile('utility_score', utility_score)
+
+        # Calculer le score selon les pondérations de la classe
+        return (
+            (damage_score * self.weights.damage) +
+            (kill_participation * self.weights.kill_participation) +
+            (tank_score * self.weights.tank) +
+            (utility_score * self.weights.utility)
+        )
 
     def calculate_score(self, stats: Dict, rank_in_team: int, is_victory: bool) -> int:
         """
         Calcule le score final en fonction du rang dans l'équipe et du résultat
         """
         # Points selon le rang et la victoire/défaite
-        victory_points = {
-            1: 400,   # 1er
-            2: 300,   # 2ème
-            3: 200,   # 3ème
-            4: 100,   # 4ème
-            5: -100   # 5ème
-        }
-
-        defeat_points = {
-            1: 100,    # 1er
-            2: -100,   # 2ème
-            3: -200,   # 3ème
-            4: -300,   # 4ème
-            5: -400    # 5ème
-        }
-
-        points_table = victory_points if is_victory else defeat_points
+        points_table = self.weight_set.victory_points if is_victory else self.weight_set.defeat_points
         return points_table.get(rank_in_team, 0)
\ No newline at end of file
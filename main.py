@@ -1,5 +1,8 @@
-from tilttracker.modules.discord_bot import TiltTrackerBot
+from tilttracker.modules.discord_bot import create_bot
 from tilttracker.modules.match_watcher import MatchWatcher
+from tilttracker.modules.outbox_worker import OutboxWorker
+from tilttracker.modules.services import ServiceContainer
+from tilttracker.utils.metrics import start_metrics_server
 import asyncio
 import os
 import platform
@@ -27,11 +30,11 @@ def check_environment():
     logger.info("Chargement du fichier .env...")
     load_dotenv(override=True)
     
-    # Liste des variables requises
+    # Liste des variables requises (DISCORD_WEBHOOK_URL est facultative :
+    # les publications peuvent passer uniquement par les routes par serveur)
     required_vars = {
         'DISCORD_TOKEN': os.getenv('DISCORD_TOKEN'),
-        'RIOT_API_KEY': os.getenv('RIOT_API_KEY'),
-        'DISCORD_WEBHOOK_URL': os.getenv('DISCORD_WEBHOOK_URL')  # Ajout du webhook
+        'RIOT_API_KEY': os.getenv('RIOT_API_KEY')
     }
     
     # Vérification de chaque variable
@@ -78,10 +81,7 @@ async def run_match_watcher(watcher: MatchWatcher):
             
             logger.info(f"Nombre total de joueurs enregistrés: {len(players)}")
             
-            for player in players:
-                logger.info(f"Traitement du joueur: {player['summoner_name']}#{player['tag_line']}")
-                await watcher.process_new_matches(player)
-                await asyncio.sleep(5)  # Pause entre chaque joueur
+            await watcher.process_players(players, pause=5)
                 
             logger.info("=== Fin de la vérification des parties ===")
             logger.info("Attente de 60 secondes avant la prochaine vérification...")
@@ -106,19 +106,33 @@ async def main():
         env_vars = check_environment()
         riot_api_key = env_vars['RIOT_API_KEY']
         
+        # Services partagés : une connexion PostgreSQL, une session Riot
+        # (un seul budget de limites de taux) et un publisher Discord
+        services = ServiceContainer(riot_api_key)
+        
         logger.info("=== Initialisation du Bot ===")
         logger.info("Création de l'instance du bot...")
-        bot = TiltTrackerBot(riot_api_key=riot_api_key)
+        bot = create_bot(services)
         
         # Initialisation du watcher
         logger.info("=== Initialisation du Match Watcher ===")
-        watcher = MatchWatcher(riot_api_key=riot_api_key)
+        watcher = MatchWatcher(services=services)
+        
+        # Publication des résultats
+        outbox_worker = OutboxWorker(services.db, services.discord_publisher, services.publish_router)
+        
+        # Exposition des métriques (optionnelle)
+        metrics_runner = None
+        if os.getenv('METRICS_PORT'):
+            metrics_runner = await start_metrics_server(int(os.getenv('METRICS_PORT')))
+            logger.info(f"Métriques exposées sur le port {os.getenv('METRICS_PORT')} (/metrics)")
         
         # Création des tâches asynchrones
         logger.info("Démarrage des services...")
         tasks = [
             asyncio.create_task(bot.start(env_vars['DISCORD_TOKEN'])),
-            asyncio.create_task(run_match_watcher(watcher))
+            asyncio.create_task(run_match_watcher(watcher)),
+            asyncio.create_task(outbox_worker.run())
         ]
         
         # Exécution des tâches
@@ -131,7 +145,13 @@ async def main():
             # Nettoyage
             for task in tasks:
                 task.cancel()
-            watcher.cleanup()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if not bot.is_closed():
+                await bot.close()
+            # Publications en file, session Riot et connexion PostgreSQL
+            await services.close()
+            if metrics_runner:
+                await metrics_runner.cleanup()
             
     except Exception as e:
         logger.error("=== Erreur Critique ===")
@@ -1,5 +1,6 @@
 import sys
 import os
+import hmac
 from pathlib import Path
 import logging
 from typing import Optional
@@ -15,8 +16,9 @@ current_dir = Path(__file__).resolve().parent
 sys.path.append(str(current_dir))
 
 import uvicorn
-from fastapi import Request, HTTPException
+from fastapi import Request, HTTPException, Header
 from tilttracker.modules.web import create_app
+from tilttracker.modules.whatif import run_simulation
 from tilttracker.utils.database import Database
 from tilttracker.modules.teamspeak_manager import TeamSpeakManager
 import asyncio
@@ -62,9 +64,11 @@ async def home(request: Request):
     )
 
 @app.get("/leaderboard")
-async def leaderboard(request: Request):
+async def leaderboard(request: Request, sort: str = "score"):
+    if sort not in ("score", "rating"):
+        raise HTTPException(status_code=400, detail="Tri invalide")
     try:
-        players = await db.get_leaderboard(limit=100)
+        players = await db.get_leaderboard(limit=100, order_by=sort)
         return templates.TemplateResponse(
             "leaderboard.html",
             {
@@ -220,6 +224,24 @@ async def compare_players(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/admin/whatif")
+async def whatif(request: Request, top: Optional[int] = None,
+                 x_admin_token: Optional[str] = Header(None)):
+    """Simule le classement avec un autre jeu de pondérations (rien n'est écrit)"""
+    admin_token = os.getenv('ADMIN_TOKEN')
+    if not admin_token or not hmac.compare_digest((x_admin_token or '').encode(), admin_token.encode()):
+        raise HTTPException(status_code=403, detail="Accès refusé")
+
+    weights = await request.json()
+    try:
+        return await asyncio.to_thread(run_simulation, weights, top)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Erreur lors de la simulation: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.post("/poke/{client_id}")
 async def poke_user(request: Request, client_id: str):
     try:
@@ -0,0 +1,225 @@
+# tests/bench_match_decoding.py
+"""
+Benchmark du décodage des payloads match-v5.
+
+Compare le chemin historique (response.json() : décodage complet avec la
+bibliothèque standard) aux décodeurs sélectifs de match_decoder, sur des
+payloads enregistrés (--fixtures) ou, à défaut, sur une partie synthétique
+de taille réaliste (~130 champs par participant, challenges et perks).
+
+Pour chaque décodeur :
+- temps de décodage + parse_match par partie (meilleur de `repeat` séries)
+- pic mémoire pendant le décodage (tracemalloc)
+- mémoire retenue par le payload décodé, avant parse_match
+
+    python -m tests.bench_match_decoding --output bench_results/match_decoding.json
+    python -m tests.bench_match_decoding --fixtures recorded/EUW1_*.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from tilttracker.modules.match_decoder import DECODERS
+from tilttracker.modules.match_records import parse_match
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Chemin historique : tout le payload devient des objets Python
+BASELINE = 'json_full'
+
+# Champs d'un participant match-v5 (hors challenges, perks et missions)
+PARTICIPANT_KEYS = [
+    'allInPings', 'assistMePings', 'assists', 'baronKills', 'basicPings', 'bountyLevel', 'champExperience',
+    'champLevel', 'championId', 'championName', 'championTransform', 'commandPings', 'consumablesPurchased',
+    'damageDealtToBuildings', 'damageDealtToObjectives', 'damageDealtToTurrets', 'damageSelfMitigated',
+    'dangerPings', 'deaths', 'detectorWardsPlaced', 'doubleKills', 'dragonKills', 'eligibleForProgression',
+    'enemyMissingPings', 'enemyVisionPings', 'firstBloodAssist', 'firstBloodKill', 'firstTowerAssist',
+    'firstTowerKill', 'gameEndedInEarlySurrender', 'gameEndedInSurrender', 'getBackPings', 'goldEarned',
+    'goldSpent', 'holdPings', 'individualPosition', 'inhibitorKills', 'inhibitorTakedowns',
+    'inhibitorsLost', 'item0', 'item1', 'item2', 'item3', 'item4', 'item5', 'item6', 'itemsPurchased',
+    'killingSprees', 'kills', 'lane', 'largestCriticalStrike', 'largestKillingSpree', 'largestMultiKill',
+    'longestTimeSpentLiving', 'magicDamageDealt', 'magicDamageDealtToChampions', 'magicDamageTaken',
+    'needVisionPings', 'neutralMinionsKilled', 'nexusKills', 'nexusLost', 'nexusTakedowns',
+    'objectivesStolen', 'objectivesStolenAssists', 'onMyWayPings', 'participantId', 'pentaKills',
+    'physicalDamageDealt', 'physicalDamageDealtToChampions', 'physicalDamageTaken', 'placement',
+    'playerAugment1', 'playerAugment2', 'playerAugment3', 'playerAugment4', 'playerSubteamId',
+    'profileIcon', 'pushPings', 'puuid', 'quadraKills', 'riotIdGameName', 'riotIdTagline', 'role',
+    'sightWardsBoughtInGame', 'spell1Casts', 'spell2Casts', 'spell3Casts', 'spell4Casts',
+    'subteamPlacement', 'summoner1Casts', 'summoner1Id', 'summoner2Casts', 'summoner2Id', 'summonerId',
+    'summonerLevel', 'summonerName', 'teamEarlySurrendered', 'teamId', 'teamPosition',
+    'timeCCingOthers', 'timePlayed', 'totalAllyJungleMinionsKilled', 'totalDamageDealt',
+    'totalDamageDealtToChampions', 'totalDamageShieldedOnTeammates', 'totalDamageTaken',
+    'totalEnemyJungleMinionsKilled', 'totalHeal', 'totalHealsOnTeammates', 'totalMinionsKilled',
+    'totalTimeCCDealt', 'totalTimeSpentDead', 'totalUnitsHealed', 'tripleKills', 'trueDamageDealt',
+    'trueDamageDealtToChampions', 'trueDamageTaken', 'turretKills', 'turretTakedowns', 'turretsLost',
+    'unrealKills', 'visionClearedPings', 'visionScore', 'visionWardsBoughtInGame', 'wardsKilled',
+    'wardsPlaced', 'win',
+]
+
+
+def synthetic_match(seed: int = 42) -> bytes:
+    """Partie ARAM synthétique au format match-v5, de la taille d'un vrai payload"""
+    rng = random.Random(seed)
+    participants = []
+    for i in range(10):
+        participant = {key: rng.randint(0, 50000) for key in PARTICIPANT_KEYS}
+        participant.update({
+            'puuid': f"{rng.getrandbits(256):064x}{i:014d}",
+            'championName': rng.choice(['Ahri', 'Braum', 'Jinx', 'Leona', 'Lux', 'Sion', 'Zed']),
+            'riotIdGameName': f"Joueur{i}", 'riotIdTagline': 'EUW', 'summonerName': f"Joueur{i}",
+            'summonerId': f"{rng.getrandbits(192):048x}", 'individualPosition': 'Invalid',
+            'lane': 'NONE', 'role': 'SUPPORT', 'teamPosition': '', 'teamId': 100 if i < 5 else 200,
+            'win': i < 5, 'firstBloodKill': False, 'gameEndedInSurrender': False,
+            'challenges': {f"challenge{c}": round(rng.random() * 100, 3) for c in range(80)},
+            'missions': {f"playerScore{m}": rng.randint(0, 10) for m in range(12)},
+            'perks': {
+                'statPerks': {'defense': 5002, 'flex': 5008, 'offense': 5005},
+                'styles': [
+                    {'description': 'primaryStyle', 'style': 8100,
+                     'selections': [{'perk': 8112 + s, 'var1': rng.randint(0, 2000), 'var2': 0, 'var3': 0}
+                                    for s in range(4)]},
+                    {'description': 'subStyle', 'style': 8300,
+                     'selections': [{'perk': 8304 + s, 'var1': rng.randint(0, 50), 'var2': 0, 'var3': 0}
+                                    for s in range(2)]},
+                ],
+            },
+        })
+        participants.append(participant)
+
+    payload = {
+        'metadata': {'dataVersion': '2', 'matchId': 'EUW1_7000000000',
+                     'participants': [p['puuid'] for p in participants]},
+        'info': {
+            'endOfGameResult': 'GameComplete', 'gameCreation': 1729000000000, 'gameDuration': 1184,
+            'gameEndTimestamp': 1729001200000, 'gameId': 7000000000, 'gameMode': 'ARAM',
+            'gameName': 'teambuilder-match-7000000000', 'gameStartTimestamp': 1729000010000,
+            'gameType': 'MATCHED_GAME', 'gameVersion': '14.20.628.2518', 'mapId': 12, 'platformId': 'EUW1',
+            'queueId': 450, 'tournamentCode': '', 'participants': participants,
+            'teams': [{'teamId': team_id, 'win': team_id == 100, 'bans': [],
+                       'objectives': {name: {'first': False, 'kills': rng.randint(0, 5)}
+                                      for name in ('baron', 'champion', 'dragon', 'horde', 'inhibitor',
+                                                   'riftHerald', 'tower')}}
+                      for team_id in (100, 200)],
+        },
+    }
+    return json.dumps(payload).encode()
+
+
+def decoders() -> Dict[str, Callable[[bytes], Dict]]:
+    return {BASELINE: json.loads, **DECODERS}
+
+
+def _measure_memory(decode: Callable[[bytes], Dict], raw: bytes) -> Dict:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        payload = decode(raw)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del payload
+    return {'peak_bytes': peak - before, 'retained_bytes': retained - before}
+
+
+def vars_of(match) -> List[Dict]:
+    """Participants comparables entre décodeurs"""
+    return [dict(**participant, riot_id=participant.riot_id) for participant in match.participants]
+
+
+def run_benchmark(name: str, decode: Callable[[bytes], Dict], fixtures: List[bytes],
+                  iterations: int, repeat: int) -> Dict:
+    """Décodage + parse_match de toutes les parties, meilleur temps sur `repeat` séries"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for raw in fixtures:
+                parse_match('EUW1_1', decode(raw))
+        timings.append(time.perf_counter() - start)
+
+    matches = iterations * len(fixtures)
+    memory = [_measure_memory(decode, raw) for raw in fixtures]
+    result = {
+        'decoder': name,
+        'us_per_match': min(timings) * 1e6 / matches,
+        'peak_bytes': max(m['peak_bytes'] for m in memory),
+        'retained_bytes': max(m['retained_bytes'] for m in memory),
+    }
+    logger.info(f"{name:>10}: {result['us_per_match']:8.0f} µs/partie - pic {result['peak_bytes'] / 1024:6.0f} Ko "
+                f"- retenu {result['retained_bytes'] / 1024:6.0f} Ko")
+    return result
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark du décodage des parties match-v5")
+    parser.add_argument('--fixtures', nargs='*', default=[],
+                        help="Payloads match-v5 enregistrés (JSON brut de l'API)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--iterations', type=int, default=200,
+                        help="Passages sur l'ensemble des parties par série")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Nombre de séries (le meilleur temps est conservé)")
+    parser.add_argument('--output', default=os.path.join('bench_results', 'match_decoding.json'),
+                        help="Fichier JSON de sortie")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    logger.info("🏁 Début du benchmark du décodage des parties")
+
+    fixtures = []
+    for path in args.fixtures:
+        with open(path, 'rb') as f:
+            fixtures.append(f.read())
+    if not fixtures:
+        fixtures = [synthetic_match(args.seed)]
+        logger.info("Aucun payload enregistré fourni, partie synthétique utilisée")
+    logger.info(f"{len(fixtures)} partie(s), {sum(map(len, fixtures)) / len(fixtures) / 1024:.0f} Ko en moyenne")
+
+    # Tous les décodeurs doivent produire les mêmes enregistrements
+    reference = [vars_of(parse_match('EUW1_1', json.loads(raw))) for raw in fixtures]
+    for name, decode in decoders().items():
+        if [vars_of(parse_match('EUW1_1', decode(raw))) for raw in fixtures] != reference:
+            logger.error(f"❌ {name} ne produit pas les mêmes participants")
+            return 1
+
+    runs = [run_benchmark(name, decode, fixtures, args.iterations, args.repeat)
+            for name, decode in decoders().items()]
+    baseline = next(run for run in runs if run['decoder'] == BASELINE)
+    for run in runs:
+        run['speedup'] = baseline['us_per_match'] / run['us_per_match']
+
+    results = {
+        'benchmark': 'match_decoding',
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': f"{platform.system()} {platform.machine()}",
+        'fixtures': args.fixtures or ['synthetic'],
+        'payload_bytes': sum(map(len, fixtures)) // len(fixtures),
+        'runs': runs,
+    }
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    logger.info(f"Résultats écrits dans {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+# tests/bench_scoring.py
+"""
+Benchmark du pipeline de scoring (game_data/calc_classe).
+
+Génère des équipes synthétiques couvrant toutes les classes de champions puis
+mesure, pour 10, 10 000 et 1 000 000 de participants :
+- la résolution du calculateur via CalculatorFactory
+- le calcul scalaire de calculate_performance_score
+- l'attribution des rangs dans chaque équipe
+- le calcul des points via calculate_score
+
+Les résultats sont écrits en JSON pour pouvoir être comparés à une baseline :
+
+    python -m tests.bench_scoring --output bench_results/scoring.json
+    python -m tests.bench_scoring --baseline bench_results/baseline.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List
+
+from game_data.calc_classe.calculator_factory import CalculatorFactory
+from game_data.calc_classe.champion_class_config import ChampionClass
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = [10, 10_000, 1_000_000]
+TEAM_SIZE = 5
+PHASES = ['factory_lookup', 'performance_score', 'rank_assignment', 'calculate_score']
+
+# Plages de statistiques réalistes pour une partie d'ARAM
+STAT_RANGES = {
+    ChampionClass.DPS: {
+        'kills': (2, 25),
+        'deaths': (2, 15),
+        'assists': (5, 40),
+        'total_damage_dealt_to_champions': (15000, 70000),
+        'total_damage_taken': (10000, 40000),
+        'damage_self_mitigated': (3000, 25000),
+        'total_time_crowd_control_dealt': (20, 600),
+        'vision_score': (0, 15),
+    },
+    ChampionClass.TANK: {
+        'kills': (0, 12),
+        'deaths': (3, 15),
+        'assists': (10, 50),
+        'total_damage_dealt_to_champions': (8000, 40000),
+        'total_damage_taken': (25000, 80000),
+        'damage_self_mitigated': (20000, 90000),
+        'total_time_crowd_control_dealt': (100, 1500),
+        'vision_score': (0, 20),
+    },
+}
+
+
+def _champions_by_class(factory: CalculatorFactory) -> Dict[ChampionClass, List[str]]:
+    """Regroupe les IDs de champions par classe"""
+    champions = {champion_class: [] for champion_class in ChampionClass}
+    for champ in factory.champions_data.values():
+        champions[factory.get_champion_class_type(champ['key'])].append(champ['key'])
+    return champions
+
+
+def generate_participants(factory: CalculatorFactory, count: int, seed: int = 42) -> List[Dict]:
+    """
+    Génère des participants synthétiques regroupés en équipes de 5.
+
+    Les classes de champions sont tirées à tour de rôle pour que chaque
+    classe soit représentée quelle que soit la taille de l'échantillon.
+    """
+    rng = random.Random(seed)
+    champions = _champions_by_class(factory)
+    classes = list(champions)
+
+    participants = []
+    team_index = 0
+    while len(participants) < count:
+        team_id = 100 if team_index % 2 == 0 else 200
+        win = rng.random() < 0.5
+        team = []
+        for slot in range(min(TEAM_SIZE, count - len(participants))):
+            champion_class = classes[(len(participants) + slot) % len(classes)]
+            ranges = STAT_RANGES[champion_class]
+            stats = {stat: rng.randint(low, high) for stat, (low, high) in ranges.items()}
+            stats.update({
+                'champion_id': rng.choice(champions[champion_class]),
+                'team_id': team_id,
+                'team_index': team_index,
+                'win': win,
+            })
+            team.append(stats)
+
+        team_kills = sum(p['kills'] for p in team)
+        for stats in team:
+            stats['team_kills'] = team_kills
+        participants.extend(team)
+        team_index += 1
+
+    return participants
+
+
+def _time_phase(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run_benchmark(factory: CalculatorFactory, size: int, seed: int = 42, repeat: int = 3) -> Dict:
+    """
+    Exécute toutes les phases du scoring pour une taille donnée.
+    Chaque phase garde le meilleur temps sur `repeat` exécutions.
+    """
+    logger.info(f"Génération de {size:,} participants...")
+    participants = generate_participants(factory, size, seed)
+
+    calculators = []
+    scores = []
+    ranks = []
+    points = []
+
+    def factory_lookup():
+        calculators.extend(factory.get_calculator(str(p['champion_id'])) for p in participants)
+
+    def performance_score():
+        scores.extend(calc.calculate_performance_score(p) for calc, p in zip(calculators, participants))
+
+    def rank_assignment():
+        ranks.extend([0] * len(participants))
+        start = 0
+        while start < len(participants):
+            end = start
+            team_index = participants[start]['team_index']
+            while end < len(participants) and participants[end]['team_index'] == team_index:
+                end += 1
+            order = sorted(range(start, end), key=lambda i: scores[i], reverse=True)
+            for rank, i in enumerate(order, 1):
+                ranks[i] = rank
+            start = end
+
+    def calculate_score():
+        points.extend(
+            calc.calculate_score(stats=p, rank_in_team=rank, is_victory=p['win'])
+            for calc, p, rank in zip(calculators, participants, ranks)
+        )
+
+    timings = {name: [] for name in PHASES}
+    for _ in range(repeat):
+        for output in (calculators, scores, ranks, points):
+            output.clear()
+        for name, func in zip(PHASES, [factory_lookup, performance_score, rank_assignment, calculate_score]):
+            timings[name].append(_time_phase(func))
+
+    phases = {}
+    for name in PHASES:
+        seconds = min(timings[name])
+        phases[name] = {
+            'seconds': seconds,
+            'ns_per_participant': seconds * 1e9 / size,
+            'participants_per_second': size / seconds if seconds > 0 else None,
+        }
+        logger.info(f"[{size:,}] {name}: {seconds:.4f}s ({phases[name]['ns_per_participant']:.0f} ns/participant)")
+
+    total = sum(phase['seconds'] for phase in phases.values())
+    return {
+        'participants': size,
+        'phases': phases,
+        'total_seconds': total,
+        'checksum': sum(points),
+    }
+
+
+def compare_with_baseline(results: Dict, baseline: Dict, tolerance: float,
+                          min_seconds: float = 0.001) -> List[str]:
+    """
+    Compare les résultats à une baseline.
+    Les phases trop courtes (< min_seconds) sont ignorées car trop bruitées.
+
+    Returns:
+        Liste des régressions dépassant la tolérance (vide si aucune)
+    """
+    regressions = []
+    baseline_runs = {run['participants']: run for run in baseline.get('runs', [])}
+    for run in results['runs']:
+        reference = baseline_runs.get(run['participants'])
+        if not reference:
+            continue
+        for name, phase in run['phases'].items():
+            ref_phase = reference['phases'].get(name)
+            if not ref_phase or ref_phase['seconds'] < min_seconds:
+                continue
+            ratio = phase['seconds'] / ref_phase['seconds']
+            phase['baseline_ratio'] = ratio
+            status = "❌" if ratio > 1 + tolerance else "✅"
+            logger.info(f"[{run['participants']:,}] {name}: x{ratio:.2f} par rapport à la baseline {status}")
+            if ratio > 1 + tolerance:
+                regressions.append(f"{run['participants']}:{name} x{ratio:.2f}")
+        if reference.get('checksum') is not None and reference['checksum'] != run['checksum']:
+            logger.warning(f"[{run['participants']:,}] checksum différent de la baseline "
+                           f"({run['checksum']} != {reference['checksum']}) : les scores ont changé")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark du système de scoring")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="Nombres de participants à tester")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Nombre d'exécutions par phase (le meilleur temps est conservé)")
+    parser.add_argument('--output', default=os.path.join('bench_results', 'scoring.json'),
+                        help="Fichier JSON de sortie")
+    parser.add_argument('--baseline', help="Fichier JSON de référence à comparer")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Ralentissement toléré par rapport à la baseline (0.2 = 20%%)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    logger.info("🏁 Début du benchmark du scoring")
+
+    factory = CalculatorFactory()
+    results = {
+        'benchmark': 'scoring',
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': f"{platform.system()} {platform.machine()}",
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'runs': [run_benchmark(factory, size, args.seed, args.repeat) for size in args.sizes],
+    }
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        results['regressions'] = regressions
+        if regressions:
+            logger.error(f"❌ Régressions détectées: {', '.join(regressions)}")
+            exit_code = 1
+        else:
+            logger.info("✅ Aucune régression par rapport à la baseline")
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    logger.info(f"Résultats écrits dans {args.output}")
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+# tests/test_batch_scorer.py
+import logging
+import random
+import numpy as np
+from game_data.calc_classe.batch_scorer import BatchScorer
+from game_data.calc_classe.new_calculator import MatchScoreCalculator
+from game_data.calc_classe.champion_class_config import ChampionClass, WeightSet
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+STAT_COLUMNS = [
+    'kills', 'assists', 'team_kills', 'total_damage_dealt_to_champions', 'total_damage_taken',
+    'damage_self_mitigated', 'total_time_crowd_control_dealt', 'vision_score'
+]
+
+
+def _random_participants(count: int, seed: int = 3):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        rows.append({
+            'is_tank': rng.random() < 0.3,
+            'kills': rng.randint(0, 20),
+            'assists': rng.randint(0, 25),
+            'team_kills': rng.randint(0, 50),
+            'total_damage_dealt_to_champions': rng.randint(2000, 60000),
+            'total_damage_taken': rng.randint(5000, 60000),
+            'damage_self_mitigated': rng.randint(0, 50000),
+            'total_time_crowd_control_dealt': rng.randint(0, 1500),
+            'vision_score': rng.randint(0, 100),
+        })
+    return rows
+
+
+def test_batch_matches_calculator():
+    """Le calcul vectorisé donne les mêmes scores que MatchScoreCalculator"""
+    weight_set = WeightSet.from_dict({'weights': {'DPS': {'damage': 0.4, 'utility': 0.3}}})
+    rows = _random_participants(500)
+    columns = {name: np.array([row[name] for row in rows]) for name in STAT_COLUMNS + ['is_tank']}
+
+    scores = BatchScorer(weight_set).performance_scores(columns)
+    for row, score in zip(rows, scores):
+        champion_class = ChampionClass.TANK if row['is_tank'] else ChampionClass.DPS
+        expected = MatchScoreCalculator(champion_class, weight_set).calculate_performance_score(row)
+        assert abs(score - expected) < 1e-6
+
+
+def test_rank_in_groups():
+    """Rang dans chaque équipe, indépendamment de l'ordre des lignes"""
+    groups = np.array([2, 1, 2, 1, 2])
+    scores = np.array([10.0, 5.0, 30.0, 7.0, 20.0])
+    ranks = BatchScorer.rank_in_groups(groups, scores)
+    assert ranks.tolist() == [3, 2, 1, 1, 2]
+
+
+def test_points_table():
+    """Points attribués selon le rang et le résultat"""
+    weight_set = WeightSet.from_dict({'victory_points': {'1': 500}})
+    scorer = BatchScorer(weight_set)
+    points = scorer.points(np.array([1, 5, 1, 0]), np.array([1, 1, 0, 1]))
+    calculator = MatchScoreCalculator(ChampionClass.DPS, weight_set)
+    assert points.tolist() == [
+        calculator.calculate_score({}, 1, True),
+        calculator.calculate_score({}, 5, True),
+        calculator.calculate_score({}, 1, False),
+        0,
+    ]
+
+
+def test_invalid_weight_set():
+    """Une classe ou composante inconnue est refusée"""
+    for data in ({'weights': {'MAGE': {'damage': 1}}}, {'weights': {'DPS': {'gold': 1}}}):
+        try:
+            WeightSet.from_dict(data)
+        except ValueError as e:
+            logger.info(f"Refusé: {e}")
+        else:
+            raise AssertionError(f"Jeu accepté à tort: {data}")
+
+
+if __name__ == "__main__":
+    test_batch_matches_calculator()
+    test_rank_in_groups()
+    test_points_table()
+    test_invalid_weight_set()
+    logger.info("✅ Tests terminés")
@@ -0,0 +1,50 @@
+# tests/test_bot_sharding.py
+import asyncio
+import logging
+import os
+from types import SimpleNamespace
+from discord.ext import commands
+from tilttracker.modules.discord_bot import ShardedTiltTrackerBot, TiltTrackerBot, create_bot
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def make_services():
+    return SimpleNamespace(riot_api=None, db=None, discord_publisher=None,
+                           command_cache=None, chart_renderer=None, load_shedder=None)
+
+
+def test_create_bot_modes():
+    """Mode auto-shardé sur option, intents réduits dans les deux modes"""
+    async def scenario():
+        os.environ['DISCORD_SHARDED'] = 'false'
+        single = create_bot(make_services())
+        os.environ['DISCORD_SHARDED'] = 'true'
+        os.environ['DISCORD_SHARD_COUNT'] = '4'
+        sharded = create_bot(make_services())
+        os.environ.pop('DISCORD_SHARDED')
+        os.environ.pop('DISCORD_SHARD_COUNT')
+        # Le client auto-shardé ne peut être fermé qu'après connexion
+        await single.close()
+        return single, sharded
+
+    single, sharded = asyncio.run(scenario())
+    assert type(single) is TiltTrackerBot
+    assert not isinstance(single, commands.AutoShardedBot)
+    assert isinstance(sharded, ShardedTiltTrackerBot)
+    assert isinstance(sharded, commands.AutoShardedBot)
+    assert sharded.shard_count == 4
+    for bot in (single, sharded):
+        assert not bot.intents.members
+        assert not bot.intents.presences
+        assert not bot.intents.typing
+        assert bot.intents.guilds
+
+
+if __name__ == "__main__":
+    test_create_bot_modes()
+    logger.info("✅ Tests terminés")
@@ -0,0 +1,95 @@
+# tests/test_champion_baselines.py
+import logging
+import random
+from tilttracker.utils.tdigest import TDigest
+from tilttracker.modules.champion_baselines import baseline_values, BASELINE_STATS
+from game_data.calc_classe.new_calculator import MatchScoreCalculator
+from game_data.calc_classe.champion_class_config import ChampionClass
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def test_tdigest_quantiles():
+    """Vérifie la précision du sketch sur une distribution de dégâts"""
+    rng = random.Random(7)
+    values = [rng.lognormvariate(10, 0.5) for _ in range(20000)]
+    digest = TDigest()
+    for value in values:
+        digest.update(value)
+
+    values.sort()
+    for q in (0.05, 0.25, 0.5, 0.75, 0.95):
+        true_value = values[int(q * len(values))]
+        estimated_rank = digest.cdf(true_value)
+        logger.info(f"q={q} - valeur={true_value:.0f} - rang estimé={estimated_rank:.4f}")
+        assert abs(estimated_rank - q) < 0.01
+
+    assert len(digest.means) < 200
+
+
+def test_tdigest_serialization():
+    """Vérifie l'aller-retour binaire du sketch"""
+    digest = TDigest()
+    for value in range(1000):
+        digest.update(value)
+
+    restored = TDigest.from_bytes(digest.to_bytes())
+    assert restored.count == digest.count
+    assert restored.min == 0 and restored.max == 999
+    assert abs(restored.quantile(0.5) - digest.quantile(0.5)) < 1
+    logger.info(f"Taille sérialisée: {len(digest.to_bytes())} octets pour 1000 valeurs")
+
+
+def test_percentile_table():
+    """La table O(1) doit donner les mêmes percentiles que le sketch"""
+    rng = random.Random(3)
+    digest = TDigest()
+    for _ in range(5000):
+        digest.update(rng.gauss(25000, 6000))
+
+    table = digest.percentile_table()
+    for value in (10000, 20000, 25000, 30000, 40000):
+        assert abs(table.lookup(value) - digest.cdf(value) * 100) < 1.0
+    assert table.lookup(-1) == 0.0
+    assert table.lookup(1e9) == 100.0
+
+    empty = TDigest().percentile_table()
+    assert empty.lookup(42) == 50.0
+
+
+def test_normalized_performance_score():
+    """Avec les percentiles, les dégâts ne dominent plus la participation aux kills"""
+    stats = {
+        'kills': 10,
+        'deaths': 5,
+        'assists': 20,
+        'team_kills': 40,
+        'total_damage_dealt_to_champions': 45000,
+        'total_damage_taken': 25000,
+        'damage_self_mitigated': 8000,
+        'total_time_crowd_control_dealt': 300,
+        'vision_score': 5,
+        'gold_earned': 14000,
+    }
+    values = baseline_values(stats)
+    assert set(values) == set(BASELINE_STATS)
+    assert values['kill_participation'] == 75.0
+
+    calculator = MatchScoreCalculator(ChampionClass.DPS)
+    raw_score = calculator.calculate_performance_score(stats)
+    normalized = calculator.calculate_performance_score(stats, lambda stat, value: 80.0)
+    logger.info(f"Score brut: {raw_score:.1f} - Score normalisé: {normalized:.1f}")
+    assert raw_score > 1000
+    assert abs(normalized - 80.0) < 1e-9
+
+
+if __name__ == "__main__":
+    test_tdigest_quantiles()
+    test_tdigest_serialization()
+    test_percentile_table()
+    test_normalized_performance_score()
+    logger.info("✅ Tests terminés")
@@ -0,0 +1,85 @@
+# tests/test_chart_renderer.py
+import asyncio
+import logging
+import time
+from tilttracker.modules.chart_renderer import ChartRenderer
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def make_history(games):
+    return [
+        {'score': (i % 7) - 2, 'win': i % 2 == 0, 'champion': 'Lux', 'kda': '5/2/10',
+         'match_id': f"EUW1_{1000 + i}"}
+        for i in range(games)
+    ]
+
+
+def test_render_and_cache():
+    """Le graphique est rendu dans le pool puis servi depuis le cache"""
+    renderer = ChartRenderer(max_workers=1, cache_size=8)
+    history = make_history(300)
+
+    async def scenario():
+        start = time.perf_counter()
+        # Demandes simultanées : un seul rendu
+        results = await asyncio.gather(*[renderer.score_chart('Alice', 'EUW', history) for _ in range(5)])
+        first = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cached = await renderer.score_chart('Alice', 'EUW', history)
+        second = time.perf_counter() - start
+
+        # Nouvelle partie : nouvelle image
+        updated = await renderer.score_chart('Alice', 'EUW', history + make_history(301)[-1:])
+        return results, cached, updated, first, second
+
+    try:
+        results, cached, updated, first, second = asyncio.run(scenario())
+    finally:
+        renderer.close()
+
+    logger.info(f"Premier rendu: {first * 1000:.0f}ms - depuis le cache: {second * 1000:.3f}ms")
+    key, image = results[0]
+    assert image.startswith(b'\x89PNG')
+    assert all(r == results[0] for r in results)
+    assert cached == results[0]
+    assert updated[0] != key
+    assert len(renderer.images) == 2
+    assert renderer.render_time.count == 2
+
+
+def test_cancelled_render_does_not_block_waiters():
+    """Un rendu abandonné par sa commande n'immobilise pas les demandes identiques"""
+    renderer = ChartRenderer(max_workers=1, cache_size=8)
+    renders = []
+
+    async def slow_render(title, scores, wins):
+        renders.append(title)
+        await asyncio.sleep(0.05)
+        return b'\x89PNG'
+
+    renderer._render = slow_render
+    history = make_history(10)
+
+    async def scenario():
+        first = asyncio.create_task(renderer.score_chart('Alice', 'EUW', history))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(renderer.score_chart('Alice', 'EUW', history))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await asyncio.wait_for(second, 1)
+
+    key, image = asyncio.run(scenario())
+    assert image == b'\x89PNG'
+    assert len(renders) == 2
+
+
+if __name__ == "__main__":
+    test_render_and_cache()
+    test_cancelled_render_does_not_block_waiters()
+    logger.info("✅ Tests terminés")
@@ -0,0 +1,143 @@
+# tests/test_command_cache.py
+import asyncio
+import logging
+from tilttracker.utils.cache import TTLCache, RANKING_TAG, player_tag
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingLoader:
+    """Simule une requête SQL lente et compte les appels"""
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return self.value
+
+
+def test_hits_and_expiry():
+    """Les commandes identiques sont servies depuis la mémoire jusqu'à expiration"""
+    clock = FakeClock()
+    cache = TTLCache(ttl=30, clock=clock)
+    loader = CountingLoader(['top'])
+
+    async def scenario():
+        # Rafale de /leaderboard simultanés : un seul chargement
+        results = await asyncio.gather(*[
+            cache.get_or_load('test_leaderboard', ('score',), loader, tags=(RANKING_TAG,))
+            for _ in range(20)
+        ])
+        assert all(r == ['top'] for r in results)
+        await cache.get_or_load('test_leaderboard', ('score',), loader)
+        assert loader.calls == 1
+        # Arguments différents : entrée différente
+        await cache.get_or_load('test_leaderboard', ('rating',), loader)
+        assert loader.calls == 2
+        clock.now = 31
+        await cache.get_or_load('test_leaderboard', ('score',), loader)
+        assert loader.calls == 3
+
+    asyncio.run(scenario())
+    rate = cache.hit_rates()['test_leaderboard']
+    logger.info(f"Taux de succès: {rate:.0%}")
+    assert abs(rate - 20 / 23) < 1e-9
+
+
+def test_invalidation():
+    """Une nouvelle partie invalide le classement et les commandes du joueur"""
+    cache = TTLCache(ttl=30)
+    stats = CountingLoader({'total_games': 1})
+    other = CountingLoader({'total_games': 5})
+    history = CountingLoader([])
+
+    async def scenario():
+        await cache.get_or_load('test_stats', ('Alice', 'EUW'), stats,
+                                tags=(RANKING_TAG, player_tag('Alice', 'EUW')))
+        await cache.get_or_load('test_graph', ('Alice', 'EUW'), history, tags=(player_tag('Alice', 'EUW'),))
+        await cache.get_or_load('test_graph', ('Bob', 'EUW'), other, tags=(player_tag('Bob', 'EUW'),))
+        assert cache.invalidate(RANKING_TAG, player_tag('Alice', 'EUW')) == 2
+        assert len(cache) == 1
+        await cache.get_or_load('test_stats', ('Alice', 'EUW'), stats)
+        await cache.get_or_load('test_graph', ('Bob', 'EUW'), other)
+        assert stats.calls == 2
+        assert other.calls == 1
+
+        # Un chargement commencé avant l'invalidation n'est pas conservé
+        task = asyncio.create_task(cache.get_or_load('test_graph', ('Alice', 'EUW'), history,
+                                                     tags=(player_tag('Alice', 'EUW'),)))
+        await asyncio.sleep(0)
+        cache.invalidate(player_tag('Alice', 'EUW'))
+        await task
+        await cache.get_or_load('test_graph', ('Alice', 'EUW'), history)
+        assert history.calls == 3
+
+    asyncio.run(scenario())
+
+
+def test_errors_not_cached():
+    """Une erreur SQL est propagée à tous les appelants et n'est pas mise en cache"""
+    cache = TTLCache(ttl=30)
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("base indisponible")
+
+    async def scenario():
+        results = await asyncio.gather(*[cache.get_or_load('test_error', (), failing) for _ in range(3)],
+                                       return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert len(calls) == 1
+        assert len(cache) == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_loader_does_not_block_waiters():
+    """Le premier appel annulé en plein chargement, l'appel en attente charge lui-même"""
+    cache = TTLCache(ttl=30)
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {'total_games': len(calls)}
+
+    async def scenario():
+        first = asyncio.create_task(cache.get_or_load('test_cancel', (), slow))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(cache.get_or_load('test_cancel', (), slow))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        value = await asyncio.wait_for(second, 1)
+        assert first.cancelled()
+        return value
+
+    value = asyncio.run(scenario())
+    assert value == {'total_games': 2}
+    assert len(calls) == 2
+
+
+if __name__ == "__main__":
+    test_hits_and_expiry()
+    test_invalidation()
+    test_errors_not_cached()
+    test_cancelled_loader_does_not_block_waiters()
+    logger.info("✅ Tests terminés")
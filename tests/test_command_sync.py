@@ -0,0 +1,55 @@
+# tests/test_command_sync.py
+import asyncio
+import logging
+import os
+import tempfile
+from types import SimpleNamespace
+from tilttracker.modules.discord_bot import TiltTrackerBot, CommandsCog
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def make_services():
+    return SimpleNamespace(riot_api=None, db=None, discord_publisher=None,
+                           command_cache=None, chart_renderer=None, load_shedder=None)
+
+
+def test_sync_only_on_change():
+    """La synchronisation n'a lieu que si les définitions changent"""
+    state_file = os.path.join(tempfile.mkdtemp(), 'sync_hash')
+
+    async def scenario():
+        bot = TiltTrackerBot(services=make_services())
+        bot.sync_state_file = state_file
+        await bot.add_cog(CommandsCog(bot))
+        calls = []
+
+        async def fake_sync():
+            calls.append(bot.command_tree_hash())
+            return []
+
+        bot.tree.sync = fake_sync
+        results = [await bot.sync_commands(), await bot.sync_commands()]
+
+        # Modification d'une description : nouvelle empreinte
+        bot.tree.get_command('ping').description = "Latence du bot"
+        results.append(await bot.sync_commands())
+        # Forçage par l'administrateur
+        results.append(await bot.sync_commands(force=True))
+        await bot.close()
+        return results, calls
+
+    results, calls = asyncio.run(scenario())
+    logger.info(f"Synchronisations: {results}")
+    assert results == [True, False, True, True]
+    assert len(calls) == 3
+    assert calls[0] != calls[1]
+
+
+if __name__ == "__main__":
+    test_sync_only_on_change()
+    logger.info("✅ Tests terminés")
@@ -0,0 +1,115 @@
+# tests/test_command_telemetry.py
+import asyncio
+import logging
+from types import SimpleNamespace
+import aiohttp
+from discord.ext import commands
+from tilttracker.modules.command_telemetry import (TimedService, command_summary, finish_command,
+                                                   record_error, start_command)
+from tilttracker.modules.discord_bot import CommandsCog
+from tilttracker.utils.metrics import REGISTRY, start_metrics_server
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class FakeDatabase:
+    connection = "connexion"
+
+    async def get_leaderboard(self):
+        await asyncio.sleep(0.02)
+        return []
+
+
+class FakeRiotAPI:
+    async def get_account_info(self, name, tag):
+        await asyncio.sleep(0.05)
+        return {'name': name}
+
+
+def make_ctx(name):
+    return SimpleNamespace(command=SimpleNamespace(qualified_name=name))
+
+
+def test_phase_timings():
+    """Les durées base/Riot sont attribuées à la commande en cours"""
+    db = TimedService(FakeDatabase(), 'db')
+    riot = TimedService(FakeRiotAPI(), 'riot')
+    assert db.connection == "connexion"
+
+    async def command():
+        ctx = make_ctx('test_telemetry')
+        start_command(ctx)
+        await db.get_leaderboard()
+        await riot.get_account_info('Alice', 'EUW')
+        await db.get_leaderboard()
+        finish_command(ctx)
+
+    async def scenario():
+        # Deux commandes concurrentes ne mélangent pas leurs mesures
+        await asyncio.gather(command(), command())
+        # Appel hors commande : ignoré
+        await db.get_leaderboard()
+
+    asyncio.run(scenario())
+    phases = {
+        entry['labels']['phase']: entry
+        for entry in REGISTRY.snapshot()['bot_command_seconds']
+        if entry['labels']['command'] == 'test_telemetry'
+    }
+    logger.info({phase: round(entry['sum'] / entry['count'], 3) for phase, entry in phases.items()})
+    assert phases['total']['count'] == 2
+    assert 0.04 <= phases['db']['sum'] / 2 < 0.08
+    assert 0.05 <= phases['riot']['sum'] / 2 < 0.08
+    assert phases['defer']['sum'] == 0
+    assert phases['total']['sum'] >= phases['db']['sum'] + phases['riot']['sum']
+
+
+def test_errors_and_surface():
+    """Erreurs comptées par type d'origine, visibles dans la synthèse et sur /metrics"""
+    ctx = make_ctx('test_telemetry_errors')
+    record_error(ctx, commands.CommandInvokeError(ValueError("boom")))
+    record_error(ctx, commands.CommandInvokeError(ValueError("boom")))
+    record_error(ctx, commands.MissingPermissions(['manage_guild']))
+
+    summary = {stats['command']: stats for stats in command_summary()}
+    assert summary['test_telemetry_errors']['errors'] == {'ValueError': 2, 'MissingPermissions': 1}
+
+    async def scrape():
+        runner = await start_metrics_server(18765, host='127.0.0.1')
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get('http://127.0.0.1:18765/metrics') as response:
+                    return await response.text()
+        finally:
+            await runner.cleanup()
+
+    body = asyncio.run(scrape())
+    assert 'bot_command_errors_total{command="test_telemetry_errors",error="ValueError"} 2' in body
+
+
+def test_handled_command_errors_are_counted():
+    """Une erreur rattrapée par la commande elle-même reste comptée"""
+    async def failing_load(*args, **kwargs):
+        raise ValueError("base indisponible")
+
+    async def noop(*args, **kwargs):
+        pass
+
+    cog = CommandsCog.__new__(CommandsCog)
+    cog.bot = SimpleNamespace(command_cache=SimpleNamespace(get_or_load=failing_load))
+    ctx = SimpleNamespace(command=SimpleNamespace(qualified_name='test_telemetry_handled'), defer=noop, send=noop)
+    asyncio.run(CommandsCog.leaderboard.callback(cog, ctx))
+
+    summary = {stats['command']: stats for stats in command_summary()}
+    assert summary['test_telemetry_handled']['errors'] == {'ValueError': 1}
+
+
+if __name__ == "__main__":
+    test_phase_timings()
+    test_errors_and_surface()
+    test_handled_command_errors_are_counted()
+    logger.info("✅ Tests terminés")
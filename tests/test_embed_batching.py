@@ -0,0 +1,66 @@
+# tests/test_embed_batching.py
+import logging
+from tilttracker.modules.discord_publisher import PublishHandle, pack_messages, EMBEDS_PER_MESSAGE
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+URL = "https://discord.com/api/webhooks/1/token"
+
+
+def _handle(job_id, match_id, title=None, url=URL, payload=None):
+    payload = payload or {'embeds': [{'title': title or f"match {match_id} - job {job_id}"}],
+                          'username': 'TiltTracker'}
+    return PublishHandle(job_id, url, payload, match_id, future=None)
+
+
+def test_group_by_match():
+    """Les embeds d'une même partie sont regroupés dans un seul message"""
+    handles = [_handle(i, match_id=i % 2) for i in range(6)]
+    packed = pack_messages(handles)
+    assert len(packed) == 1
+    url, payload, members = packed[0]
+    titles = [embed['title'] for embed in payload['embeds']]
+    logger.info(f"Ordre des embeds: {titles}")
+    assert [m.job_id for m in members] == [0, 2, 4, 1, 3, 5]
+    assert payload['username'] == 'TiltTracker'
+
+
+def test_embed_limit_keeps_matches_together():
+    """Une partie n'est pas coupée si elle tient dans le message suivant"""
+    handles = [_handle(i, match_id='A') for i in range(6)] + [_handle(i, match_id='B') for i in range(6, 11)]
+    packed = pack_messages(handles)
+    assert [len(payload['embeds']) for _, payload, _ in packed] == [6, 5]
+    assert all(len(payload['embeds']) <= EMBEDS_PER_MESSAGE for _, payload, _ in packed)
+
+
+def test_character_limit():
+    """La limite de 6000 caractères par message est respectée"""
+    handles = [_handle(i, match_id=i, title="x" * 250) for i in range(3)]
+    for handle in handles:
+        handle.payload['embeds'][0]['description'] = "y" * 2500
+    packed = pack_messages(handles)
+    assert [len(members) for _, _, members in packed] == [2, 1]
+
+
+def test_unbatchable_messages_and_destinations():
+    """Messages texte et webhooks différents ne sont jamais fusionnés"""
+    handles = [
+        _handle(1, match_id=1),
+        _handle(2, match_id=1, url="https://discord.com/api/webhooks/2/other"),
+        _handle(3, match_id=1, payload={'content': 'texte'}),
+        _handle(4, match_id=1),
+    ]
+    packed = pack_messages(handles)
+    assert sorted(tuple(m.job_id for m in members) for _, _, members in packed) == [(1, 4), (2,), (3,)]
+
+
+if __name__ == "__main__":
+    test_group_by_match()
+    test_embed_limit_keeps_matches_together()
+    test_character_limit()
+    test_unbatchable_messages_and_destinations()
+    logger.info("✅ Tests terminés")
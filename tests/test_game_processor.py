@@ -1,14 +1,15 @@
 # tests/test_game_processor.py
+import asyncio
 import logging
 from tilttracker.modules.game_processor import GameProcessor
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def test_game_processor():
+async def run_game_processor():
+    """Tout le scénario dans une seule boucle : la session HTTP du processor y est liée"""
+    processor = GameProcessor()
     try:
-        processor = GameProcessor()
-        
         # Test avec votre compte
         summoner_name = "GuigZer"
         tag_line = "1101"
@@ -18,13 +19,13 @@ def test_game_processor():
         
         # Création/vérification du joueur
         logger.info("Vérification de l'existence du joueur...")
-        player_id = processor.ensure_player_exists(summoner_name, tag_line)
+        player_id = await processor.ensure_player_exists(summoner_name, tag_line)
         
         if player_id:
             logger.info(f"✅ Joueur trouvé/créé avec l'ID: {player_id}")
             
             # Traitement des parties
-            success = processor.process_recent_matches(summoner_name, tag_line)
+            success = await processor.process_recent_matches(summoner_name, tag_line)
             if success:
                 logger.info("✅ Traitement des parties réussi")
             else:
@@ -32,8 +33,13 @@ def test_game_processor():
         else:
             logger.error("❌ Impossible de créer/trouver le joueur")
 
-        processor.close()
         return player_id is not None
+    finally:
+        await processor.close()
+
+def test_game_processor():
+    try:
+        return asyncio.run(run_game_processor())
 
     except Exception as e:
         logger.error(f"❌ Erreur lors du test: {e}")
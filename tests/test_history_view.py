@@ -0,0 +1,92 @@
+# tests/test_history_view.py
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from tilttracker.modules.history_view import HistoryView
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+START = datetime(2026, 1, 1)
+
+
+class FakeHistory:
+    """Reproduit get_player_history_page sur un historique en mémoire"""
+
+    def __init__(self, games):
+        self.games = [
+            {'cursor': i, 'score': i, 'champion': 'Lux', 'win': i % 2 == 0,
+             'kda': '1/2/3', 'date': (START + timedelta(hours=i)).strftime('%Y-%m-%d %H:%M')}
+            for i in range(games)
+        ]
+        self.rows_loaded = 0
+
+    async def load_page(self, before, limit):
+        rows = sorted(self.games, key=lambda g: g['cursor'], reverse=True)
+        if before is not None:
+            rows = [g for g in rows if g['cursor'] < before]
+        rows = rows[:limit]
+        self.rows_loaded += len(rows)
+        return rows
+
+
+class FakeResponse:
+    def __init__(self):
+        self.edits = 0
+        self.refused = 0
+
+    async def edit_message(self, embeds=None, view=None):
+        self.edits += 1
+
+    async def send_message(self, content, ephemeral=False):
+        self.refused += 1
+
+
+def make_interaction(user_id, response):
+    return SimpleNamespace(user=SimpleNamespace(id=user_id), response=response)
+
+
+def test_pagination():
+    """Navigation avant/arrière, une page chargée par clic"""
+    history = FakeHistory(25)
+    response = FakeResponse()
+
+    async def scenario():
+        view = HistoryView(history.load_page, "Historique", author_id=1, page_size=10)
+        await view.load()
+        pages = [[g['score'] for g in view.rows]]
+        assert view.previous_page.disabled and not view.next_page.disabled
+
+        interaction = make_interaction(1, response)
+        await view.next_page.callback(interaction)
+        pages.append([g['score'] for g in view.rows])
+        await view.next_page.callback(interaction)
+        pages.append([g['score'] for g in view.rows])
+        assert view.next_page.disabled
+        await view.previous_page.callback(interaction)
+        back = [g['score'] for g in view.rows]
+
+        # Un autre utilisateur ne peut pas changer de page
+        assert not await view.interaction_check(make_interaction(2, response))
+        return pages, back, view
+
+    pages, back, view = asyncio.run(scenario())
+    logger.info(f"Pages: {pages}")
+    assert pages[0] == list(range(24, 14, -1))
+    assert pages[1] == list(range(14, 4, -1))
+    assert pages[2] == list(range(4, -1, -1))
+    assert back == pages[1]
+    assert response.edits == 3
+    assert response.refused == 1
+    # Chaque chargement lit au plus une page (+1 ligne de contrôle)
+    assert history.rows_loaded <= 4 * 11
+    assert view.page_embed().footer.text == "Page 2"
+
+
+if __name__ == "__main__":
+    test_pagination()
+    logger.info("✅ Tests terminés")
@@ -0,0 +1,97 @@
+# tests/test_load_shedder.py
+import asyncio
+import logging
+from tilttracker.utils.load_shedder import LoadShedder, Overloaded, PRIORITY_COMMANDS, PRIORITY_INGEST
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def rejected(shedder, user_id, command):
+    try:
+        shedder.admit(user_id, command)
+    except Overloaded as e:
+        return e
+    return None
+
+
+def test_user_and_global_limits():
+    """Refus immédiat au-delà des limites, avec délai de nouvel essai"""
+    clock = FakeClock()
+    shedder = LoadShedder(global_limit=2, user_limit=1, user_cooldown=3, priority=PRIORITY_INGEST,
+                          ingest_limit=1, clock=clock)
+
+    assert rejected(shedder, 1, 'graph') is None
+    # Même utilisateur, même commande : délai minimal
+    assert rejected(shedder, 1, 'graph').retry_after == 3
+    # Même utilisateur, autre commande : une seule à la fois
+    assert rejected(shedder, 1, 'register') is not None
+    assert rejected(shedder, 2, 'graph') is None
+    # Limite globale atteinte
+    assert rejected(shedder, 3, 'graph') is not None
+
+    shedder.release(1)
+    clock.now = 5
+    assert rejected(shedder, 1, 'graph') is None
+    shedder.release(1)
+    shedder.release(2)
+    assert shedder.in_flight == 0 and not shedder.by_user
+
+
+def test_ingest_priority():
+    """Priorité à l'ingestion : les commandes lourdes sont réduites pendant l'ingestion"""
+    shedder = LoadShedder(global_limit=4, user_limit=1, user_cooldown=0, priority=PRIORITY_INGEST,
+                          ingest_limit=1)
+
+    async def scenario():
+        async with shedder.ingest():
+            assert shedder.limit == 1
+            assert rejected(shedder, 1, 'graph') is None
+            assert rejected(shedder, 2, 'graph') is not None
+        assert shedder.limit == 4
+        assert rejected(shedder, 2, 'graph') is None
+
+    asyncio.run(scenario())
+
+
+def test_commands_priority():
+    """Priorité aux commandes : l'ingestion attend la fin des commandes en cours"""
+    shedder = LoadShedder(global_limit=4, user_limit=1, user_cooldown=0, priority=PRIORITY_COMMANDS,
+                          ingest_max_wait=1)
+    events = []
+
+    async def command():
+        async with shedder.command(1, 'graph'):
+            events.append('commande')
+            await asyncio.sleep(0.05)
+        events.append('commande terminée')
+
+    async def ingest():
+        await asyncio.sleep(0.01)
+        async with shedder.ingest():
+            events.append('ingestion')
+
+    async def scenario():
+        await asyncio.gather(command(), ingest())
+
+    asyncio.run(scenario())
+    logger.info(events)
+    assert events == ['commande', 'commande terminée', 'ingestion']
+
+
+if __name__ == "__main__":
+    test_user_and_global_limits()
+    test_ingest_priority()
+    test_commands_priority()
+    logger.info("✅ Tests terminés")
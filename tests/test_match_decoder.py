@@ -0,0 +1,62 @@
+# tests/test_match_decoder.py
+import json
+import logging
+from tilttracker.modules.match_decoder import DECODERS, get_decoder, prune_match
+from tilttracker.modules.match_records import parse_match
+from tests.bench_match_decoding import synthetic_match, vars_of
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def test_decoders_agree_with_full_decode():
+    """Chaque décodeur installé produit les mêmes participants que json.loads"""
+    raw = synthetic_match()
+    expected = vars_of(parse_match('EUW1_1', json.loads(raw)))
+    for name, decode in DECODERS.items():
+        match = parse_match('EUW1_1', decode(raw))
+        assert vars_of(match) == expected, name
+        assert match.queue_id == 450 and match.game_version == '14.20.628.2518'
+        logger.info(f"{name}: participants identiques")
+
+
+def test_pruned_payload_keeps_only_used_fields():
+    payload = prune_match(json.loads(synthetic_match()))
+    assert set(payload) == {'info'}
+    assert set(payload['info']) == {'gameDuration', 'gameVersion', 'queueId', 'participants'}
+    participant = payload['info']['participants'][0]
+    assert 'challenges' not in participant and 'perks' not in participant
+    assert len(participant) == 16
+
+
+def test_riot_id_is_optional():
+    """Les anciens payloads n'ont pas de Riot ID"""
+    full = json.loads(synthetic_match())
+    for participant in full['info']['participants']:
+        del participant['riotIdGameName'], participant['riotIdTagline']
+    raw = json.dumps(full).encode()
+    for name, decode in DECODERS.items():
+        player = parse_match('EUW1_1', decode(raw)).participants[0]
+        assert player.riot_id == (None, None), name
+
+
+def test_get_decoder():
+    assert get_decoder('json') is DECODERS['json']
+    assert get_decoder('auto') in DECODERS.values()
+    try:
+        get_decoder('simdjson')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Décodeur inconnu accepté")
+
+
+if __name__ == "__main__":
+    test_decoders_agree_with_full_decode()
+    test_pruned_payload_keeps_only_used_fields()
+    test_riot_id_is_optional()
+    test_get_decoder()
+    logger.info("✅ Tests terminés")
@@ -0,0 +1,110 @@
+# tests/test_match_records.py
+import gc
+import logging
+from tilttracker.modules.match_records import parse_match, Participant
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def _payload():
+    """Payload match-v5 minimal (avec des champs inutilisés, comme l'API)"""
+    participants = []
+    for i in range(10):
+        team_id = 100 if i < 5 else 200
+        participants.append({
+            'puuid': f"puuid-{i}",
+            'championId': 10 + i,
+            'championName': f"Champion{i}",
+            'kills': i,
+            'deaths': 2,
+            'assists': 3,
+            'totalDamageDealtToChampions': 10000 + (i % 5) * 1000,
+            'totalDamageTaken': 20000,
+            'damageSelfMitigated': 5000,
+            'totalTimeCCDealt': 100,
+            'visionScore': 10,
+            'goldEarned': 9000,
+            'win': team_id == 100,
+            'teamId': team_id,
+            'perks': {'styles': []},
+            'challenges': {'kda': 1.5},
+        })
+    return {
+        'metadata': {'matchId': 'EUW1_1'},
+        'info': {'gameDuration': 1200, 'gameVersion': '14.21', 'queueId': 450, 'participants': participants}
+    }
+
+
+def test_parse_match():
+    """Les totaux d'équipe sont calculés une fois et partagés"""
+    match = parse_match('EUW1_1', _payload())
+    assert match['match_id'] == 'EUW1_1' and match.queue_id == 450
+    assert len(match.participants) == 10 and set(match.teams) == {100, 200}
+
+    player = match.participant('puuid-7')
+    assert player.team_id == 200
+    assert player.team_kills == 5 + 6 + 7 + 8 + 9
+    assert player['team_total_damage_dealt'] == sum(10000 + i * 1000 for i in range(5))
+    assert player.team_size == 5
+    assert player.damage_rank == 3
+    assert all(p.team_id == 100 for p in match.opponents(player))
+    assert match.participant('inconnu') is None
+
+
+def test_participant_compatibility():
+    """Les enregistrements restent lisibles comme les anciens dictionnaires"""
+    player = parse_match('EUW1_1', _payload()).participant('puuid-0')
+    assert player['kills'] == 0 and player.get('team_size', 5) == 5
+    assert player.get('absent', 'défaut') == 'défaut'
+
+    data = {**player}
+    assert data['total_time_crowd_control_dealt'] == 100 and data['team_kills'] == 10
+    assert 'perks' not in data
+
+    try:
+        player['perks']
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("Champ non conservé accessible")
+
+    assert not hasattr(player, '__dict__')
+    assert '__dict__' not in Participant.__slots__
+
+
+def test_assign_ranks():
+    """Classement de l'équipe par score de performance"""
+    match = parse_match('EUW1_1', _payload())
+    team = match.team_participants(100)
+    for p in team:
+        p.performance_score = float(p.kills)
+    match.assign_ranks(100)
+    assert [p.rank_in_team for p in team] == [5, 4, 3, 2, 1]
+    assert all(p.rank_in_team is None for p in match.team_participants(200))
+
+
+def test_no_reference_cycle():
+    """Une partie est libérée par comptage de références, sans passage du ramasse-miettes"""
+    payload = _payload()
+    gc.collect()
+    gc.disable()
+    try:
+        player = parse_match('EUW1_1', payload).participant('puuid-7')
+        # Un participant isolé garde les totaux de son équipe
+        assert player.team_kills == 35 and player.damage_rank == 3
+        del player
+        assert gc.collect() == 0
+    finally:
+        gc.enable()
+
+
+if __name__ == "__main__":
+    test_parse_match()
+    test_participant_compatibility()
+    test_assign_ranks()
+    test_no_reference_cycle()
+    logger.info("✅ Tests terminés")
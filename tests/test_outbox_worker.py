@@ -0,0 +1,96 @@
+# tests/test_outbox_worker.py
+import asyncio
+import logging
+from tilttracker.modules.outbox_worker import OutboxWorker
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class FakeOutboxDatabase:
+    """Table publish_outbox en mémoire"""
+
+    def __init__(self, messages):
+        self.messages = {m['id']: dict(m, status='pending', attempts=0) for m in messages}
+        self.retries = {}
+
+    async def claim_outbox(self, limit=10, lease_seconds=300):
+        claimed = []
+        for message in self.messages.values():
+            if message['status'] == 'pending' and len(claimed) < limit:
+                message['status'] = 'sending'
+                message['attempts'] += 1
+                claimed.append({k: message[k] for k in ('id', 'channel', 'payload', 'attempts')})
+        return claimed
+
+    async def mark_outbox_sent(self, outbox_id):
+        self.messages[outbox_id]['status'] = 'sent'
+        return True
+
+    async def mark_outbox_failed(self, outbox_id, error, retry_in=None):
+        self.messages[outbox_id]['status'] = 'failed' if retry_in is None else 'pending'
+        self.retries[outbox_id] = retry_in
+        return True
+
+
+class FakeHandle:
+    def __init__(self, error):
+        self.error = error
+
+    async def wait(self, timeout=None):
+        if self.error:
+            raise self.error
+        return True
+
+
+class FakePublisher:
+    """Échoue pour les messages dont le payload contient 'fail'"""
+
+    def __init__(self):
+        self.sent = []
+
+    def enqueue(self, payload, url=None, group=None, name=None):
+        if payload.get('fail'):
+            return FakeHandle(RuntimeError("Discord indisponible"))
+        self.sent.append(payload)
+        return FakeHandle(None)
+
+
+def test_outbox_delivery_and_backoff():
+    """Les messages sont publiés, les échecs reprogrammés puis abandonnés"""
+    db = FakeOutboxDatabase([
+        {'id': 1, 'channel': 'webhook', 'payload': {'content': 'ok'}},
+        {'id': 2, 'channel': 'webhook', 'payload': {'fail': True}},
+    ])
+    publisher = FakePublisher()
+    worker = OutboxWorker(db, publisher)
+    worker.max_attempts = 3
+    worker.base_backoff = 10
+
+    assert asyncio.run(worker.run_once()) == 2
+    assert db.messages[1]['status'] == 'sent'
+    assert db.messages[2]['status'] == 'pending' and db.retries[2] == 10
+
+    asyncio.run(worker.run_once())
+    assert db.retries[2] == 20
+
+    asyncio.run(worker.run_once())
+    assert db.messages[2]['status'] == 'failed' and db.retries[2] is None
+    assert asyncio.run(worker.run_once()) == 0
+    assert publisher.sent == [{'content': 'ok'}]
+
+
+def test_backoff_cap():
+    """Le délai entre tentatives est plafonné"""
+    worker = OutboxWorker(None, None)
+    assert worker.backoff(1) == worker.base_backoff
+    assert worker.backoff(50) == worker.max_backoff
+
+
+if __name__ == "__main__":
+    test_outbox_delivery_and_backoff()
+    test_backoff_cap()
+    logger.info("✅ Tests terminés")
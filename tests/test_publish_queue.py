@@ -0,0 +1,153 @@
+# tests/test_publish_queue.py
+import asyncio
+import logging
+import os
+import time
+from aiohttp import web
+from tilttracker.modules.discord_publisher import DiscordPublisher
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+PORT = 18770
+WEBHOOK = f"http://127.0.0.1:{PORT}/webhook"
+# Temps de réponse simulé du webhook
+DELAY = 0.1
+
+
+class FakeWebhook:
+    """Webhook Discord simulé : réponse lente, envois simultanés suivis"""
+
+    def __init__(self):
+        self.payloads = []
+        self.concurrent = 0
+        self.max_concurrent = 0
+
+    async def post(self, request):
+        self.concurrent += 1
+        self.max_concurrent = max(self.max_concurrent, self.concurrent)
+        try:
+            await asyncio.sleep(DELAY)
+            self.payloads.append(await request.json())
+            return web.json_response({'id': str(len(self.payloads))})
+        finally:
+            self.concurrent -= 1
+
+
+def run(scenario, workers=2, queue_size=1000, batch_window=0):
+    """Démarre le faux webhook et exécute le scénario avec un publisher configuré"""
+    os.environ['DISCORD_WEBHOOK_URL'] = WEBHOOK
+    os.environ['DISCORD_PUBLISH_WORKERS'] = str(workers)
+    os.environ['DISCORD_PUBLISH_QUEUE_SIZE'] = str(queue_size)
+    os.environ['DISCORD_PUBLISH_BATCH_WINDOW'] = str(batch_window)
+    webhook = FakeWebhook()
+
+    async def main():
+        app = web.Application()
+        app.router.add_post('/webhook', webhook.post)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, '127.0.0.1', PORT).start()
+        publisher = DiscordPublisher()
+        try:
+            return await scenario(publisher)
+        finally:
+            await publisher.close(timeout=5)
+            await runner.cleanup()
+
+    return asyncio.run(main()), webhook
+
+
+def message(i):
+    return {'content': f"message {i}"}
+
+
+def test_publish_returns_before_delivery():
+    """La mise en file rend la main tout de suite, l'envoi se fait en arrière-plan"""
+    async def scenario(publisher):
+        start = time.perf_counter()
+        handle = publisher.enqueue(message(1))
+        elapsed = time.perf_counter() - start
+        assert not handle.done()
+        assert await handle.wait(timeout=2)
+        return elapsed
+
+    elapsed, webhook = run(scenario)
+    logger.info(f"Mise en file en {elapsed * 1e6:.0f}µs")
+    assert elapsed < DELAY / 10
+    assert webhook.payloads == [message(1)]
+
+
+def test_queue_is_bounded():
+    """Une file pleine refuse le message au lieu de grossir sans limite"""
+    async def scenario(publisher):
+        handles = [publisher.enqueue(message(i)) for i in range(2)]
+        try:
+            publisher.enqueue(message(2))
+            raise AssertionError("la file aurait dû être pleine")
+        except asyncio.QueueFull:
+            pass
+        return await asyncio.gather(*(handle.wait(timeout=2) for handle in handles))
+
+    results, webhook = run(scenario, workers=1, queue_size=2)
+    assert results == [True, True]
+    assert len(webhook.payloads) == 2
+
+
+def test_worker_concurrency():
+    """Au plus DISCORD_PUBLISH_WORKERS envois simultanés par webhook"""
+    async def scenario(publisher):
+        handles = [publisher.enqueue(message(i)) for i in range(6)]
+        start = time.perf_counter()
+        await asyncio.gather(*(handle.wait(timeout=5) for handle in handles))
+        return time.perf_counter() - start
+
+    elapsed, webhook = run(scenario, workers=2)
+    logger.info(f"6 messages, 2 workers: {elapsed * 1000:.0f}ms")
+    assert webhook.max_concurrent == 2
+    assert len(webhook.payloads) == 6
+    # Trois vagues de deux envois, pas six envois successifs
+    assert elapsed < 5 * DELAY
+
+
+def test_close_flushes_queue():
+    """L'arrêt envoie les messages encore en file"""
+    handles = []
+
+    async def scenario(publisher):
+        handles.extend(publisher.enqueue(message(i)) for i in range(5))
+
+    _, webhook = run(scenario, workers=1)
+    assert all(handle.done() and handle.future.result() for handle in handles)
+    assert sorted(payload['content'] for payload in webhook.payloads) == [message(i)['content'] for i in range(5)]
+
+
+def test_cancel_during_batch_window():
+    """Un worker annulé pendant la fenêtre de regroupement ne perd pas les messages déjà retirés"""
+    async def scenario(publisher):
+        handles = [publisher.enqueue({'embeds': [{'title': f"partie {i}"}]}, group=i) for i in range(2)]
+        destination = publisher.destinations[WEBHOOK]
+        await asyncio.sleep(DELAY)
+        # Les deux messages sont retirés de la file, le worker attend la fin de la fenêtre
+        assert destination.queue.empty()
+        for task in destination.workers:
+            task.cancel()
+        await asyncio.gather(*destination.workers, return_exceptions=True)
+        await asyncio.wait_for(destination.queue.join(), 1)
+        return [handle.future.cancelled() for handle in handles]
+
+    cancelled, webhook = run(scenario, workers=1, batch_window=10)
+    assert cancelled == [True, True]
+    assert webhook.payloads == []
+
+
+if __name__ == "__main__":
+    test_publish_returns_before_delivery()
+    test_queue_is_bounded()
+    test_worker_concurrency()
+    test_close_flushes_queue()
+    test_cancel_during_batch_window()
+    logger.info("✅ Tests terminés")
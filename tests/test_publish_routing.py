@@ -0,0 +1,82 @@
+# tests/test_publish_routing.py
+import asyncio
+import logging
+from tilttracker.modules.publish_routing import PublishRouter
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_URL = "https://discord.com/api/webhooks/0/default"
+
+
+class FakeRoutesDatabase:
+    def __init__(self):
+        self.routes = [
+            {'id': 1, 'name': 'guild:111', 'webhook_url': 'https://discord.com/api/webhooks/1/a',
+             'guild_id': '111', 'player_id': None},
+            {'id': 2, 'name': 'player:7', 'webhook_url': 'https://discord.com/api/webhooks/2/b',
+             'guild_id': None, 'player_id': 7},
+            {'id': 3, 'name': 'archive', 'webhook_url': 'https://discord.com/api/webhooks/3/c',
+             'guild_id': None, 'player_id': None},
+            {'id': 4, 'name': 'webhook', 'webhook_url': 'https://discord.com/api/webhooks/4/x',
+             'guild_id': '222', 'player_id': None},
+        ]
+        self.guilds = {7: {'111'}, 8: {'222'}, 9: {'111'}}
+        self.loads = 0
+
+    async def get_publish_routes(self):
+        self.loads += 1
+        return list(self.routes)
+
+    async def get_player_guilds(self):
+        return self.guilds
+
+
+def test_destinations():
+    """Les routes d'un joueur, le webhook par défaut seulement si aucune ne le cible"""
+    db = FakeRoutesDatabase()
+    router = PublishRouter(db, DEFAULT_URL, refresh_seconds=60)
+
+    async def scenario():
+        return ([r.name for r in await router.destinations(7)],
+                [r.name for r in await router.destinations(8)],
+                [r.name for r in await router.destinations(9)])
+
+    player_7, player_8, player_9 = asyncio.run(scenario())
+    logger.info(f"Joueur 7: {player_7} - Joueur 8: {player_8} - Joueur 9: {player_9}")
+    assert player_7 == ['guild:111', 'player:7', 'archive']
+    assert player_9 == ['guild:111', 'archive']
+    # La route nommée comme le webhook par défaut est ignorée : repli sur celui-ci
+    assert player_8 == ['webhook', 'archive']
+    assert [r.webhook_url for r in router.routes if r.name == 'webhook'] == []
+    assert db.loads == 1
+
+
+def test_webhook_lookup():
+    """Résolution du webhook d'un canal, routes supprimées comprises"""
+    db = FakeRoutesDatabase()
+    router = PublishRouter(db, DEFAULT_URL, refresh_seconds=60)
+
+    async def scenario():
+        default = await router.webhook_for('webhook')
+        guild = await router.webhook_for('guild:111')
+        db.routes.append({'id': 4, 'name': 'guild:333', 'webhook_url': 'https://discord.com/api/webhooks/4/d',
+                          'guild_id': '333', 'player_id': None})
+        created = await router.webhook_for('guild:333')
+        removed = await router.webhook_for('guild:999')
+        return default, guild, created, removed
+
+    default, guild, created, removed = asyncio.run(scenario())
+    assert default == DEFAULT_URL
+    assert guild.endswith('/1/a')
+    assert created.endswith('/4/d')
+    assert removed is None
+
+
+if __name__ == "__main__":
+    test_destinations()
+    test_webhook_lookup()
+    logger.info("✅ Tests terminés")
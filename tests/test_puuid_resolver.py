@@ -0,0 +1,151 @@
+# tests/test_puuid_resolver.py
+import asyncio
+import logging
+from types import SimpleNamespace
+from tilttracker.modules.discord_bot import TiltTrackerBot
+from tilttracker.modules.puuid_resolver import PuuidResolver
+from tilttracker.modules.riot_api import riot_id_tag
+from tilttracker.utils.cache import TTLCache, player_tag
+from tilttracker.utils.riot_id_index import RiotIdIndex
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class FakePlayersDatabase:
+    def __init__(self, players):
+        self.players = dict(players)
+        self.lookups = 0
+        self.updates = 0
+
+    async def get_puuid_by_riot_id(self, summoner_name, tag_line):
+        self.lookups += 1
+        for (name, tag), puuid in self.players.items():
+            if name.lower() == summoner_name.lower() and tag.lower() == tag_line.lower():
+                return puuid
+        return None
+
+    async def update_player_riot_id(self, riot_puuid, summoner_name, tag_line):
+        self.updates += 1
+        self.players = {key: puuid for key, puuid in self.players.items() if puuid != riot_puuid}
+        self.players[(summoner_name, tag_line)] = riot_puuid
+        return True
+
+
+class FakeRiotAPI:
+    """account-v1 simulé : 20ms par appel, au plus 3 appels simultanés suivis"""
+
+    def __init__(self, accounts):
+        self.accounts = accounts
+        self.calls = 0
+        self.concurrent = 0
+        self.max_concurrent = 0
+        self.cache = TTLCache(ttl=60, name='test_riot')
+
+    async def get_puuid(self, summoner_name, tag_line):
+        async def fetch():
+            self.calls += 1
+            self.concurrent += 1
+            self.max_concurrent = max(self.max_concurrent, self.concurrent)
+            await asyncio.sleep(0.02)
+            self.concurrent -= 1
+            return self.accounts.get((summoner_name.lower(), tag_line.lower()))
+        return await self.cache.get_or_load('puuid', (summoner_name.lower(), tag_line.lower()), fetch,
+                                            tags=(riot_id_tag(summoner_name, tag_line),))
+
+
+def test_resolution_order():
+    """Mémoire, puis base, puis Riot ; une seule requête par Riot ID"""
+    db = FakePlayersDatabase({('Alice', 'EUW'): 'puuid-alice'})
+    riot = FakeRiotAPI({('bob', 'euw'): 'puuid-bob'})
+    resolver = PuuidResolver(db, riot)
+
+    async def scenario():
+        assert await resolver.resolve('Alice', 'EUW') == 'puuid-alice'
+        assert await resolver.resolve('alice', 'euw') == 'puuid-alice'
+        assert await resolver.resolve('Bob', 'EUW') == 'puuid-bob'
+        assert await resolver.resolve('Bob', 'EUW') == 'puuid-bob'
+        assert await resolver.resolve('Nobody', 'EUW') is None
+
+    asyncio.run(scenario())
+    assert db.lookups == 3
+    assert riot.calls == 2
+
+
+def test_resolve_many():
+    """Résolution d'une liste en parallèle, bornée"""
+    accounts = {(f"player{i}", 'euw'): f"puuid-{i}" for i in range(40)}
+    riot = FakeRiotAPI(accounts)
+    resolver = PuuidResolver(FakePlayersDatabase({}), riot, concurrency=8)
+    riot_ids = [(f"Player{i}", 'EUW') for i in range(40)] + [('Player0', 'EUW')]
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        result = await resolver.resolve_many(riot_ids)
+        return result, loop.time() - start
+
+    result, elapsed = asyncio.run(scenario())
+    logger.info(f"40 Riot ID résolus en {elapsed * 1000:.0f}ms (concurrence max {riot.max_concurrent})")
+    assert result[('Player7', 'EUW')] == 'puuid-7'
+    assert len(result) == 40
+    assert riot.calls == 40
+    assert riot.max_concurrent <= 8
+    assert elapsed < 40 * 0.02 / 2
+
+
+def test_rename_invalidation():
+    """Un renommage rapporté par Riot invalide l'ancien Riot ID"""
+    db = FakePlayersDatabase({('Alice', 'EUW'): 'puuid-alice'})
+    riot = FakeRiotAPI({('alice', 'euw'): 'puuid-alice'})
+    resolver = PuuidResolver(db, riot)
+
+    async def scenario():
+        await riot.get_puuid('Alice', 'EUW')
+        assert await resolver.resolve('Alice', 'EUW') == 'puuid-alice'
+        assert await resolver.observe('puuid-alice', 'Alice', 'EUW') is None
+        # Les Riot ID sont insensibles à la casse : pas de renommage
+        assert await resolver.observe('puuid-alice', 'ALICE', 'euw') is None
+        assert db.updates == 0
+        assert await resolver.observe('puuid-alice', 'Alicia', 'EUW') == ('Alicia', 'EUW')
+        riot.accounts = {('alicia', 'euw'): 'puuid-alice'}
+        return (await resolver.resolve('Alice', 'EUW'), await resolver.resolve('Alicia', 'EUW'))
+
+    old, new = asyncio.run(scenario())
+    assert old is None
+    assert new == 'puuid-alice'
+    assert db.players == {('Alicia', 'EUW'): 'puuid-alice'}
+
+
+def test_rename_reaches_bot():
+    """Le bot abonné retire l'ancien Riot ID de l'autocomplétion et de son cache"""
+    db = FakePlayersDatabase({('Alice', 'EUW'): 'puuid-alice'})
+    resolver = PuuidResolver(db, FakeRiotAPI({}))
+    bot = SimpleNamespace(riot_ids=RiotIdIndex([('Alice', 'EUW'), ('Bob', 'EUW')]),
+                          command_cache=TTLCache(ttl=30))
+    resolver.on_rename(lambda *rename: TiltTrackerBot.on_player_renamed(bot, *rename))
+
+    async def stats():
+        return {'games': 1}
+
+    async def scenario():
+        await bot.command_cache.get_or_load('test_stats', ('Alice', 'EUW'), stats,
+                                            tags=(player_tag('Alice', 'EUW'),))
+        assert not await resolver.observe('puuid-alice', 'Alice', 'EUW')
+        assert await resolver.observe('puuid-alice', 'Alicia', 'EUW')
+
+    asyncio.run(scenario())
+    assert bot.riot_ids.search('ali') == [('Alicia', 'EUW')]
+    assert len(bot.riot_ids) == 2
+    assert len(bot.command_cache) == 0
+
+
+if __name__ == "__main__":
+    test_resolution_order()
+    test_resolve_many()
+    test_rename_invalidation()
+    test_rename_reaches_bot()
+    logger.info("✅ Tests terminés")
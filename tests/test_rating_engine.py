@@ -0,0 +1,177 @@
+# tests/test_rating_engine.py
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from tilttracker.modules.match_records import parse_match
+from tilttracker.modules.match_watcher import MatchWatcher
+from tilttracker.modules.rating_engine import RatingEngine, PlayerRating, MIN_DEVIATION
+from game_data.calc_classe.calculator_factory import CalculatorFactory
+from tests.bench_match_decoding import synthetic_match
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def test_rating_update():
+    """Une victoire fait monter le rating, une défaite le fait baisser"""
+    engine = RatingEngine()
+    player = PlayerRating()
+
+    after_win = engine.update(player, [], win=True, rank_in_team=1)
+    after_loss = engine.update(player, [], win=False, rank_in_team=5)
+    logger.info(f"Victoire: {after_win.rating:.1f} - Défaite: {after_loss.rating:.1f}")
+
+    assert after_win.rating > player.rating > after_loss.rating
+    assert after_win.deviation < player.deviation
+    assert after_win.games == 1
+
+
+def test_rating_rank_weight():
+    """Le rang dans l'équipe module le gain à résultat égal"""
+    engine = RatingEngine()
+    best = engine.update(PlayerRating(), [], win=True, rank_in_team=1)
+    worst = engine.update(PlayerRating(), [], win=True, rank_in_team=5)
+    assert best.rating > worst.rating
+
+
+def test_rating_convergence():
+    """L'incertitude diminue avec les parties et remonte avec l'inactivité"""
+    engine = RatingEngine()
+    player = PlayerRating()
+    start = datetime(2024, 1, 1)
+    for i in range(200):
+        player = engine.update(player, [], win=i % 3 != 0, rank_in_team=2,
+                               played_at=start + timedelta(hours=i))
+    logger.info(f"Rating après 200 parties: {player.rating:.1f} ±{player.deviation:.1f}")
+    assert player.deviation >= MIN_DEVIATION
+    assert player.rating > 1500
+
+    later = engine.update(player, [], win=True, rank_in_team=2,
+                          played_at=player.last_played_at + timedelta(days=365))
+    assert later.rating - player.rating > 0
+
+
+def test_replay_matches_incremental():
+    """Le recalcul depuis l'historique donne le même résultat que l'incrémental"""
+    engine = RatingEngine()
+    start = datetime(2024, 1, 1)
+    rows = [
+        {'player_id': 1, 'match_id': 1, 'team_id': 100, 'win': True, 'rank_in_team': 1, 'played_at': start},
+        {'player_id': 2, 'match_id': 1, 'team_id': 200, 'win': False, 'rank_in_team': 3, 'played_at': start},
+        {'player_id': 1, 'match_id': 2, 'team_id': 100, 'win': False, 'rank_in_team': 4,
+         'played_at': start + timedelta(days=1)},
+    ]
+
+    replayed = engine.replay(rows)
+
+    player_1 = engine.update(PlayerRating(), [], win=True, rank_in_team=1, played_at=start)
+    player_2 = engine.update(PlayerRating(), [player_1], win=False, rank_in_team=3, played_at=start)
+    player_1 = engine.update(player_1, [], win=False, rank_in_team=4, played_at=start + timedelta(days=1))
+
+    assert replayed[1] == player_1
+    assert replayed[2] == player_2
+
+
+class FakeDatabase:
+    """Tables matches, player_matches et player_ratings en mémoire"""
+
+    def __init__(self, dates):
+        self.dates = dates
+        self.matches = {}
+        self.history = []
+        self.ratings = {}
+
+    async def get_player_total_score(self, player_id):
+        return 0
+
+    async def store_match(self, match):
+        if match.match_id not in self.matches:
+            self.matches[match.match_id] = (len(self.matches) + 1, self.dates[match.match_id])
+        return self.matches[match.match_id][0]
+
+    async def get_match_played_at(self, match_id):
+        return next(created_at for db_id, created_at in self.matches.values() if db_id == match_id)
+
+    async def get_ratings_by_puuid(self, puuids):
+        return {puuid: rating for puuid, rating in self.ratings.items() if puuid in puuids}
+
+    async def store_match_participants(self, match_id, participants):
+        pass
+
+    async def store_player_performance(self, match_id, player_data, rating, outbox):
+        self.history.append({
+            'player_id': player_data['player_id'], 'match_id': match_id, 'team_id': player_data['team_id'],
+            'win': player_data['win'], 'rank_in_team': player_data['rank_in_team'],
+            'played_at': await self.get_match_played_at(match_id),
+        })
+        self.ratings[player_data['puuid']] = rating
+        return True
+
+
+def make_watcher(db, payloads):
+    async def get_match_details(match_id):
+        return parse_match(match_id, json.loads(payloads[match_id]))
+
+    async def noop(*args, **kwargs):
+        return []
+
+    watcher = MatchWatcher.__new__(MatchWatcher)
+    watcher.db = db
+    watcher.riot_api = SimpleNamespace(get_match_details=get_match_details)
+    watcher.services = SimpleNamespace(puuid_resolver=SimpleNamespace(observe=noop),
+                                       command_cache=SimpleNamespace(invalidate=lambda *tags: None))
+    watcher.discord_publisher = SimpleNamespace(build_match_payload=lambda *args: {})
+    watcher.publish_router = SimpleNamespace(destinations=noop)
+    watcher.baselines = SimpleNamespace(ingest_match=noop, is_ready=lambda champions: False)
+    watcher.use_percentiles = False
+    watcher.calculator_factory = CalculatorFactory()
+    watcher.rating_engine = RatingEngine()
+    return watcher
+
+
+def test_live_update_matches_replay():
+    """Le watcher date chaque mise à jour comme le recalcul (inactivité comprise)"""
+    start = datetime(2024, 1, 1)
+    dates = {'EUW1_1': start, 'EUW1_2': start + timedelta(days=60)}
+    payloads = {}
+    for seed, match_id in enumerate(dates):
+        payload = json.loads(synthetic_match(seed))
+        for participant in payload['info']['participants']:
+            participant['championId'] = 1
+        payloads[match_id] = json.dumps(payload)
+    # Le même joueur dans les deux parties, un adversaire suivi dans la première
+    alice = json.loads(payloads['EUW1_1'])['info']['participants'][0]['puuid']
+    bob = json.loads(payloads['EUW1_1'])['info']['participants'][5]['puuid']
+    second = json.loads(payloads['EUW1_2'])
+    second['info']['participants'][0]['puuid'] = alice
+    payloads['EUW1_2'] = json.dumps(second)
+
+    players = {puuid: {'id': player_id, 'riot_puuid': puuid, 'summoner_name': f"Joueur{player_id}",
+                       'tag_line': 'EUW'} for player_id, puuid in ((1, alice), (2, bob))}
+    db = FakeDatabase(dates)
+    watcher = make_watcher(db, payloads)
+
+    async def scenario():
+        for match_id, puuid in (('EUW1_1', alice), ('EUW1_1', bob), ('EUW1_2', alice)):
+            assert await watcher._process_single_match(match_id, players[puuid])
+
+    asyncio.run(scenario())
+
+    replayed = RatingEngine().replay(db.history)
+    for puuid, player in players.items():
+        assert PlayerRating(**db.ratings[puuid]) == replayed[player['id']]
+    assert db.ratings[alice]['last_played_at'] == dates['EUW1_2']
+
+
+if __name__ == "__main__":
+    test_rating_update()
+    test_rating_rank_weight()
+    test_rating_convergence()
+    test_replay_matches_incremental()
+    test_live_update_matches_replay()
+    logger.info("✅ Tests terminés")
@@ -0,0 +1,96 @@
+# tests/test_riot_account_cache.py
+import asyncio
+import logging
+import time
+from aiohttp import web
+from tilttracker.modules.riot_api import RiotAPI
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+LATENCY = 0.05
+PORT = 18766
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_app(hits):
+    async def account(request):
+        hits.append('account')
+        await asyncio.sleep(LATENCY)
+        return web.json_response({'puuid': 'puuid-alice'})
+
+    async def summoner(request):
+        hits.append('summoner')
+        await asyncio.sleep(LATENCY)
+        return web.json_response({'profileIconId': 1, 'summonerLevel': 300})
+
+    async def league(request):
+        hits.append('league')
+        await asyncio.sleep(LATENCY)
+        return web.json_response([{'queueType': 'RANKED_SOLO_5x5', 'tier': 'GOLD', 'rank': 'II',
+                                   'leaguePoints': 42, 'wins': 10, 'losses': 8}])
+
+    app = web.Application()
+    app.router.add_get('/riot/account/v1/accounts/by-riot-id/{name}/{tag}', account)
+    app.router.add_get('/lol/summoner/v4/summoners/by-puuid/{puuid}', summoner)
+    app.router.add_get('/lol/league/v4/entries/by-puuid/{puuid}', league)
+    return app
+
+
+def test_account_info_parallel_and_cached():
+    """Profil et rangs en parallèle, puis servis depuis le cache"""
+    hits = []
+    clock = FakeClock()
+
+    async def scenario():
+        runner = web.AppRunner(make_app(hits))
+        await runner.setup()
+        await web.TCPSite(runner, '127.0.0.1', PORT).start()
+        api = RiotAPI('test-key')
+        base = f"http://127.0.0.1:{PORT}"
+        api.base_urls = {'europe': base, 'euw1': base}
+        api.cache.clock = clock
+        try:
+            start = time.perf_counter()
+            cold = await api.get_account_info('Alice', 'EUW')
+            cold_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            warm = await api.get_account_info('alice', 'euw')
+            warm_time = time.perf_counter() - start
+
+            # Rangs expirés : une seule requête, le PUUID et le profil restent en cache
+            clock.now += api.rank_ttl + 1
+            start = time.perf_counter()
+            await api.get_account_info('Alice', 'EUW')
+            rank_time = time.perf_counter() - start
+            return cold, warm, cold_time, warm_time, rank_time
+        finally:
+            await api.cleanup()
+            await runner.cleanup()
+
+    cold, warm, cold_time, warm_time, rank_time = asyncio.run(scenario())
+    logger.info(f"Froid: {cold_time * 1000:.0f}ms - chaud: {warm_time * 1000:.1f}ms - "
+                f"rangs expirés: {rank_time * 1000:.0f}ms")
+    assert cold['ranks']['solo_duo']['tier'] == 'GOLD'
+    assert warm['puuid'] == cold['puuid'] and warm['ranks'] == cold['ranks']
+    assert hits == ['account', 'summoner', 'league', 'league'] or hits == ['account', 'league', 'summoner', 'league']
+    # Deux allers-retours à froid (compte, puis profil et rangs en parallèle)
+    assert cold_time < 3 * LATENCY
+    assert warm_time < LATENCY
+    assert rank_time < 2 * LATENCY
+
+
+if __name__ == "__main__":
+    test_account_info_parallel_and_cached()
+    logger.info("✅ Tests terminés")
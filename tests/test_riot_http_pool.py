@@ -0,0 +1,98 @@
+# tests/test_riot_http_pool.py
+import asyncio
+import logging
+import os
+from types import SimpleNamespace
+from aiohttp import web
+from tilttracker.modules.riot_api import RiotAPI
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+PORT = 18768
+
+
+def make_app(seen_headers):
+    async def match(request):
+        seen_headers.append(dict(request.headers))
+        await asyncio.sleep(0.01)
+        response = web.json_response({'metadata': {'matchId': request.match_info['match_id']}})
+        # Compression négociée comme le fait l'API Riot
+        response.enable_compression()
+        return response
+
+    app = web.Application()
+    app.router.add_get('/lol/match/v5/matches/{match_id}', match)
+    return app
+
+
+def test_connections_are_reused():
+    """Un pool limité et maintenu ouvert : peu de connexions pour beaucoup de requêtes"""
+    seen_headers = []
+
+    async def scenario():
+        runner = web.AppRunner(make_app(seen_headers))
+        await runner.setup()
+        await web.TCPSite(runner, '127.0.0.1', PORT).start()
+        api = RiotAPI('test-key')
+        api.base_urls = {'europe': f"http://127.0.0.1:{PORT}", 'euw1': f"http://127.0.0.1:{PORT}"}
+        api.pool_size = 4
+        try:
+            url = f"{api.base_urls['europe']}/lol/match/v5/matches"
+            # Rafale concurrente puis requêtes séquentielles
+            burst = await asyncio.gather(*(api._make_request(f"{url}/EUW1_{i}") for i in range(12)))
+            for i in range(8):
+                await api._make_request(f"{url}/EUW1_seq{i}")
+            stats = api.pool_stats()
+        finally:
+            await api.cleanup()
+            await runner.cleanup()
+        return burst, stats, api
+
+    burst, stats, api = asyncio.run(scenario())
+    logger.info(f"Pool: {stats}")
+    assert burst[3] == {'metadata': {'matchId': 'EUW1_3'}}
+    assert stats['limit_per_host'] == 4
+    assert stats['new'] <= 4
+    assert stats['new'] + stats['reused'] == 20
+    assert stats['in_use'] == 0 and stats['idle'] >= 1
+    assert stats['requests_in_flight'] == 0
+    # Session et pool fermés avec le service
+    assert api.session is None and api.pool_stats()['idle'] == 0
+
+    headers = seen_headers[0]
+    assert headers['X-Riot-Token'] == 'test-key'
+    assert 'gzip' in headers['Accept-Encoding']
+
+
+def test_pool_sized_to_rate_budget():
+    """Par défaut, autant de connexions par hôte que la plus petite fenêtre du budget"""
+    os.environ['RIOT_RATE_LIMITS'] = '50:10,500:600'
+    try:
+        os.environ['RIOT_HTTP_POOL_SIZE'] = ''
+        assert RiotAPI('test-key').pool_size == 50
+        os.environ['RIOT_HTTP_POOL_SIZE'] = '8'
+        assert RiotAPI('test-key').pool_size == 8
+    finally:
+        os.environ.pop('RIOT_RATE_LIMITS')
+        os.environ.pop('RIOT_HTTP_POOL_SIZE')
+
+
+def test_pool_stats_without_connector_internals():
+    """Sans les attributs internes d'aiohttp, l'occupation vient des compteurs de traces"""
+    api = RiotAPI('test-key')
+    api.connector = SimpleNamespace(limit=0, limit_per_host=4, closed=False)
+    api.requests_in_flight = 2
+    stats = api.pool_stats()
+    assert stats['in_use'] == 2 and stats['idle'] == 0 and stats['hosts'] == {}
+    assert stats['limit_per_host'] == 4
+
+
+if __name__ == "__main__":
+    test_connections_are_reused()
+    test_pool_sized_to_rate_budget()
+    test_pool_stats_without_connector_internals()
+    logger.info("✅ Tests terminés")
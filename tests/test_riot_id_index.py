@@ -0,0 +1,55 @@
+# tests/test_riot_id_index.py
+import logging
+import random
+import string
+import time
+from tilttracker.utils.riot_id_index import RiotIdIndex
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def test_prefix_search():
+    """Recherche insensible à la casse, par nom ou nom#tag"""
+    index = RiotIdIndex([("Alice", "EUW"), ("alibaba", "1234"), ("Bob", "EUW"), ("Alice", "KR1")])
+    assert index.search("ali") == [("alibaba", "1234"), ("Alice", "EUW"), ("Alice", "KR1")]
+    assert index.search("ALICE#k") == [("Alice", "KR1")]
+    assert index.search("zed") == []
+    assert index.tags_for("alice") == ["EUW", "KR1"]
+    assert index.tags_for("Alice", "e") == ["EUW"]
+
+    # Inscription : ajout sans rechargement, mise à jour de la casse
+    index.add("Alicia", "EUW")
+    index.add("ALICE", "EUW")
+    assert index.search("alic", limit=2) == [("ALICE", "EUW"), ("Alice", "KR1")]
+    assert len(index) == 5
+
+    # Renommage : l'ancien Riot ID disparaît des suggestions
+    index.remove("alicia", "euw")
+    index.remove("Inconnu", "EUW")
+    assert index.search("alici") == []
+    assert len(index) == 4
+
+
+def test_search_speed():
+    """Suggestions en quelques microsecondes sur un gros index"""
+    rng = random.Random(42)
+    riot_ids = [("".join(rng.choices(string.ascii_letters, k=rng.randint(3, 16))), "EUW")
+                for _ in range(100000)]
+    index = RiotIdIndex(riot_ids)
+    prefixes = ["".join(rng.choices(string.ascii_lowercase, k=2)) for _ in range(1000)]
+    start = time.perf_counter()
+    for prefix in prefixes:
+        index.search(prefix)
+    per_search = (time.perf_counter() - start) / len(prefixes)
+    logger.info(f"{len(index)} Riot ID - {per_search * 1e6:.1f}µs par recherche")
+    assert per_search < 0.001
+
+
+if __name__ == "__main__":
+    test_prefix_search()
+    test_search_speed()
+    logger.info("✅ Tests terminés")
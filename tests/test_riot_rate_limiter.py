@@ -0,0 +1,66 @@
+# tests/test_riot_rate_limiter.py
+import asyncio
+import logging
+from tilttracker.modules.riot_api import RiotRateLimiter, parse_rate_limits
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class FakeClock:
+    """Horloge simulée : sleep() avance le temps sans attendre"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, delay):
+        self.now += delay
+
+
+def test_parse_rate_limits():
+    """Format des en-têtes X-App-Rate-Limit"""
+    assert parse_rate_limits("20:1,100:120") == [(20, 1.0), (100, 120.0)]
+    assert parse_rate_limits(" 5:10 ,") == [(5, 10.0)]
+
+
+def test_shared_budget():
+    """Les requêtes concurrentes respectent toutes les fenêtres"""
+    clock = FakeClock()
+    limiter = RiotRateLimiter([(20, 1.0), (100, 120.0)], clock=clock, sleep=clock.sleep)
+
+    async def request():
+        await limiter.acquire()
+        return clock.now
+
+    async def scenario():
+        return await asyncio.gather(*[request() for _ in range(150)])
+
+    times = sorted(asyncio.run(scenario()))
+    for i in range(len(times)):
+        assert sum(1 for t in times[i:] if t < times[i] + 1.0) <= 20
+        assert sum(1 for t in times[i:] if t < times[i] + 120.0) <= 100
+    logger.info(f"150 requêtes étalées sur {times[-1]:.1f}s")
+    assert times[100] >= 120.0
+
+
+def test_block_after_429():
+    """Un 429 suspend toutes les requêtes pendant Retry-After"""
+    clock = FakeClock()
+    limiter = RiotRateLimiter([(20, 1.0)], clock=clock, sleep=clock.sleep)
+    limiter.block(30)
+    waited = asyncio.run(limiter.acquire())
+    assert waited == 30
+    assert clock.now == 30
+
+
+if __name__ == "__main__":
+    test_parse_rate_limits()
+    test_shared_budget()
+    test_block_after_429()
+    logger.info("✅ Tests terminés")
@@ -0,0 +1,125 @@
+# tests/test_riot_regions.py
+import asyncio
+import logging
+import time
+from aiohttp import web
+from tilttracker.modules.match_watcher import MatchWatcher
+from tilttracker.modules.riot_api import (RiotAPI, account_route, normalize_platform, platform_of_match,
+                                          regional_route)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+PORT = 18769
+# Deux adresses de boucle locale : deux hôtes distincts pour aiohttp
+HOSTS = {'europe': '127.0.0.1', 'euw1': '127.0.0.1', 'americas': '127.0.0.2', 'na1': '127.0.0.2'}
+
+
+def test_platforms():
+    assert normalize_platform('EUW') == 'euw1'
+    assert normalize_platform(' na1 ') == 'na1'
+    assert normalize_platform('eune') == 'eun1'
+    assert normalize_platform('atlantis') is None and normalize_platform(None) is None
+    assert regional_route('kr') == 'asia' and regional_route('br1') == 'americas'
+    # account-v1 n'est pas servi par sea
+    assert regional_route('oc1') == 'sea' and account_route('oc1') == 'asia'
+    assert platform_of_match('NA1_5123456789') == 'na1'
+    assert platform_of_match('KR_7000') == 'kr'
+    assert platform_of_match('inconnu') is None
+
+
+def make_app(hits):
+    async def account(request):
+        hits.append(('account', request.host.split(':')[0]))
+        return web.json_response({'puuid': f"puuid-{request.match_info['name']}"})
+
+    async def summoner(request):
+        hits.append(('summoner', request.host.split(':')[0]))
+        return web.json_response({'profileIconId': 1, 'summonerLevel': 30})
+
+    async def league(request):
+        hits.append(('league', request.host.split(':')[0]))
+        return web.json_response([])
+
+    async def match_ids(request):
+        hits.append(('match_ids', request.host.split(':')[0]))
+        return web.json_response(['NA1_1'])
+
+    app = web.Application()
+    app.router.add_get('/riot/account/v1/accounts/by-riot-id/{name}/{tag}', account)
+    app.router.add_get('/lol/summoner/v4/summoners/by-puuid/{puuid}', summoner)
+    app.router.add_get('/lol/league/v4/entries/by-puuid/{puuid}', league)
+    app.router.add_get('/lol/match/v5/matches/by-puuid/{puuid}/ids', match_ids)
+    return app
+
+
+def test_requests_are_routed_per_region():
+    """Chaque joueur est interrogé sur son serveur, avec un budget par hôte"""
+    hits = []
+
+    async def scenario():
+        runner = web.AppRunner(make_app(hits))
+        await runner.setup()
+        for address in set(HOSTS.values()):
+            await web.TCPSite(runner, address, PORT).start()
+        api = RiotAPI('test-key')
+        api.base_urls = {routing: f"http://{address}:{PORT}" for routing, address in HOSTS.items()}
+        try:
+            eu = await api.get_account_info('Alice', 'EUW')
+            na = await api.get_account_info('Bob', 'NA1', 'na1')
+            await api.get_recent_aram_matches(na['puuid'], platform='na1')
+            return eu, na, sorted(api.rate_limiters), api.pool_stats()
+        finally:
+            await api.cleanup()
+            await runner.cleanup()
+
+    eu, na, limiters, pool = asyncio.run(scenario())
+    assert eu['region'] == 'euw1' and na['region'] == 'na1'
+    assert {host for kind, host in hits if kind != 'match_ids'} == {'127.0.0.1', '127.0.0.2'}
+    assert ('summoner', '127.0.0.2') in hits and ('match_ids', '127.0.0.2') in hits
+    assert ('summoner', '127.0.0.1') in hits
+    # Un budget et un pool de connexions par hôte
+    assert limiters == [f"127.0.0.1:{PORT}", f"127.0.0.2:{PORT}"]
+    assert set(pool['hosts']) == {'127.0.0.1', '127.0.0.2'}
+
+
+class FakeRiot:
+    default_platform = 'euw1'
+
+
+def test_clusters_are_processed_in_parallel():
+    """Les clusters régionaux avancent en parallèle, les joueurs d'un cluster l'un après l'autre"""
+    watcher = MatchWatcher.__new__(MatchWatcher)
+    watcher.riot_api = FakeRiot()
+    running = {}
+    overlaps = []
+
+    async def process_new_matches(player):
+        cluster = regional_route(player['region'] or 'euw1')
+        running[cluster] = running.get(cluster, 0) + 1
+        overlaps.append(dict(running))
+        await asyncio.sleep(0.05)
+        running[cluster] -= 1
+
+    watcher.process_new_matches = process_new_matches
+    players = [{'region': region} for region in ('euw1', 'eun1', None, 'na1', 'br1', 'kr')]
+
+    start = time.perf_counter()
+    asyncio.run(watcher.process_players(players, pause=0))
+    elapsed = time.perf_counter() - start
+
+    logger.info(f"6 joueurs sur 3 clusters traités en {elapsed * 1000:.0f}ms")
+    # europe (3 joueurs) fixe la durée ; séquentiel : 6 x 50ms
+    assert elapsed < 0.25
+    assert all(count <= 1 for snapshot in overlaps for count in snapshot.values())
+    assert any(sum(snapshot.values()) == 3 for snapshot in overlaps)
+
+
+if __name__ == "__main__":
+    test_platforms()
+    test_requests_are_routed_per_region()
+    test_clusters_are_processed_in_parallel()
+    logger.info("✅ Tests terminés")
@@ -0,0 +1,261 @@
+# tests/test_riot_retries.py
+import asyncio
+import logging
+from aiohttp import web
+from tilttracker.modules.riot_api import RiotAPI, RiotUnavailable, endpoint_name
+from tilttracker.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreakers, CircuitOpen, backoff_delay
+from tilttracker.utils.metrics import REGISTRY
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+PORT = 18767
+# Disjoncteur du point d'accès sur le faux serveur
+ENDPOINT = f"match-v5@127.0.0.1:{PORT}"
+
+
+class FakeClock:
+    """Horloge simulée : sleep() avance le temps sans attendre"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+def make_app(responses, hits):
+    """Sert les statuts de `responses` dans l'ordre (le dernier se répète)"""
+    async def match(request):
+        hits.append(request.match_info['match_id'])
+        status = responses[min(len(hits) - 1, len(responses) - 1)]
+        if status == 'slow':
+            await asyncio.sleep(1)
+            status = 200
+        if status == 'streamed503':
+            # Corps envoyé lentement : la connexion reste occupée tant qu'il n'est pas lu
+            response = web.StreamResponse(status=503)
+            await response.prepare(request)
+            await response.write(b'erreur')
+            await asyncio.sleep(0.2)
+            await response.write_eof()
+            return response
+        if status == 200:
+            return web.json_response({'ok': True})
+        return web.Response(status=status)
+
+    app = web.Application()
+    app.router.add_get('/lol/match/v5/matches/{match_id}', match)
+    return app
+
+
+def run(responses, scenario, **settings):
+    """Démarre le faux serveur Riot et exécute le scénario avec un RiotAPI configuré"""
+    hits = []
+    clock = FakeClock()
+
+    async def main():
+        runner = web.AppRunner(make_app(responses, hits))
+        await runner.setup()
+        await web.TCPSite(runner, '127.0.0.1', PORT).start()
+        api = RiotAPI('test-key')
+        api.base_urls = {'europe': f"http://127.0.0.1:{PORT}", 'euw1': f"http://127.0.0.1:{PORT}"}
+        api.clock = clock
+        api.sleep = clock.sleep
+        api.breakers = CircuitBreakers(settings.pop('threshold', 5), settings.pop('cooldown', 30), clock)
+        for name, value in settings.items():
+            setattr(api, name, value)
+        try:
+            return await scenario(api, clock)
+        finally:
+            await api.cleanup()
+            await runner.cleanup()
+
+    return asyncio.run(main()), hits
+
+
+def url(match_id='EUW1_1'):
+    return f"http://127.0.0.1:{PORT}/lol/match/v5/matches/{match_id}"
+
+
+def test_endpoint_name():
+    assert endpoint_name("https://europe.api.riotgames.com/lol/match/v5/matches/EUW1_1") == 'match-v5'
+    assert endpoint_name("https://europe.api.riotgames.com/riot/account/v1/accounts/by-riot-id/a/b") == 'account-v1'
+    assert endpoint_name("https://euw1.api.riotgames.com/lol/league/v4/entries/by-puuid/x?a=1") == 'league-v4'
+
+
+def test_backoff_delay_bounds():
+    """Gigue complète, plafonnée"""
+    for attempt in range(10):
+        assert 0 <= backoff_delay(attempt, 0.5, 8) <= min(8, 0.5 * 2 ** attempt)
+
+
+def test_retries_5xx_then_succeeds():
+    """Deux 503 puis un succès : trois appels, deux attentes"""
+    async def scenario(api, clock):
+        return await api._make_request(url()), list(clock.sleeps)
+
+    (data, sleeps), hits = run([503, 503, 200], scenario)
+    assert data == {'ok': True}
+    assert len(hits) == 3
+    assert len(sleeps) == 2
+    retries = REGISTRY.counter('riot_retries_total', endpoint=ENDPOINT, reason='503').value
+    assert retries >= 2
+
+
+def test_backoff_releases_connection():
+    """Pendant l'attente entre deux essais, aucune connexion n'est retenue"""
+    async def scenario(api, clock):
+        in_use = []
+        sleep = api.sleep
+
+        async def recording_sleep(delay):
+            in_use.append(api.pool_stats()['in_use'])
+            await sleep(delay)
+
+        api.sleep = recording_sleep
+        return await api._make_request(url()), in_use
+
+    (data, in_use), hits = run(['streamed503', 'streamed503', 200], scenario)
+    assert data == {'ok': True}
+    assert in_use == [0, 0]
+
+
+def test_retries_are_bounded():
+    """Riot en panne : max_retries + 1 appels puis RiotUnavailable"""
+    async def scenario(api, clock):
+        try:
+            await api._make_request(url())
+        except RiotUnavailable as e:
+            return str(e)
+        return None
+
+    error, hits = run([500], scenario, max_retries=2)
+    assert error is not None and 'match-v5' in error
+    assert len(hits) == 3
+
+
+def test_not_found_is_not_retried():
+    async def scenario(api, clock):
+        return await api._make_request(url())
+
+    data, hits = run([404], scenario)
+    assert data is None
+    assert len(hits) == 1
+
+
+def test_deadline_stops_retries():
+    """Le délai global coupe les tentatives même s'il en reste"""
+    async def scenario(api, clock):
+        try:
+            await api._make_request(url())
+        except RiotUnavailable as e:
+            return str(e)
+        return None
+
+    error, hits = run(['slow'], scenario, request_deadline=0.2, max_retries=10)
+    assert error is not None
+    # Arrêt avant d'avoir épuisé les tentatives
+    assert len(hits) < 11
+
+
+def test_circuit_opens_and_recovers():
+    """Échecs répétés : le circuit s'ouvre, échoue sans appel, puis se referme après un test réussi"""
+    responses = [503, 503, 200]
+
+    async def scenario(api, clock):
+        for _ in range(2):
+            try:
+                await api._make_request(url())
+            except RiotUnavailable:
+                pass
+        assert api.breaker_states() == {ENDPOINT: OPEN}
+
+        try:
+            await api._make_request(url())
+            raise AssertionError("le circuit aurait dû refuser la requête")
+        except CircuitOpen as e:
+            assert 0 < e.retry_after <= 30
+
+        clock.now += 31
+        data = await api._make_request(url())
+        return data, api.breaker_states()
+
+    (data, states), hits = run(responses, scenario, threshold=2, max_retries=0)
+    assert data == {'ok': True}
+    assert states == {ENDPOINT: CLOSED}
+    # Deux échecs et un test : la requête refusée n'a pas atteint Riot
+    assert len(hits) == 3
+
+
+def test_failed_probe_reopens():
+    clock = FakeClock()
+    breakers = CircuitBreakers(failure_threshold=1, cooldown=10, clock=clock)
+    breaker = breakers.get('match-v5')
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    clock.now += 10
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    try:
+        breaker.before_request()
+        raise AssertionError("le circuit aurait dû rester ouvert")
+    except CircuitOpen:
+        pass
+
+
+def test_abandoned_probe_is_replaced():
+    """Un test annulé sans succès ni échec ne bloque pas le circuit indéfiniment"""
+    clock = FakeClock()
+    breaker = CircuitBreakers(failure_threshold=1, cooldown=10, clock=clock).get('match-v5')
+    breaker.record_failure()
+    clock.now += 10
+    breaker.before_request()
+    assert breaker.state == HALF_OPEN
+    try:
+        breaker.before_request()
+        raise AssertionError("un seul test à la fois")
+    except CircuitOpen:
+        pass
+    clock.now += 10
+    breaker.before_request()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+def test_account_info_surfaces_outage():
+    """Riot indisponible n'est pas confondu avec un compte introuvable"""
+    async def scenario(api, clock):
+        api.breakers.get(f"account-v1@127.0.0.1:{PORT}").record_failure()
+        try:
+            await api.get_account_info('Alice', 'EUW')
+        except CircuitOpen:
+            return True
+        return False
+
+    surfaced, hits = run([200], scenario, threshold=1)
+    assert surfaced and not hits
+
+
+if __name__ == "__main__":
+    test_endpoint_name()
+    test_backoff_delay_bounds()
+    test_retries_5xx_then_succeeds()
+    test_backoff_releases_connection()
+    test_retries_are_bounded()
+    test_not_found_is_not_retried()
+    test_deadline_stops_retries()
+    test_circuit_opens_and_recovers()
+    test_failed_probe_reopens()
+    test_abandoned_probe_is_replaced()
+    test_account_info_surfaces_outage()
+    logger.info("✅ Tests terminés")
@@ -1,4 +1,5 @@
 # tests/test_scoring.py
+import asyncio
 import logging
 import json
 import os
@@ -133,43 +134,47 @@ def test_full_game_processing():
     # Test avec votre compte
     summoner_name = "GuigZer"
     tag_line = "1101"
-    
-    try:
-        # Récupération et traitement d'une partie
-        logger.info(f"Test avec le compte {summoner_name}#{tag_line}")
-        
-        # Vérification du joueur
-        player_id = processor.ensure_player_exists(summoner_name, tag_line)
-        if not player_id:
-            logger.error("❌ Échec de la vérification du joueur")
-            return False
-        
-        # Récupération du PUUID
-        puuid = processor.riot_api.get_puuid(summoner_name, tag_line)
-        if not puuid:
-            logger.error("❌ PUUID non trouvé")
-            return False
-            
-        # Récupération des parties récentes
-        matches = processor.riot_api.get_recent_aram_matches(puuid, count=1)
-        if not matches:
-            logger.error("❌ Aucune partie trouvée")
+
+    async def scenario():
+        # Une seule boucle pour tout le scénario : la session HTTP du processor y est liée
+        try:
+            # Récupération et traitement d'une partie
+            logger.info(f"Test avec le compte {summoner_name}#{tag_line}")
+
+            # Vérification du joueur
+            player_id = await processor.ensure_player_exists(summoner_name, tag_line)
+            if not player_id:
+                logger.error("❌ Échec de la vérification du joueur")
+                return False
+
+            # Récupération du PUUID (déjà résolu, servi depuis la mémoire)
+            puuid = await processor.puuid_resolver.resolve(summoner_name, tag_line)
+            if not puuid:
+                logger.error("❌ PUUID non trouvé")
+                return False
+
+            # Récupération des parties récentes
+            matches = await processor.riot_api.get_recent_aram_matches(puuid, count=1)
+            if not matches:
+                logger.error("❌ Aucune partie trouvée")
+                return False
+
+            # Traitement de la dernière partie
+            success = await processor._process_single_match(matches[0], puuid)
+            if success:
+                logger.info("✅ Partie traitée avec succès")
+            else:
+                logger.error("❌ Échec du traitement de la partie")
+
+        except Exception as e:
+            logger.error(f"❌ Erreur lors du test: {e}")
             return False
-            
-        # Traitement de la dernière partie
-        success = processor._process_single_match(matches[0], puuid)
-        if success:
-            logger.info("✅ Partie traitée avec succès")
-        else:
-            logger.error("❌ Échec du traitement de la partie")
-            
-    except Exception as e:
-        logger.error(f"❌ Erreur lors du test: {e}")
-        return False
-    finally:
-        processor.close()
+        finally:
+            await processor.close()
+
+        return True
 
-    return True
+    return asyncio.run(scenario())
 
 if __name__ == "__main__":
     logger.info("🏁 Début des tests du système de scoring")
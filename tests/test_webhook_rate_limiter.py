@@ -0,0 +1,111 @@
+# tests/test_webhook_rate_limiter.py
+import asyncio
+import logging
+from tilttracker.modules.discord_publisher import WebhookRateLimiter
+from tilttracker.utils.metrics import MetricsRegistry
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+URL = "https://discord.com/api/webhooks/1/token"
+
+
+class FakeClock:
+    """Horloge simulée : sleep() avance le temps instantanément"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, delay):
+        self.now += delay
+
+
+def _headers(remaining, reset_after, bucket='abc', limit=5):
+    return {
+        'X-RateLimit-Bucket': bucket,
+        'X-RateLimit-Limit': str(limit),
+        'X-RateLimit-Remaining': str(remaining),
+        'X-RateLimit-Reset-After': str(reset_after),
+    }
+
+
+def test_bucket_exhaustion_waits_for_reset():
+    """Un bucket épuisé fait attendre le Reset-After au lieu de provoquer un 429"""
+    clock = FakeClock()
+    limiter = WebhookRateLimiter(clock=clock, sleep=clock.sleep)
+
+    async def scenario():
+        bucket, waited = await limiter.acquire(URL)
+        assert waited == 0
+        limiter.release(URL, bucket, _headers(remaining=1, reset_after=2.0))
+
+        bucket, waited = await limiter.acquire(URL)
+        assert waited == 0
+        # Plus de requête disponible avant la fin de la fenêtre
+        bucket_next = asyncio.ensure_future(limiter.acquire(URL))
+        limiter.release(URL, bucket, _headers(remaining=0, reset_after=2.0))
+        _, waited = await bucket_next
+        return waited
+
+    waited = asyncio.run(scenario())
+    logger.info(f"Attente avant la nouvelle fenêtre: {waited:.2f}s")
+    assert abs(waited - 2.0) < 1e-9
+
+
+def test_in_flight_requests_are_reserved():
+    """Les envois en cours ne sont pas recomptés comme disponibles"""
+    clock = FakeClock()
+    limiter = WebhookRateLimiter(clock=clock, sleep=clock.sleep)
+
+    async def scenario():
+        first, _ = await limiter.acquire(URL)
+        second, _ = await limiter.acquire(URL)
+        # Réponse au premier envoi : 1 restant, mais le second est encore en cours
+        limiter.release(URL, first, _headers(remaining=1, reset_after=1.0))
+        return limiter.buckets[URL].remaining
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_global_limit_pauses_all_webhooks():
+    """Une limite globale suspend tous les webhooks"""
+    clock = FakeClock()
+    limiter = WebhookRateLimiter(clock=clock, sleep=clock.sleep)
+    limiter.rate_limited(URL, retry_after=3.0, is_global=True)
+
+    async def scenario():
+        _, waited = await limiter.acquire("https://discord.com/api/webhooks/2/other")
+        return waited
+
+    assert asyncio.run(scenario()) == 3.0
+
+
+def test_metrics_registry():
+    """Compteurs et histogrammes par labels, rendu Prometheus"""
+    registry = MetricsRegistry()
+    registry.counter('messages_total', status='sent').inc()
+    registry.counter('messages_total', status='sent').inc()
+    registry.counter('messages_total', status='error').inc()
+    wait = registry.histogram('wait_seconds', buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        wait.observe(value)
+
+    assert registry.counter('messages_total', status='sent').value == 2
+    assert wait.quantile(0.5) == 1.0
+    text = registry.render()
+    assert 'messages_total{status="error"} 1.0' in text
+    assert 'wait_seconds_bucket{le="+Inf"} 4' in text
+
+
+if __name__ == "__main__":
+    test_bucket_exhaustion_waits_for_reset()
+    test_in_flight_requests_are_reserved()
+    test_global_limit_pauses_all_webhooks()
+    test_metrics_registry()
+    logger.info("✅ Tests terminés")
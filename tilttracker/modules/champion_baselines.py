@@ -0,0 +1,142 @@
+# tilttracker/modules/champion_baselines.py
+import logging
+from typing import Callable, Dict, Iterable, List, Tuple
+from tilttracker.utils.database import Database
+from tilttracker.utils.tdigest import TDigest, PercentileTable
+
+logger = logging.getLogger(__name__)
+
+# Statistiques brutes suivies pour chaque champion
+RAW_STATS = (
+    'kills',
+    'deaths',
+    'assists',
+    'total_damage_dealt_to_champions',
+    'total_damage_taken',
+    'damage_self_mitigated',
+    'total_time_crowd_control_dealt',
+    'vision_score',
+    'gold_earned',
+)
+
+# Statistiques dérivées utilisées par le calcul de performance
+DERIVED_STATS = ('kill_participation', 'tank_score', 'utility_score')
+
+BASELINE_STATS = RAW_STATS + DERIVED_STATS
+
+# Nombre minimum de parties avant d'utiliser les percentiles d'un champion
+MIN_BASELINE_SAMPLES = 50
+
+
+def baseline_values(stats: Dict) -> Dict[str, float]:
+    """Extrait les valeurs suivies (brutes et dérivées) des stats d'un participant"""
+    team_kills = stats['team_kills'] if stats['team_kills'] > 0 else 1
+    values = {stat: stats[stat] for stat in RAW_STATS}
+    values['kill_participation'] = (stats['kills'] + stats['assists']) / team_kills * 100
+    values['tank_score'] = stats['total_damage_taken'] + stats['damage_self_mitigated']
+    values['utility_score'] = stats['total_time_crowd_control_dealt'] + stats['vision_score'] * 100
+    return values
+
+
+class ChampionBaselines:
+    """
+    Distributions de référence de chaque statistique par champion.
+
+    Chaque couple (champion, stat) est résumé par un TDigest alimenté par tous
+    les participants des parties traitées (pas seulement les joueurs inscrits).
+    Une table de percentiles est précalculée à chaque mise à jour pour que la
+    conversion stat -> percentile se fasse en O(1) pendant le scoring.
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+        self.digests: Dict[Tuple[int, str], TDigest] = {}
+        self.tables: Dict[Tuple[int, str], PercentileTable] = {}
+        self.loaded = False
+
+    async def ensure_loaded(self) -> None:
+        """Charge les sketches depuis la base au premier usage"""
+        if self.loaded:
+            return
+        await self.reload()
+
+    async def reload(self) -> None:
+        """Recharge tous les sketches depuis la base"""
+        self.digests = {}
+        self.tables = {}
+        for champion_id, stat, data in await self.db.get_champion_baselines():
+            key = (champion_id, stat)
+            self.digests[key] = TDigest.from_bytes(data)
+            self.tables[key] = self.digests[key].percentile_table()
+        self.loaded = True
+        logger.info(f"{len(self.digests)} sketches de percentiles chargés")
+
+    async def ingest_match(self, match_id: str, participants: Iterable[Dict]) -> bool:
+        """
+        Met à jour les distributions avec tous les participants d'une partie.
+        Une partie n'est comptabilisée qu'une seule fois.
+
+        Returns:
+            True si les distributions ont été mises à jour
+        """
+        await self.ensure_loaded()
+        if await self.db.is_match_baselined(match_id):
+            return False
+
+        updated = set()
+        for stats in participants:
+            champion_id = int(stats['champion_id'])
+            for stat, value in baseline_values(stats).items():
+                key = (champion_id, stat)
+                if key not in self.digests:
+                    self.digests[key] = TDigest()
+                self.digests[key].update(value)
+                updated.add(key)
+
+        rows = [(champion_id, stat, int(self.digests[(champion_id, stat)].count),
+                 self.digests[(champion_id, stat)].to_bytes())
+                for champion_id, stat in updated]
+
+        if not await self.db.store_champion_baselines(match_id, rows):
+            # Partie déjà comptée ailleurs ou erreur : on repart de l'état en base
+            await self.reload()
+            return False
+
+        for key in updated:
+            self.tables[key] = self.digests[key].percentile_table()
+        return True
+
+    def sample_count(self, champion_id: int) -> int:
+        """Nombre de parties connues pour un champion"""
+        digest = self.digests.get((int(champion_id), 'kills'))
+        return int(digest.count) if digest else 0
+
+    def is_ready(self, champion_ids: Iterable[int]) -> bool:
+        """Vérifie que tous les champions ont assez de parties pour être comparés"""
+        return all(self.sample_count(champion_id) >= MIN_BASELINE_SAMPLES for champion_id in champion_ids)
+
+    def percentile(self, champion_id: int, stat: str, value: float) -> float:
+        """Percentile (0-100) d'une valeur pour un champion, 50 si inconnu"""
+        table = self.tables.get((int(champion_id), stat))
+        if table is None:
+            return 50.0
+        return table.lookup(value)
+
+    def percentile_function(self, champion_id: int) -> Callable[[str, float], float]:
+        """Retourne une fonction (stat, valeur) -> percentile pour un champion"""
+        champion_id = int(champion_id)
+
+        def percentile(stat: str, value: float) -> float:
+            table = self.tables.get((champion_id, stat))
+            return table.lookup(value) if table is not None else 50.0
+
+        return percentile
+
+    def summary(self, champion_id: int) -> List[Tuple[str, float, float, float]]:
+        """Quartiles (p25, p50, p75) de chaque statistique d'un champion"""
+        result = []
+        for stat in BASELINE_STATS:
+            digest = self.digests.get((int(champion_id), stat))
+            if digest:
+                result.append((stat, digest.quantile(0.25), digest.quantile(0.5), digest.quantile(0.75)))
+        return result
@@ -0,0 +1,110 @@
+# tilttracker/modules/chart_renderer.py
+import asyncio
+import hashlib
+import io
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+from tilttracker.utils.cache import TTLCache
+from tilttracker.utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+
+def render_score_chart(title: str, scores: Sequence[int], wins: Sequence[bool]) -> bytes:
+    """
+    Dessine l'évolution du score cumulé et retourne l'image PNG.
+    Exécutée dans un processus du pool : ne dépend que de ses arguments.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    games = list(range(1, len(scores) + 1))
+    cumulative = []
+    total = 0
+    for score in scores:
+        total += score
+        cumulative.append(total)
+
+    fig, ax = plt.subplots(figsize=(8, 4), dpi=100)
+    try:
+        fig.patch.set_facecolor('#2b2d31')
+        ax.set_facecolor('#2b2d31')
+        ax.plot(games, cumulative, color='#5865f2', linewidth=2)
+        ax.scatter(games, cumulative, s=12, zorder=3,
+                   c=['#57f287' if win else '#ed4245' for win in wins])
+        ax.axhline(0, color='#4e5058', linewidth=1)
+        ax.set_title(title, color='white')
+        ax.set_xlabel('Parties', color='#b5bac1')
+        ax.set_ylabel('Score cumulé', color='#b5bac1')
+        ax.tick_params(colors='#b5bac1')
+        for spine in ax.spines.values():
+            spine.set_color('#4e5058')
+        ax.grid(alpha=0.15)
+        fig.tight_layout()
+
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', facecolor=fig.get_facecolor())
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+
+class ChartRenderer:
+    """
+    Rendu des graphiques hors de la boucle d'événements, dans un pool de
+    processus, avec un cache d'images.
+
+    Une image est identifiée par le joueur et la dernière partie de son
+    historique : elle reste valide jusqu'à l'arrivée d'une nouvelle partie.
+    Les demandes simultanées du même graphique partagent un seul rendu
+    (TTLCache.get_or_load).
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, cache_size: Optional[int] = None):
+        self.max_workers = max_workers or int(os.getenv('CHART_RENDER_WORKERS', '2'))
+        self.cache_size = cache_size or int(os.getenv('CHART_CACHE_SIZE', '128'))
+        self.executor: Optional[ProcessPoolExecutor] = None
+        # Pas d'expiration : la clé change avec chaque nouvelle partie
+        self.images = TTLCache(ttl=float('inf'), max_entries=self.cache_size, name='charts')
+        self.render_time = REGISTRY.histogram('chart_render_seconds', "Durée du rendu d'un graphique")
+
+    @staticmethod
+    def cache_key(summoner_name: str, tag_line: str, last_match_id: str) -> str:
+        """Adresse d'une image : le joueur et sa dernière partie"""
+        return hashlib.sha256(f"{summoner_name}#{tag_line}:{last_match_id}".encode()).hexdigest()
+
+    async def score_chart(self, summoner_name: str, tag_line: str, history: List[Dict]) -> Tuple[str, bytes]:
+        """
+        Graphique du score cumulé d'un joueur.
+
+        Args:
+            history: Historique chronologique (get_player_score_history)
+
+        Returns:
+            Tuple (clé de l'image, PNG)
+        """
+        key = self.cache_key(summoner_name, tag_line, history[-1]['match_id'])
+        image = await self.images.get_or_load('score_chart', (key,), lambda: self._render(
+            f"Score cumulé de {summoner_name}#{tag_line}",
+            [game['score'] for game in history],
+            [game['win'] for game in history]
+        ))
+        return key, image
+
+    async def _render(self, title: str, scores: List[int], wins: List[bool]) -> bytes:
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        image = await loop.run_in_executor(self.executor, render_score_chart, title, scores, wins)
+        self.render_time.observe(loop.time() - start)
+        return image
+
+    def close(self):
+        """Arrête le pool de processus"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
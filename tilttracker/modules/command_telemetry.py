@@ -0,0 +1,118 @@
+# tilttracker/modules/command_telemetry.py
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+from discord.ext import commands
+from tilttracker.utils.metrics import REGISTRY
+
+# Phases mesurées pour chaque commande
+PHASES = ('defer', 'db', 'riot', 'total')
+
+# Bornes des histogrammes de commandes (secondes)
+COMMAND_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 15.0)
+
+_current: ContextVar[Optional['CommandTimings']] = ContextVar('command_timings', default=None)
+
+
+class CommandTimings:
+    """Temps cumulés par phase pour la commande en cours"""
+    __slots__ = ('command', 'started', 'phases')
+
+    def __init__(self, command: str):
+        self.command = command
+        self.started = time.perf_counter()
+        self.phases = {'defer': 0.0, 'db': 0.0, 'riot': 0.0}
+
+    def add(self, phase: str, seconds: float):
+        self.phases[phase] += seconds
+
+
+def _record(phase: str, started: float):
+    timings = _current.get()
+    if timings is not None:
+        timings.add(phase, time.perf_counter() - started)
+
+
+class TimedService:
+    """
+    Proxy d'un service (base de données, API Riot) qui attribue la durée de
+    chacun de ses appels asynchrones à la phase de la commande en cours.
+    """
+
+    def __init__(self, service: Any, phase: str):
+        self._service = service
+        self._phase = phase
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._service, name)
+        if not inspect.iscoroutinefunction(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        async def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await attribute(*args, **kwargs)
+            finally:
+                _record(self._phase, started)
+        return timed
+
+
+class TimedContext(commands.Context):
+    """Contexte de commande qui mesure le temps passé dans defer()"""
+
+    async def defer(self, *args, **kwargs) -> None:
+        started = time.perf_counter()
+        try:
+            await super().defer(*args, **kwargs)
+        finally:
+            _record('defer', started)
+
+
+def start_command(ctx: commands.Context) -> None:
+    """Début de la mesure (avant l'exécution de la commande)"""
+    _current.set(CommandTimings(ctx.command.qualified_name))
+
+
+def finish_command(ctx: commands.Context) -> None:
+    """Enregistre les durées de la commande (après son exécution, même en erreur)"""
+    timings = _current.get()
+    if timings is None:
+        return
+    _current.set(None)
+    total = time.perf_counter() - timings.started
+    for phase, seconds in dict(timings.phases, total=total).items():
+        REGISTRY.histogram('bot_command_seconds', "Durée des commandes par phase",
+                           buckets=COMMAND_BUCKETS, command=timings.command, phase=phase).observe(seconds)
+
+
+def record_error(ctx: commands.Context, error: Exception) -> None:
+    """Compte une erreur de commande par type d'exception d'origine"""
+    original = getattr(error, 'original', error)
+    original = getattr(original, 'original', original)
+    command = ctx.command.qualified_name if ctx.command else 'inconnue'
+    REGISTRY.counter('bot_command_errors_total', "Erreurs des commandes par type",
+                     command=command, error=type(original).__name__).inc()
+
+
+def command_summary() -> List[Dict]:
+    """Synthèse par commande : volume, quantiles par phase et erreurs"""
+    snapshot = REGISTRY.snapshot()
+    commands_stats: Dict[str, Dict] = {}
+    for entry in snapshot.get('bot_command_seconds', []):
+        stats = commands_stats.setdefault(entry['labels']['command'], {'phases': {}, 'errors': {}})
+        stats['phases'][entry['labels']['phase']] = entry
+    for entry in snapshot.get('bot_command_errors_total', []):
+        stats = commands_stats.setdefault(entry['labels']['command'], {'phases': {}, 'errors': {}})
+        stats['errors'][entry['labels']['error']] = int(entry['value'])
+    return [
+        {
+            'command': command,
+            'count': stats['phases'].get('total', {}).get('count', 0),
+            'phases': stats['phases'],
+            'errors': stats['errors'],
+        }
+        for command, stats in sorted(commands_stats.items())
+    ]
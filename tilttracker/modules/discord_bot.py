@@ -2,53 +2,172 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from datetime import datetime
+import functools
+import hashlib
+import io
+import json
+import os
+from typing import List, Optional, Tuple
 import logging
-from .riot_api import RiotAPI
-from tilttracker.utils.database import Database
-from .discord_publisher import DiscordPublisher
+from .services import ServiceContainer
+from .history_view import HistoryView
+from .riot_api import DEFAULT_PLATFORM, PLATFORMS, RiotUnavailable, normalize_platform
+from .command_telemetry import (PHASES, TimedContext, TimedService, command_summary, finish_command,
+                                record_error, start_command)
+from tilttracker.utils.cache import RANKING_TAG, player_tag
+from tilttracker.utils.riot_id_index import RiotIdIndex
+from tilttracker.utils.load_shedder import Overloaded
+from tilttracker.utils.circuit_breaker import CircuitOpen
 
 
 # Configuration du logger
 logger = logging.getLogger(__name__)
 
+# Préfixes acceptés pour les webhooks configurés par /publication
+WEBHOOK_URL_PREFIXES = (
+    "https://discord.com/api/webhooks/",
+    "https://discordapp.com/api/webhooks/",
+)
+
+# Critères de classement proposés par /leaderboard et /stats
+RANKING_CHOICES = [
+    app_commands.Choice(name="Points", value="score"),
+    app_commands.Choice(name="Rating", value="rating"),
+]
+
+# Serveurs proposés par /register
+REGION_CHOICES = [app_commands.Choice(name=label, value=platform) for platform, (label, _) in PLATFORMS.items()]
+
+
+def heavy_command(callback):
+    """
+    Soumet une commande coûteuse (Riot, historique complet) aux limites de
+    charge : refus immédiat plutôt qu'une file d'attente sans fin.
+    """
+    @functools.wraps(callback)
+    async def wrapper(self, ctx: commands.Context, *args, **kwargs):
+        async with self.bot.load_shedder.command(ctx.author.id, ctx.command.qualified_name):
+            return await callback(self, ctx, *args, **kwargs)
+    return wrapper
+
+
+def bot_intents() -> discord.Intents:
+    """
+    Intents strictement nécessaires : les serveurs et les messages pour les
+    commandes préfixées. Ni membres (privilégié), ni présences, ni vocal.
+    """
+    intents = discord.Intents.none()
+    intents.guilds = True
+    intents.guild_messages = True
+    intents.dm_messages = True
+    intents.message_content = True
+    return intents
+
 
 class TiltTrackerBot(commands.Bot):
-    def __init__(self, riot_api_key: str):
+    def __init__(self, riot_api_key: str = None, services: Optional[ServiceContainer] = None, **options):
         logger.info("Initialisation du bot TiltTracker...")
-        intents = discord.Intents.default()
-        intents.message_content = True
-        intents.members = True
         
         super().__init__(
             command_prefix="!",
-            intents=intents,
-            help_command=None
+            intents=bot_intents(),
+            help_command=None,
+            # Pas de cache de membres ni de messages : la mémoire ne croît pas
+            # avec la taille des communautés
+            member_cache_flags=discord.MemberCacheFlags.none(),
+            chunk_guilds_at_startup=False,
+            max_messages=None,
+            **options
         )
         
-        self.riot_api = RiotAPI(riot_api_key)
-        self.database = Database()
-        self.discord_publisher = DiscordPublisher()
+        # Services partagés avec le watcher quand ils sont fournis
+        self.services = services or ServiceContainer(riot_api_key)
+        # Appels chronométrés pour la télémétrie des commandes
+        self.riot_api = TimedService(self.services.riot_api, 'riot')
+        self.database = TimedService(self.services.db, 'db')
+        self.discord_publisher = self.services.discord_publisher
+        self.command_cache = self.services.command_cache
+        self.chart_renderer = self.services.chart_renderer
+        self.load_shedder = self.services.load_shedder
+        # Riot ID inscrits, pour l'autocomplétion des commandes
+        self.riot_ids = RiotIdIndex()
+        # Empreinte des commandes lors de la dernière synchronisation
+        self.sync_state_file = os.getenv('DISCORD_SYNC_STATE_FILE', '.command_sync_hash')
         self.startup_time = datetime.now()
         logger.info("Bot initialisé avec succès")
 
+    def on_player_renamed(self, puuid: str, previous: Tuple[str, str], current: Tuple[str, str]):
+        """Met à jour l'autocomplétion et les réponses en cache d'un joueur renommé"""
+        self.riot_ids.remove(*previous)
+        self.riot_ids.add(*current)
+        self.command_cache.invalidate(RANKING_TAG, player_tag(*previous), player_tag(*current))
+
     async def setup_hook(self):
         """Appelé avant que le bot ne démarre, configure les commandes"""
         logger.info("Début de la configuration des commandes...")
+
+        self.riot_ids.load(await self.database.get_registered_riot_ids())
+        logger.info(f"{len(self.riot_ids)} Riot ID chargés pour l'autocomplétion")
+        # Renommages détectés par le watcher : index et cache suivent
+        self.services.puuid_resolver.on_rename(self.on_player_renamed)
         
         # Ajouter le Cog avec les commandes
         await self.add_cog(CommandsCog(self))
         
-        # Force la synchronisation des commandes
-        logger.info("Tentative de synchronisation des commandes...")
+        # Synchronisation uniquement si les définitions ont changé
+        force = os.getenv('DISCORD_FORCE_SYNC', 'false').lower() == 'true'
         try:
-            commands = await self.tree.sync()
-            for command in commands:
-                logger.info(f"Commande synchronisée: /{command.name}")
-            logger.info(f"Total des commandes synchronisées : {len(commands)}")
+            await self.sync_commands(force=force)
         except Exception as e:
             logger.error(f"Erreur lors de la synchronisation : {e}")
             raise
 
+    async def get_context(self, origin, /, *, cls=TimedContext):
+        """Contexte mesurant le temps de defer() pour la télémétrie"""
+        return await super().get_context(origin, cls=cls)
+
+    def command_tree_hash(self) -> str:
+        """Empreinte des définitions des commandes slash (et de l'application)"""
+        definitions = sorted(
+            (command.to_dict(self.tree) for command in self.tree.get_commands()),
+            key=lambda definition: definition['name']
+        )
+        content = json.dumps({'application_id': self.application_id, 'commands': definitions},
+                             sort_keys=True, default=str)
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    async def sync_commands(self, force: bool = False) -> bool:
+        """
+        Synchronise l'arbre des commandes avec Discord si ses définitions ont
+        changé depuis la dernière synchronisation (ou si force est vrai).
+
+        Returns:
+            True si une synchronisation a eu lieu
+        """
+        digest = self.command_tree_hash()
+        try:
+            with open(self.sync_state_file, encoding='utf-8') as f:
+                last_digest = f.read().strip()
+        except OSError:
+            last_digest = None
+
+        if not force and digest == last_digest:
+            logger.info("Commandes inchangées depuis la dernière synchronisation, synchronisation ignorée")
+            return False
+
+        logger.info("Tentative de synchronisation des commandes...")
+        commands = await self.tree.sync()
+        for command in commands:
+            logger.info(f"Commande synchronisée: /{command.name}")
+        logger.info(f"Total des commandes synchronisées : {len(commands)}")
+
+        try:
+            with open(self.sync_state_file, 'w', encoding='utf-8') as f:
+                f.write(digest)
+        except OSError as e:
+            logger.warning(f"Impossible d'enregistrer l'empreinte des commandes: {e}")
+        return True
+
     async def on_ready(self):
         """Événement déclenché quand le bot est prêt"""
         logger.info(f"Bot connecté en tant que {self.user.name}")
@@ -56,10 +175,9 @@ class TiltTrackerBot(commands.Bot):
         logger.info(f"Temps de démarrage: {datetime.now() - self.startup_time}")
         logger.info(f"Latence avec Discord: {round(self.latency * 1000)}ms")
        
-        # Log les serveurs connectés
+        logger.info(f"Connecté à {len(self.guilds)} serveurs ({self.shard_count or 1} shard(s))")
         for guild in self.guilds:
-            logger.info(f"Connecté au serveur: {guild.name} (ID: {guild.id})")
-            logger.info(f"Nombre de membres sur {guild.name}: {guild.member_count}")
+            logger.debug(f"Connecté au serveur: {guild.name} (ID: {guild.id})")
         
         # Actualisation du statut
         await self.change_presence(
@@ -70,15 +188,25 @@ class TiltTrackerBot(commands.Bot):
         )
         logger.info("Statut du bot mis à jour")
 
-        # Synchroniser à nouveau les commandes au démarrage
-        logger.info("Synchronisation des commandes au démarrage...")
-        try:
-            commands = await self.tree.sync()
-            logger.info(f"Commandes synchronisées au démarrage : {len(commands)} commandes")
-            for command in commands:
-                logger.info(f"Commande disponible : /{command.name}")
-        except Exception as e:
-            logger.error(f"Erreur lors de la synchronisation au démarrage : {e}")
+
+class ShardedTiltTrackerBot(TiltTrackerBot, commands.AutoShardedBot):
+    """
+    Variante auto-shardée pour les déploiements sur de nombreux serveurs :
+    discord.py ouvre autant de connexions gateway que recommandé par Discord.
+    """
+
+    async def on_shard_ready(self, shard_id: int):
+        logger.info(f"Shard {shard_id} prêt - latence: {round(self.get_shard(shard_id).latency * 1000)}ms")
+
+
+def create_bot(services: ServiceContainer) -> TiltTrackerBot:
+    """Crée le bot, auto-shardé si DISCORD_SHARDED=true"""
+    if os.getenv('DISCORD_SHARDED', 'false').lower() != 'true':
+        return TiltTrackerBot(services=services)
+    shard_count = os.getenv('DISCORD_SHARD_COUNT')
+    logger.info(f"Mode auto-shardé ({shard_count or 'nombre de shards recommandé par Discord'})")
+    return ShardedTiltTrackerBot(services=services, shard_count=int(shard_count) if shard_count else None)
+
 
 class CommandsCog(commands.Cog, name="TiltTracker"):
     def __init__(self, bot: TiltTrackerBot):
@@ -86,6 +214,39 @@ class CommandsCog(commands.Cog, name="TiltTracker"):
         super().__init__()
         logger.info("CommandsCog initialisé")
 
+    def _history_view(self, ctx: commands.Context, game_name: str, tag_line: str,
+                      header_embeds: list) -> HistoryView:
+        """Historique paginé d'un joueur, page par page depuis la base"""
+        async def load_page(before, limit):
+            return await self.bot.database.get_player_history_page(game_name, tag_line, before, limit)
+
+        return HistoryView(load_page, "🎮 Historique des parties", ctx.author.id, header_embeds)
+
+    async def cog_before_invoke(self, ctx: commands.Context):
+        start_command(ctx)
+
+    async def cog_after_invoke(self, ctx: commands.Context):
+        finish_command(ctx)
+
+    async def cog_command_error(self, ctx: commands.Context, error: Exception):
+        """Compte et journalise les erreurs remontées par les commandes"""
+        record_error(ctx, error)
+        original = getattr(error, 'original', error)
+        original = getattr(original, 'original', original)
+        if isinstance(original, Overloaded):
+            await ctx.send(f"⏳ {original.reason} Réessaie dans {max(round(original.retry_after), 1)}s.",
+                           ephemeral=True)
+            return
+        if isinstance(original, CircuitOpen):
+            await ctx.send(f"⏳ L'API Riot est perturbée. Réessaie dans {max(round(original.retry_after), 1)}s.",
+                           ephemeral=True)
+            return
+        if isinstance(original, RiotUnavailable):
+            await ctx.send("⏳ L'API Riot ne répond pas. Réessaie dans quelques minutes.", ephemeral=True)
+            return
+        logger.error(f"Erreur dans la commande {ctx.command.qualified_name if ctx.command else '?'}: "
+                     f"{type(getattr(error, 'original', error)).__name__}: {error}")
+
     @commands.Cog.listener()
     async def on_command(self, ctx):
         """Log chaque commande reçue"""
@@ -100,6 +261,48 @@ class CommandsCog(commands.Cog, name="TiltTracker"):
         logger.info(f"Commande terminée avec succès - Type: {ctx.command.name} | "
                    f"Auteur: {ctx.author}")
 
+    @commands.hybrid_command(
+        name="metriques",
+        description="Latences et erreurs des commandes (administration)"
+    )
+    @commands.is_owner()
+    async def metriques(self, ctx: commands.Context):
+        """Affiche la télémétrie agrégée des commandes"""
+        summary = command_summary()
+        embed = discord.Embed(title="📈 Télémétrie des commandes", color=discord.Color.blue())
+        if not summary:
+            embed.description = "Aucune commande mesurée depuis le démarrage."
+        for stats in summary[:25]:
+            lines = [f"Appels: {stats['count']}"]
+            for phase in PHASES:
+                entry = stats['phases'].get(phase)
+                if entry and entry['count']:
+                    lines.append(f"{phase}: moy {entry['sum'] / entry['count'] * 1000:.0f}ms · "
+                                 f"p95 ≤ {entry['p95'] * 1000:.0f}ms")
+            if stats['errors']:
+                lines.append("Erreurs: " + ", ".join(f"{name} ×{count}" for name, count in stats['errors'].items()))
+            embed.add_field(name=f"/{stats['command']}", value="\n".join(lines), inline=False)
+        breakers = self.bot.riot_api.breaker_states()
+        if breakers and len(embed.fields) < 25:
+            embed.add_field(name="API Riot",
+                            value="\n".join(f"{endpoint}: {state}" for endpoint, state in breakers.items()),
+                            inline=False)
+        pool = self.bot.riot_api.pool_stats()
+        if len(embed.fields) < 25:
+            embed.add_field(name="Connexions Riot",
+                            value=f"Ouvertes: {pool['new']} · réutilisées: {pool['reused']}\n"
+                                  f"En cours: {pool['in_use']} · au repos: {pool['idle']} "
+                                  f"(max {pool['limit_per_host']} par hôte)",
+                            inline=False)
+        await ctx.send(embed=embed, ephemeral=True)
+
+    @commands.command(name="sync")
+    @commands.is_owner()
+    async def sync(self, ctx: commands.Context):
+        """Force la synchronisation des commandes slash (propriétaire du bot)"""
+        await self.bot.sync_commands(force=True)
+        await ctx.send("✅ Commandes synchronisées.")
+
     @commands.hybrid_command(
         name="ping",
         description="Vérifie la latence du bot"
@@ -110,7 +313,14 @@ class CommandsCog(commands.Cog, name="TiltTracker"):
         latency = round(self.bot.latency * 1000)
         
         logger.info(f"Commande ping reçue de {ctx.author}")
-        message = await ctx.send(f"🏓 Pong! Latence: **{latency}ms**")
+        content = f"🏓 Pong! Latence: **{latency}ms**"
+        if isinstance(self.bot, commands.AutoShardedBot):
+            current = ctx.guild.shard_id if ctx.guild else 0
+            content += "\n" + "\n".join(
+                f"{'➡️' if shard_id == current else '▫️'} Shard {shard_id}: {round(shard_latency * 1000)}ms"
+                for shard_id, shard_latency in self.bot.latencies
+            )
+        message = await ctx.send(content)
         
         end_time = datetime.now()
         response_time = (end_time - start_time).total_seconds() * 1000
@@ -124,22 +334,35 @@ class CommandsCog(commands.Cog, name="TiltTracker"):
     )
     @app_commands.describe(
         game_name="Ton nom de jeu LoL",
-        tag_line="Ton tag (ex: EUW, NA1, etc.)"
+        tag_line="Ton tag (ex: EUW, NA1, etc.)",
+        region="Serveur du compte (EUW par défaut)"
     )
+    @app_commands.choices(region=REGION_CHOICES)
+    @heavy_command
     async def register(
         self, 
         ctx: commands.Context, 
         game_name: str,
-        tag_line: str
+        tag_line: str,
+        region: str = DEFAULT_PLATFORM
     ):
         start_time = datetime.now()
-        logger.info(f"Commande register reçue | Auteur: {ctx.author} | Compte: {game_name}#{tag_line}")
+        logger.info(f"Commande register reçue | Auteur: {ctx.author} | Compte: {game_name}#{tag_line} ({region})")
         
         await ctx.defer()
+
+        platform = normalize_platform(region)
+        if not platform:
+            await ctx.send(embed=discord.Embed(
+                title="❌ Serveur inconnu",
+                description="Serveurs disponibles : " + ", ".join(label for label, _ in PLATFORMS.values()),
+                color=discord.Color.red()
+            ))
+            return
         
         try:
-            # Récupérer les informations du compte
-            account_info = await self.bot.riot_api.get_account_info(game_name, tag_line)
+            # Récupérer les informations du compte sur son serveur
+            account_info = await self.bot.riot_api.get_account_info(game_name, tag_line, platform)
             
             if not account_info:
                 logger.error(f"Échec de récupération des infos pour {game_name}#{tag_line}")
@@ -156,10 +379,15 @@ class CommandsCog(commands.Cog, name="TiltTracker"):
                 discord_id=str(ctx.author.id),
                 riot_puuid=account_info['puuid'],
                 summoner_name=game_name,
-                tag_line=tag_line
+                tag_line=tag_line,
+                guild_id=str(ctx.guild.id) if ctx.guild else None,
+                region=platform
             )
 
             if success:
+                self.bot.command_cache.invalidate(RANKING_TAG, player_tag(game_name, tag_line))
+                self.bot.riot_ids.add(game_name, tag_line)
+
                 # Création de l'embed de confirmation
                 embed = discord.Embed(
                     title="✅ Compte trouvé !",
@@ -173,6 +401,7 @@ class CommandsCog(commands.Cog, name="TiltTracker"):
                     value=str(account_info['summonerLevel']),
                     inline=True
                 )
+                embed.add_field(name="Serveur", value=PLATFORMS[platform][0], inline=True)
                 
                 if 'ranks' in account_info and 'solo_duo' in account_info['ranks']:
                     rank_info = account_info['ranks']['solo_duo']
@@ -208,8 +437,12 @@ class CommandsCog(commands.Cog, name="TiltTracker"):
                 await ctx.send("❌ Erreur lors de l'enregistrement dans la base de données.")
                 logger.error(f"Échec de l'enregistrement en base pour {game_name}#{tag_line}")
 
+        except (CircuitOpen, RiotUnavailable):
+            # Réponse avec délai de nouvel essai dans cog_command_error
+            raise
         except Exception as e:
             logger.error(f"Erreur lors de l'enregistrement de {game_name}#{tag_line}: {str(e)}")
+            record_error(ctx, e)
             error_embed = discord.Embed(
                 title="❌ Erreur",
                 description="Une erreur est survenue lors de l'enregistrement.",
@@ -217,15 +450,47 @@ class CommandsCog(commands.Cog, name="TiltTracker"):
             )
             await ctx.send(embed=error_embed)
 
+    @commands.hybrid_command(
+        name="publication",
+        description="Choisit le webhook où publier les parties des joueurs de ce serveur"
+    )
+    @app_commands.describe(webhook_url="URL du webhook Discord (vide pour désactiver)")
+    @commands.guild_only()
+    @commands.has_permissions(manage_guild=True)
+    async def publication(self, ctx: commands.Context, webhook_url: Optional[str] = None):
+        """Configure la route de publication du serveur"""
+        await ctx.defer(ephemeral=True)
+        route_name = f"guild:{ctx.guild.id}"
+
+        if not webhook_url:
+            disabled = await self.bot.database.disable_publish_route(route_name)
+            await ctx.send("✅ Publication désactivée pour ce serveur." if disabled
+                           else "ℹ️ Aucune publication configurée pour ce serveur.", ephemeral=True)
+            return
+
+        if not webhook_url.startswith(WEBHOOK_URL_PREFIXES):
+            await ctx.send("❌ URL de webhook Discord invalide.", ephemeral=True)
+            return
+
+        if await self.bot.database.set_publish_route(route_name, webhook_url, guild_id=str(ctx.guild.id)):
+            logger.info(f"Route de publication configurée pour {ctx.guild.name} (ID: {ctx.guild.id})")
+            await ctx.send("✅ Les parties des joueurs inscrits sur ce serveur seront publiées sur ce webhook.",
+                           ephemeral=True)
+        else:
+            await ctx.send("❌ Erreur lors de l'enregistrement de la publication.", ephemeral=True)
+
     @commands.hybrid_command(
             name="stats",
             description="Affiche les statistiques ARAM d'un joueur"
         )
     @app_commands.describe(
         game_name="Nom d'invocateur (optionnel)",
-        tag_line="Tag (ex: EUW, NA1, etc.)"
+        tag_line="Tag (ex: EUW, NA1, etc.)",
+        tri="Critère du classement affiché"
     )
-    async def stats(self, ctx: commands.Context, game_name: str , tag_line: str ):
+    @app_commands.choices(tri=RANKING_CHOICES)
+    @heavy_command
+    async def stats(self, ctx: commands.Context, game_name: str , tag_line: str, tri: str = "score"):
         """Affiche les statistiques globales d'un joueur"""
         try:
             await ctx.defer()
@@ -241,7 +506,12 @@ class CommandsCog(commands.Cog, name="TiltTracker"):
                 tag_line = player['tag_line']
                 
             # Récupérer les stats depuis la base de données
-            stats = await self.bot.database.get_player_stats(game_name, tag_line)
+            stats = await self.bot.command_cache.get_or_load(
+                'stats', (game_name, tag_line, tri),
+                lambda: self.bot.database.get_player_stats(game_name, tag_line, order_by=tri,
+                                                           include_history=False),
+                tags=(RANKING_TAG, player_tag(game_name, tag_line))
+            )
             
             if not stats:
                 await ctx.send("❌ Aucune statistique trouvée pour ce joueur.")
@@ -286,12 +556,14 @@ class CommandsCog(commands.Cog, name="TiltTracker"):
                 )
             
             # Performance
+            rating = f"{stats['rating']:.0f} ±{stats['rating_deviation']:.0f}" if stats['rating'] else "Non classé"
             embed.add_field(
                 name="🎯 Performance",
                 value=f"Score total: {stats['total_score']}\n"
                     f"Score moyen: {stats['avg_score']:.1f}\n"
                     f"Meilleur score: {stats['best_score']}\n"
-                    f"Classement: #{stats['rank']}",
+                    f"Rating: {rating}\n"
+                    f"Classement ({'rating' if tri == 'rating' else 'points'}): #{stats['rank']}",
                 inline=False
             )
             
@@ -299,25 +571,34 @@ class CommandsCog(commands.Cog, name="TiltTracker"):
             process_time = (datetime.now() - start_time).total_seconds()
             embed.set_footer(text=f"Généré en {process_time:.2f} secondes")
             
-            await ctx.send(embed=embed)
+            view = self._history_view(ctx, game_name, tag_line, header_embeds=[embed])
+            await view.load()
+            view.message = await ctx.send(embeds=view.embeds(), view=view)
             logger.info(f"Stats affichées pour {game_name}#{tag_line}")
             
         except Exception as e:
             logger.error(f"Erreur lors de l'affichage des stats pour {game_name}#{tag_line}: {e}")
+            record_error(ctx, e)
             await ctx.send("❌ Une erreur s'est produite lors de la récupération des statistiques.")
 
 
     @commands.hybrid_command(
         name="leaderboard",
         description="Affiche le classement ARAM")
-    async def leaderboard(self, ctx: commands.Context):
+    @app_commands.describe(tri="Trier par points ou par rating")
+    @app_commands.choices(tri=RANKING_CHOICES)
+    async def leaderboard(self, ctx: commands.Context, tri: str = "score"):
         """Affiche le classement des joueurs"""
         try:
             await ctx.defer()
             start_time = datetime.now()
             
             # Récupérer le top 10
-            top_players = await self.bot.database.get_leaderboard()
+            top_players = await self.bot.command_cache.get_or_load(
+                'leaderboard', (tri,),
+                lambda: self.bot.database.get_leaderboard(order_by=tri),
+                tags=(RANKING_TAG,)
+            )
             
             if not top_players:
                 await ctx.send("❌ Aucun classement disponible pour le moment.")
@@ -325,7 +606,7 @@ class CommandsCog(commands.Cog, name="TiltTracker"):
                 
             embed = discord.Embed(
                 title="🏆 Classement ARAM",
-                description="Top 10 des joueurs",
+                description=f"Top 10 des joueurs ({'rating' if tri == 'rating' else 'points'})",
                 color=discord.Color.gold()
             )
             
@@ -336,6 +617,7 @@ class CommandsCog(commands.Cog, name="TiltTracker"):
                 embed.add_field(
                     name=f"{medal} {player['summoner_name']}#{player['tag_line']}",
                     value=f"Score: {player['total_score']:,}\n"
+                          f"Rating: {player['rating']:.0f} ±{player['rating_deviation']:.0f}\n"
                           f"WR: {player['winrate']:.1f}% ({player['wins']}/{player['total_games']})\n"
                           f"Score moyen: {player['avg_score']:.1f}",
                     inline=False
@@ -350,6 +632,7 @@ class CommandsCog(commands.Cog, name="TiltTracker"):
             
         except Exception as e:
             logger.error(f"Erreur lors de l'affichage du leaderboard: {e}")
+            record_error(ctx, e)
             await ctx.send("❌ Une erreur s'est produite lors de la récupération du classement.")
 
     @commands.hybrid_command(
@@ -375,7 +658,11 @@ class CommandsCog(commands.Cog, name="TiltTracker"):
                 tag_line = player['tag_line']
                 
             # Récupérer la dernière partie
-            last_game = await self.bot.database.get_last_game(game_name, tag_line)
+            last_game = await self.bot.command_cache.get_or_load(
+                'lastgame', (game_name, tag_line),
+                lambda: self.bot.database.get_last_game(game_name, tag_line),
+                tags=(player_tag(game_name, tag_line),)
+            )
             
             if not last_game:
                 await ctx.send("❌ Aucune partie récente trouvée.")
@@ -438,6 +725,7 @@ class CommandsCog(commands.Cog, name="TiltTracker"):
             
         except Exception as e:
             logger.error(f"Erreur lors de l'affichage de la dernière partie pour {game_name}#{tag_line}: {e}")
+            record_error(ctx, e)
             await ctx.send("❌ Une erreur s'est produite lors de la récupération de la dernière partie.")
 
     @commands.hybrid_command(
@@ -448,65 +736,77 @@ class CommandsCog(commands.Cog, name="TiltTracker"):
         game_name="Nom d'invocateur",
         tag_line="Tag (ex: EUW, NA1, etc.)"
     )
+    @heavy_command
     async def graph(self, ctx: commands.Context, game_name: str, tag_line: str):
-        """Affiche l'historique complet des scores d'un joueur"""
+        """Affiche le graphique du score cumulé d'un joueur"""
         try:
             await ctx.defer()
             
             # Récupérer l'historique des scores
-            history = await self.bot.database.get_player_score_history(game_name, tag_line)
+            history = await self.bot.command_cache.get_or_load(
+                'graph', (game_name, tag_line),
+                lambda: self.bot.database.get_player_score_history(game_name, tag_line),
+                tags=(player_tag(game_name, tag_line),)
+            )
             
             if not history:
                 await ctx.send("❌ Aucun historique trouvé pour ce joueur.")
                 return
 
-            # Créer l'embed avec les informations
+            # Rendu hors de la boucle d'événements (image en cache jusqu'à la prochaine partie)
+            image_key, image = await self.bot.chart_renderer.score_chart(game_name, tag_line, history)
+
             embed = discord.Embed(
-                title=f"Historique complet des scores de {game_name}#{tag_line}",
+                title=f"Évolution des scores de {game_name}#{tag_line}",
                 description=f"Total de {len(history)} parties enregistrées",
                 color=discord.Color.blue()
             )
 
             # Calculer les statistiques
             total_points = sum(game['score'] for game in history)
-            avg_points = total_points / len(history) if history else 0
+            avg_points = total_points / len(history)
+            wins = sum(1 for game in history if game['win'])
             
             embed.add_field(
                 name="📊 Statistiques globales",
                 value=f"Total des points : **{total_points}**\n"
                     f"Moyenne par partie : **{avg_points:.1f}**\n"
-                    f"Nombre de parties : **{len(history)}**",
+                    f"Victoires : **{wins}/{len(history)}**",
                 inline=False
             )
 
-            # Diviser l'historique en plusieurs messages si nécessaire
-            games_per_message = 25  # Nombre de parties par message
-            for i in range(0, len(history), games_per_message):
-                chunk = history[i:i + games_per_message]
-                
-                games_text = ""
-                for game in chunk:
-                    result = "✅" if game['win'] else "❌"
-                    date = game['date']  # Format: YYYY-MM-DD HH:MM
-                    games_text += f"{result} {game['champion']} : **{game['score']}** points ({game['kda']})\n"
-                
-                # Si c'est le premier chunk, ajouter au premier embed
-                if i == 0:
-                    embed.add_field(
-                        name="🎮 Historique des parties",
-                        value=games_text,
-                        inline=False
-                    )
-                    await ctx.send(embed=embed)
-                else:
-                    # Créer de nouveaux embeds pour les parties suivantes
-                    new_embed = discord.Embed(
-                        title=f"Suite de l'historique ({i+1}-{min(i+games_per_message, len(history))})",
-                        description=games_text,
-                        color=discord.Color.blue()
-                    )
-                    await ctx.send(embed=new_embed)
+            filename = f"scores_{image_key[:16]}.png"
+            embed.set_image(url=f"attachment://{filename}")
+
+            # Historique paginé sous le graphique
+            view = self._history_view(ctx, game_name, tag_line, header_embeds=[embed])
+            await view.load()
+            view.message = await ctx.send(embeds=view.embeds(), view=view,
+                                          file=discord.File(io.BytesIO(image), filename=filename))
 
         except Exception as e:
             logger.error(f"Erreur lors de l'affichage de l'historique pour {game_name}#{tag_line}: {e}")
-            await ctx.send("❌ Une erreur s'est produite lors de l'affichage de l'historique.")
\ No newline at end of file
+            record_error(ctx, e)
+            await ctx.send("❌ Une erreur s'est produite lors de l'affichage de l'historique.")
+
+    @stats.autocomplete('game_name')
+    @lastgame.autocomplete('game_name')
+    @graph.autocomplete('game_name')
+    async def game_name_autocomplete(self, interaction: discord.Interaction,
+                                     current: str) -> List[app_commands.Choice[str]]:
+        """Suggère les Riot ID inscrits (index en mémoire, sans requête SQL)"""
+        return [
+            app_commands.Choice(name=f"{name}#{tag}", value=name)
+            for name, tag in self.bot.riot_ids.search(current)
+        ]
+
+    @stats.autocomplete('tag_line')
+    @lastgame.autocomplete('tag_line')
+    @graph.autocomplete('tag_line')
+    async def tag_line_autocomplete(self, interaction: discord.Interaction,
+                                    current: str) -> List[app_commands.Choice[str]]:
+        """Suggère les tags connus pour le nom déjà saisi"""
+        game_name = getattr(interaction.namespace, 'game_name', None)
+        if not game_name:
+            return []
+        return [app_commands.Choice(name=tag, value=tag) for tag in self.bot.riot_ids.tags_for(game_name, current)]
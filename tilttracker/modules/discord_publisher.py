@@ -1,24 +1,300 @@
 # tilttracker/modules/discord_publisher.py
+import asyncio
+import itertools
 import logging
-import discord
-from discord.webhook import SyncWebhook
+import time
+import aiohttp
 from discord import Embed, Colour
 import os
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
+from tilttracker.utils.metrics import REGISTRY
 
 logger = logging.getLogger(__name__)
 
+# Canal de publication par défaut (clé d'idempotence de publish_outbox)
+DEFAULT_CHANNEL = "webhook"
+
+# Limites d'un message webhook Discord
+EMBEDS_PER_MESSAGE = 10
+EMBED_CHARACTERS_PER_MESSAGE = 6000
+
+WEBHOOK_USERNAME = "TiltTracker"
+WEBHOOK_AVATAR_URL = "https://ddragon.leagueoflegends.com/cdn/14.21.1/img/profileicon/4408.png"
+
+
+class PublishHandle:
+    """
+    Suivi d'un message mis en file. Rendu immédiatement à l'appelant,
+    qui peut l'ignorer ou attendre l'envoi effectif.
+    """
+    __slots__ = ('job_id', 'url', 'payload', 'group', 'future', 'enqueued_at')
+
+    def __init__(self, job_id: int, url: str, payload: Dict, group, future: asyncio.Future):
+        self.job_id = job_id
+        self.url = url
+        self.payload = payload
+        self.group = group
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+    @property
+    def batch_key(self):
+        """Clé des messages fusionnables (embeds seuls, même auteur), None sinon"""
+        if not self.payload.get('embeds') or set(self.payload) - {'embeds', 'username', 'avatar_url'}:
+            return None
+        return self.payload.get('username'), self.payload.get('avatar_url')
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """Attend l'envoi du message. Lève l'erreur d'envoi le cas échéant."""
+        return await asyncio.wait_for(asyncio.shield(self.future), timeout)
+
+
+def embed_length(embed: Dict) -> int:
+    """Nombre de caractères d'un embed au sens de la limite Discord"""
+    length = len(embed.get('title', '')) + len(embed.get('description', ''))
+    length += len(embed.get('footer', {}).get('text', '')) + len(embed.get('author', {}).get('name', ''))
+    for field in embed.get('fields', []):
+        length += len(field.get('name', '')) + len(field.get('value', ''))
+    return length
+
+
+def pack_messages(handles: List[PublishHandle]) -> List[Tuple[str, Dict, List[PublishHandle]]]:
+    """
+    Regroupe des messages en file en un minimum d'appels webhook.
+
+    Les embeds sont regroupés par webhook, puis par partie (dans l'ordre
+    d'arrivée de la première publication de chaque partie), dans la limite
+    de 10 embeds et 6000 caractères par message. Une partie n'est coupée en
+    deux messages que si elle ne tient pas dans un message vide.
+
+    Returns:
+        Liste de (url, payload, messages d'origine)
+    """
+    groups: Dict[Tuple, List[PublishHandle]] = {}
+    for handle in handles:
+        key = handle.batch_key
+        groups.setdefault((handle.url, key) if key else (handle.url, handle.job_id), []).append(handle)
+
+    packed = []
+    for (url, key), members in groups.items():
+        if not isinstance(key, tuple):
+            packed.append((url, members[0].payload, members))
+            continue
+
+        # Regrouper par partie, dans l'ordre de première apparition
+        by_match: Dict = {}
+        for handle in members:
+            by_match.setdefault(handle.group if handle.group is not None else ('job', handle.job_id), []).append(handle)
+
+        messages: List[List[PublishHandle]] = []
+        current, count, chars = [], 0, 0
+        for match_handles in by_match.values():
+            match_embeds = sum(len(h.payload['embeds']) for h in match_handles)
+            # Ne pas couper une partie si elle tient dans un message vide
+            if current and count + match_embeds > EMBEDS_PER_MESSAGE >= match_embeds:
+                messages.append(current)
+                current, count, chars = [], 0, 0
+            for handle in match_handles:
+                handle_embeds = len(handle.payload['embeds'])
+                size = sum(embed_length(e) for e in handle.payload['embeds'])
+                if current and (count + handle_embeds > EMBEDS_PER_MESSAGE
+                                or chars + size > EMBED_CHARACTERS_PER_MESSAGE):
+                    messages.append(current)
+                    current, count, chars = [], 0, 0
+                current.append(handle)
+                count += handle_embeds
+                chars += size
+        if current:
+            messages.append(current)
+
+        username, avatar_url = key
+        for message in messages:
+            payload = {'embeds': [embed for handle in message for embed in handle.payload['embeds']]}
+            if username is not None:
+                payload['username'] = username
+            if avatar_url is not None:
+                payload['avatar_url'] = avatar_url
+            packed.append((url, payload, message))
+
+    return packed
+
+
+class _Bucket:
+    """État d'un bucket de limite de taux Discord"""
+    __slots__ = ('limit', 'remaining', 'reset_at', 'in_flight', 'lock')
+
+    def __init__(self):
+        self.limit: Optional[int] = None      # Inconnu tant qu'aucune réponse n'a été reçue
+        self.remaining = 0                    # Requêtes disponibles dans la fenêtre, hors envois en cours
+        self.reset_at = 0.0
+        self.in_flight = 0
+        self.lock = asyncio.Lock()
+
+
+class WebhookRateLimiter:
+    """
+    Planifie les envois d'après les en-têtes X-RateLimit-* renvoyés par Discord
+    plutôt que d'attendre les 429.
+
+    Chaque webhook est rattaché au bucket annoncé par X-RateLimit-Bucket. Quand
+    un bucket n'a plus de requêtes disponibles, l'envoi suivant attend le
+    Reset-After. Une limite globale met en pause tous les envois.
+    """
+
+    # Attente entre deux vérifications quand seuls des envois en cours peuvent libérer le bucket
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, clock=time.monotonic, sleep=asyncio.sleep):
+        self.clock = clock
+        self.sleep = sleep
+        self.buckets: Dict[str, _Bucket] = {}
+        self.global_reset_at = 0.0
+
+    def _bucket(self, url: str) -> _Bucket:
+        bucket = self.buckets.get(url)
+        if bucket is None:
+            bucket = self.buckets[url] = _Bucket()
+        return bucket
+
+    def _delay(self, bucket: _Bucket, now: float) -> float:
+        """Temps avant de pouvoir envoyer (0 si possible maintenant)"""
+        delay = self.global_reset_at - now
+        if bucket.reset_at > now:
+            if bucket.remaining <= 0:
+                delay = max(delay, bucket.reset_at - now)
+        elif bucket.limit is not None and bucket.in_flight >= bucket.limit:
+            # Fenêtre écoulée mais toutes les requêtes sont déjà en cours
+            delay = max(delay, self.POLL_INTERVAL)
+        return delay
+
+    async def acquire(self, url: str):
+        """
+        Attend qu'un envoi soit autorisé et le réserve.
+
+        Returns:
+            (bucket réservé, temps d'attente en secondes). Le bucket doit être
+            rendu avec release() une fois la réponse reçue.
+        """
+        bucket = self._bucket(url)
+        waited = 0.0
+        async with bucket.lock:
+            while True:
+                delay = self._delay(bucket, self.clock())
+                if delay <= 0:
+                    break
+                await self.sleep(delay)
+                waited += delay
+
+            if bucket.reset_at > self.clock():
+                bucket.remaining -= 1
+            bucket.in_flight += 1
+        return bucket, waited
+
+    def release(self, url: str, bucket: _Bucket, headers=None) -> None:
+        """Rend une réservation et met à jour le bucket depuis les en-têtes de la réponse"""
+        bucket.in_flight -= 1
+        if not headers:
+            return
+
+        # Les webhooks partageant un bucket Discord partagent le même état
+        bucket_id = headers.get('X-RateLimit-Bucket')
+        if bucket_id:
+            bucket = self.buckets.setdefault(f"bucket:{bucket_id}", bucket)
+            self.buckets[url] = bucket
+
+        limit = headers.get('X-RateLimit-Limit')
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset_after = headers.get('X-RateLimit-Reset-After')
+        if limit is not None:
+            bucket.limit = int(limit)
+        if remaining is not None and reset_after is not None:
+            # Les envois encore en cours ne sont pas comptés par Discord dans cette réponse
+            bucket.remaining = int(remaining) - bucket.in_flight
+            bucket.reset_at = self.clock() + float(reset_after)
+
+    def rate_limited(self, url: str, retry_after: float, is_global: bool) -> None:
+        """Enregistre un 429 : pause du bucket ou de tous les envois"""
+        reset_at = self.clock() + retry_after
+        if is_global:
+            self.global_reset_at = max(self.global_reset_at, reset_at)
+        else:
+            bucket = self._bucket(url)
+            bucket.remaining = 0
+            bucket.reset_at = max(bucket.reset_at, reset_at)
+
+
+class _Destination:
+    """File d'envoi, workers et métriques propres à un webhook"""
+    __slots__ = ('name', 'url', 'queue', 'workers', 'batch_lock', 'queue_size')
+
+    def __init__(self, name: str, url: str, queue_size: int):
+        self.name = name
+        self.url = url
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.workers: List[asyncio.Task] = []
+        self.batch_lock = asyncio.Lock()
+        self.queue_size = REGISTRY.gauge('discord_publish_queue_size', "Messages en attente d'envoi",
+                                         destination=name)
+
+
 class DiscordPublisher:
     def __init__(self):
         load_dotenv()
+        # Webhook par défaut (optionnel si des routes de publication sont configurées)
         self.webhook_url = os.getenv('DISCORD_WEBHOOK_URL')
         if not self.webhook_url:
-            raise ValueError("DISCORD_WEBHOOK_URL non trouvée dans les variables d'environnement")
-        
-        self.webhook = SyncWebhook.from_url(self.webhook_url)
+            logger.warning("DISCORD_WEBHOOK_URL non définie : seules les routes de publication seront utilisées")
+
+        # Une file par webhook, vidée par ses propres workers : un canal lent ou
+        # en erreur ne bloque pas les autres
+        self.worker_count = max(int(os.getenv('DISCORD_PUBLISH_WORKERS', '2')), 1)
+        self.queue_capacity = int(os.getenv('DISCORD_PUBLISH_QUEUE_SIZE', '1000'))
+        self.destinations: Dict[str, _Destination] = {}
+        self.job_ids = itertools.count(1)
+
+        # Fenêtre de regroupement des embeds en un seul message (0 = désactivé)
+        self.batch_window = float(os.getenv('DISCORD_PUBLISH_BATCH_WINDOW', '2'))
+
+        # Session aiohttp partagée par les workers
+        self.session = None
+        self.rate_limiter = WebhookRateLimiter()
+
+        # Métriques de publication
+        self.queue_wait = REGISTRY.histogram(
+            'discord_publish_queue_wait_seconds', "Temps passé dans la file avant l'envoi")
+        self.rate_limit_wait = REGISTRY.histogram(
+            'discord_publish_rate_limit_wait_seconds', "Attente imposée par les limites de taux")
+        self.embeds_per_message = REGISTRY.histogram(
+            'discord_publish_embeds_per_message', "Embeds regroupés par appel webhook",
+            buckets=tuple(range(1, EMBEDS_PER_MESSAGE + 1)))
         logger.info("Discord Publisher initialisé avec succès")
 
+    async def _ensure_session(self):
+        """S'assure qu'une session est active"""
+        if self.session is None:
+            self.session = aiohttp.ClientSession()
+
+    def _destination(self, url: str, name: Optional[str] = None) -> _Destination:
+        """File d'envoi d'un webhook, créée au premier message"""
+        destination = self.destinations.get(url)
+        if destination is None:
+            if not name:
+                name = DEFAULT_CHANNEL if url == self.webhook_url else f"webhook-{len(self.destinations) + 1}"
+            destination = self.destinations[url] = _Destination(name, url, self.queue_capacity)
+        return destination
+
+    def _ensure_workers(self, destination: _Destination):
+        """Démarre les workers d'un webhook (il faut une boucle asyncio active)"""
+        destination.workers = [task for task in destination.workers if not task.done()]
+        for i in range(len(destination.workers), self.worker_count):
+            destination.workers.append(asyncio.create_task(
+                self._worker(destination, i), name=f"discord-publisher-{destination.name}-{i}"
+            ))
+
     def create_match_embed(self, player_stats: Dict, match_stats: Dict, score_info: Dict) -> Embed:
         # Déterminer la couleur selon la victoire/défaite
         color = Colour.green() if player_stats['win'] else Colour.red()
@@ -113,37 +389,65 @@ class DiscordPublisher:
         else:
             return "😢 Performance difficile. Ne te décourage pas!"
 
-    async def publish_match_result(self, player_stats: Dict, match_stats: Dict, score_info: Dict):
-        """Publie les résultats d'une partie sur Discord."""
+    def enqueue(self, payload: Dict, url: Optional[str] = None, group=None,
+                name: Optional[str] = None) -> PublishHandle:
+        """
+        Met un message webhook en file sans attendre Discord.
+
+        Args:
+            payload: Message webhook
+            url: Webhook de destination (celui de la configuration par défaut)
+            group: Clé de regroupement des embeds (ID de la partie)
+            name: Nom de la destination dans les logs et métriques
+
+        Raises:
+            ValueError si aucun webhook n'est disponible
+            asyncio.QueueFull si la file du webhook est pleine
+        """
+        url = url or self.webhook_url
+        if not url:
+            raise ValueError("Aucun webhook de destination")
+
+        destination = self._destination(url, name)
+        self._ensure_workers(destination)
+        handle = PublishHandle(next(self.job_ids), url, payload, group,
+                               asyncio.get_running_loop().create_future())
+        destination.queue.put_nowait(handle)
+        destination.queue_size.set(destination.queue.qsize())
+        logger.debug(f"Message {handle.job_id} mis en file pour {destination.name} "
+                     f"({destination.queue.qsize()} en attente)")
+        return handle
+
+    def build_match_payload(self, player_stats: Dict, match_stats: Dict, score_info: Dict) -> Dict:
+        """
+        Construit le message webhook (sérialisable en JSON) des résultats d'une partie.
+
+        Raises:
+            ValueError si des données du joueur manquent
+        """
+        # Vérification des clés requises
+        required_keys = ['summoner_name', 'tag_line', 'champion_name', 'kills', 'deaths', 'assists']
+        missing_keys = [key for key in required_keys if key not in player_stats]
+        if missing_keys:
+            logger.error(f"Clés manquantes dans player_stats: {missing_keys}")
+            raise ValueError(f"Données joueur incomplètes. Clés manquantes: {missing_keys}")
+
+        embed = self.create_match_embed(player_stats, match_stats, score_info)
+        return {
+            'embeds': [embed.to_dict()],
+            'username': WEBHOOK_USERNAME,
+            'avatar_url': WEBHOOK_AVATAR_URL
+        }
+
+    async def publish_match_result(self, player_stats: Dict, match_stats: Dict, score_info: Dict) -> PublishHandle:
+        """
+        Met en file la publication des résultats d'une partie sur Discord.
+        Retourne immédiatement, l'envoi est fait par les workers.
+        """
         try:
-            # Debug logs détaillés
-            logger.info("=== Début de la publication Discord ===")
-            logger.info(f"Publication pour: {player_stats.get('summoner_name')}#{player_stats.get('tag_line')}")
-            logger.info(f"Match ID: {match_stats.get('match_id')}")
-            logger.info(f"Champion: {player_stats.get('champion_name')}")
-            logger.info(f"Score: {score_info.get('final_score')}")
-            
-            # Vérification des clés requises
-            required_keys = ['summoner_name', 'tag_line', 'champion_name', 'kills', 'deaths', 'assists']
-            missing_keys = [key for key in required_keys if key not in player_stats]
-            if missing_keys:
-                logger.error(f"Clés manquantes dans player_stats: {missing_keys}")
-                logger.error(f"Données player_stats complètes: {player_stats}")
-                raise ValueError(f"Données joueur incomplètes. Clés manquantes: {missing_keys}")
-                
-            # Créer l'embed
-            embed = self.create_match_embed(player_stats, match_stats, score_info)
-            
-            # Tentative d'envoi
-            logger.info("Tentative d'envoi au webhook Discord...")
-            self.webhook.send(
-                embed=embed,
-                username="TiltTracker",
-                avatar_url="https://ddragon.leagueoflegends.com/cdn/14.21.1/img/profileicon/4408.png"
-            )
-            
-            logger.info(f"Résultats publiés avec succès pour {player_stats['champion_name']}")
-            logger.info("=== Fin de la publication Discord ===")
+            logger.info(f"Publication pour: {player_stats.get('summoner_name')}#{player_stats.get('tag_line')} - "
+                        f"Match ID: {match_stats.get('match_id')} - Score: {score_info.get('final_score')}")
+            return self.enqueue(self.build_match_payload(player_stats, match_stats, score_info))
             
         except Exception as e:
             logger.error(f"Erreur lors de la publication sur Discord: {e}")
@@ -152,6 +456,141 @@ class DiscordPublisher:
             logger.error(f"Données score_info: {score_info}")
             raise
 
+    async def _next_batch(self, destination: _Destination) -> List[PublishHandle]:
+        """
+        Récupère le prochain message de la file et ceux qui arrivent pendant la
+        fenêtre de regroupement (un seul worker collecte à la fois).
+        """
+        queue = destination.queue
+        async with destination.batch_lock:
+            first = await queue.get()
+            batch = [first]
+            collected = False
+            try:
+                if self.batch_window > 0 and first.batch_key:
+                    deadline = time.monotonic() + self.batch_window
+                    embeds = len(first.payload['embeds'])
+                    while embeds < EMBEDS_PER_MESSAGE:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        try:
+                            handle = await asyncio.wait_for(queue.get(), remaining)
+                        except asyncio.TimeoutError:
+                            break
+                        batch.append(handle)
+                        embeds += len(handle.payload.get('embeds') or ())
+                collected = True
+            finally:
+                if not collected:
+                    # Annulation pendant la fenêtre : les messages déjà retirés
+                    # de la file sont abandonnés, sans bloquer flush()
+                    for handle in batch:
+                        if not handle.future.done():
+                            handle.future.cancel()
+                        queue.task_done()
+
+        now = time.monotonic()
+        destination.queue_size.set(queue.qsize())
+        for handle in batch:
+            self.queue_wait.observe(now - handle.enqueued_at)
+        return batch
+
+    async def _worker(self, destination: _Destination, worker_id: int):
+        """Envoie les messages d'un webhook, regroupés en un minimum d'appels"""
+        while True:
+            batch = await self._next_batch(destination)
+            pending = list(batch)
+            try:
+                for url, payload, members in pack_messages(batch):
+                    await self._deliver(f"{destination.name}/{worker_id}", url, payload, members)
+                    for handle in members:
+                        pending.remove(handle)
+            finally:
+                # Annulation : les messages non envoyés sont abandonnés
+                for handle in pending:
+                    if not handle.future.done():
+                        handle.future.cancel()
+                for _ in batch:
+                    destination.queue.task_done()
+
+    async def _deliver(self, worker_id: str, url: str, payload: Dict, members: List[PublishHandle]):
+        """Envoie un message webhook et résout les messages qu'il regroupe"""
+        job_ids = ", ".join(str(handle.job_id) for handle in members)
+        try:
+            await self._send(url, payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            REGISTRY.counter('discord_publish_total', "Messages traités", status='error').inc(len(members))
+            logger.error(f"Erreur lors de l'envoi des messages {job_ids} sur Discord: {e}")
+            for handle in members:
+                if not handle.future.done():
+                    handle.future.set_exception(e)
+            return
+
+        self.embeds_per_message.observe(len(payload.get('embeds') or ()))
+        REGISTRY.counter('discord_publish_total', "Messages traités", status='sent').inc(len(members))
+        for handle in members:
+            if not handle.future.done():
+                handle.future.set_result(True)
+        logger.info(f"Messages {job_ids} publiés en un appel (worker {worker_id})")
+
+    async def _send(self, url: str, payload: Dict):
+        """Envoie un message au webhook en respectant les limites de taux"""
+        await self._ensure_session()
+        while True:
+            bucket, waited = await self.rate_limiter.acquire(url)
+            if waited:
+                self.rate_limit_wait.observe(waited)
+
+            try:
+                response = await self.session.post(url, params={'wait': 'true'}, json=payload)
+            except Exception:
+                self.rate_limiter.release(url, bucket)
+                raise
+
+            async with response:
+                self.rate_limiter.release(url, bucket, response.headers)
+                if response.status == 429:  # Rate limit
+                    data = await response.json(content_type=None)
+                    retry_after = float(data.get('retry_after', response.headers.get('Retry-After', 1)))
+                    is_global = bool(data.get('global')) or response.headers.get('X-RateLimit-Scope') == 'global'
+                    self.rate_limiter.rate_limited(url, retry_after, is_global)
+                    REGISTRY.counter('discord_publish_rate_limited_total', "Réponses 429 reçues",
+                                     scope='global' if is_global else 'bucket').inc()
+                    logger.warning(f"Limite de taux Discord atteinte ({'globale' if is_global else 'webhook'}), "
+                                   f"attente de {retry_after} secondes")
+                    continue
+                response.raise_for_status()
+                return
+
+    async def flush(self, timeout: Optional[float] = None):
+        """Attend que tous les messages en file soient traités"""
+        for destination in self.destinations.values():
+            if not destination.queue.empty():
+                self._ensure_workers(destination)
+        await asyncio.wait_for(
+            asyncio.gather(*(d.queue.join() for d in self.destinations.values())), timeout
+        )
+
+    async def close(self, timeout: float = 10):
+        """Vide les files (dans la limite du délai), arrête les workers et ferme la session"""
+        try:
+            await self.flush(timeout)
+        except asyncio.TimeoutError:
+            pending = sum(d.queue.qsize() for d in self.destinations.values())
+            logger.warning(f"{pending} messages Discord non envoyés à l'arrêt")
+        workers = [task for d in self.destinations.values() for task in d.workers]
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        for destination in self.destinations.values():
+            destination.workers = []
+        if self.session:
+            await self.session.close()
+            self.session = None
+
     def publish_match_result_sync(self, player_stats: Dict, match_stats: Dict, score_info: Dict):
         """
         Version synchrone de la publication (pour les tests).
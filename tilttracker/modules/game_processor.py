@@ -1,26 +1,28 @@
 # tilttracker/modules/game_processor.py
 import logging
 from typing import Optional, Dict, Tuple, List
-from tilttracker.utils.database import Database
-from tilttracker.modules.riot_api import RiotAPI
+from tilttracker.modules.services import ServiceContainer
 from game_data.calc_classe.calculator_factory import CalculatorFactory
 
 logger = logging.getLogger(__name__)
 
 class GameProcessor:
-    def __init__(self):
-        self.db = Database()
-        self.riot_api = RiotAPI()
+    def __init__(self, services: Optional[ServiceContainer] = None):
+        self.owns_services = services is None
+        self.services = services or ServiceContainer()
+        self.db = self.services.db
+        self.riot_api = self.services.riot_api
+        self.puuid_resolver = self.services.puuid_resolver
         self.calculator_factory = CalculatorFactory()
 
-    def ensure_player_exists(self, summoner_name: str, tag_line: str, discord_id: str = None) -> Optional[int]:
+    async def ensure_player_exists(self, summoner_name: str, tag_line: str, discord_id: str = None) -> Optional[int]:
         """
         S'assure que le joueur existe dans la base de données.
         Le crée s'il n'existe pas.
         """
         try:
-            # Récupérer le PUUID
-            puuid = self.riot_api.get_puuid(summoner_name, tag_line)
+            # Récupérer le PUUID (mémoire, base, puis Riot)
+            puuid = await self.puuid_resolver.resolve(summoner_name, tag_line)
             if not puuid:
                 logger.error(f"Impossible de trouver le compte Riot {summoner_name}#{tag_line}")
                 return None
@@ -32,7 +34,7 @@ class GameProcessor:
 
             # Si le joueur n'existe pas, l'enregistrer
             discord_id = discord_id or f"manual_{summoner_name}"  # ID temporaire si pas de Discord ID
-            success = self.db.register_player(
+            success = await self.db.register_player(
                 discord_id=discord_id,
                 riot_puuid=puuid,
                 summoner_name=summoner_name,
@@ -49,24 +51,24 @@ class GameProcessor:
             logger.error(f"Erreur lors de la vérification/création du joueur: {e}")
             return None
 
-    def process_recent_matches(self, summoner_name: str, tag_line: str, discord_id: str = None) -> bool:
+    async def process_recent_matches(self, summoner_name: str, tag_line: str, discord_id: str = None) -> bool:
         """
         Traite les parties récentes d'un joueur et les stocke dans la base de données.
         """
         try:
             # S'assurer que le joueur existe
-            player_id = self.ensure_player_exists(summoner_name, tag_line, discord_id)
+            player_id = await self.ensure_player_exists(summoner_name, tag_line, discord_id)
             if not player_id:
                 logger.error(f"Impossible de traiter les parties: joueur non trouvé/créé")
                 return False
 
-            # Récupérer le PUUID
-            puuid = self.riot_api.get_puuid(summoner_name, tag_line)
+            # PUUID déjà résolu par ensure_player_exists : servi depuis la mémoire
+            puuid = await self.puuid_resolver.resolve(summoner_name, tag_line)
             if not puuid:
                 return False
 
             # Récupérer les dernières parties ARAM
-            matches = self.riot_api.get_recent_aram_matches(puuid, count=10)
+            matches = await self.riot_api.get_recent_aram_matches(puuid, count=10)
             if not matches:
                 logger.info(f"Aucune partie ARAM récente trouvée pour {summoner_name}#{tag_line}")
                 return True
@@ -78,7 +80,7 @@ class GameProcessor:
                 logger.info(f"Vérification de la partie {match_id}")
                 if not self._is_match_processed(match_id):
                     logger.info(f"Traitement de la nouvelle partie {match_id}")
-                    if self._process_single_match(match_id, puuid):
+                    if await self._process_single_match(match_id, puuid):
                         processed_matches += 1
                 else:
                     logger.info(f"Partie {match_id} déjà traitée, ignorée")
@@ -102,6 +104,7 @@ class GameProcessor:
                 logger.info(f"Vérification du match {match_id}: {'déjà traité' if is_processed else 'nouveau match'}")
                 return is_processed
         except Exception as e:
+            self.db.connection.rollback()
             logger.error(f"Erreur lors de la vérification de la partie {match_id}: {e}")
             return False
 
@@ -160,7 +163,7 @@ class GameProcessor:
                 team_kills += participant['kills']
         return team_kills
 
-    def _process_single_match(self, match_id: str, puuid: str) -> bool:
+    async def _process_single_match(self, match_id: str, puuid: str) -> bool:
         """
         Traite une seule partie et l'enregistre dans la base de données.
         """
@@ -171,13 +174,13 @@ class GameProcessor:
                 return True
 
             # Récupérer les détails de la partie
-            match_details = self.riot_api.get_match_details(match_id)
+            match_details = await self.riot_api.get_match_details(match_id)
             if not match_details:
                 logger.warning(f"Impossible de récupérer les détails de la partie {match_id}")
                 return False
 
-            # Récupérer les stats du joueur
-            player_stats = self.riot_api.get_player_match_stats(match_id, puuid)
+            # Récupérer les stats du joueur (dans la partie déjà téléchargée)
+            player_stats = match_details.participant(puuid)
             if not player_stats:
                 logger.warning(f"Impossible de récupérer les stats du joueur pour la partie {match_id}")
                 return False
@@ -193,7 +196,7 @@ class GameProcessor:
                 return False
 
             # Enregistrer la partie
-            match_db_id = self.db.store_match(match_details)
+            match_db_id = await self.db.store_match(match_details)
             if not match_db_id:
                 logger.error(f"Échec de l'enregistrement de la partie {match_id}")
                 return False
@@ -207,7 +210,7 @@ class GameProcessor:
             }
 
             # Enregistrer les stats du joueur
-            success = self.db.store_player_performance(match_db_id, player_data)
+            success = await self.db.store_player_performance(match_db_id, player_data)
             if not success:
                 logger.error(f"Échec de l'enregistrement des stats du joueur pour la partie {match_id}")
                 return False
@@ -230,9 +233,11 @@ class GameProcessor:
                 result = cursor.fetchone()
                 return result[0] if result else None
         except Exception as e:
+            self.db.connection.rollback()
             logger.error(f"Erreur lors de la récupération de l'ID du joueur: {e}")
             return None
 
-    def close(self):
-        """Ferme les connexions à la base de données"""
-        self.db.close()
\ No newline at end of file
+    async def close(self):
+        """Ferme les services (session Riot, base de données) s'ils ne sont pas partagés"""
+        if self.owns_services:
+            await self.services.close()
\ No newline at end of file
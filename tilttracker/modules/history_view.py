@@ -0,0 +1,97 @@
+# tilttracker/modules/history_view.py
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional
+import discord
+
+logger = logging.getLogger(__name__)
+
+# Parties affichées par page d'historique
+HISTORY_PAGE_SIZE = 10
+
+# Charge une page : (curseur de départ, taille) -> lignes les plus récentes d'abord
+PageLoader = Callable[[Optional[int], int], Awaitable[List[Dict]]]
+
+
+class HistoryView(discord.ui.View):
+    """
+    Historique des parties paginé par boutons dans un seul message.
+
+    Chaque page est chargée à la demande par pagination par curseur
+    (id de la partie) : un clic coûte une requête d'une page et une
+    modification du message, quelle que soit la taille de l'historique.
+    """
+
+    def __init__(self, loader: PageLoader, title: str, author_id: int,
+                 header_embeds: Optional[List[discord.Embed]] = None,
+                 page_size: int = HISTORY_PAGE_SIZE, timeout: float = 300):
+        super().__init__(timeout=timeout)
+        self.loader = loader
+        self.title = title
+        self.author_id = author_id
+        self.header_embeds = header_embeds or []
+        self.page_size = page_size
+        # Curseur de départ de chaque page déjà visitée
+        self.cursors: List[Optional[int]] = [None]
+        self.page = 0
+        self.rows: List[Dict] = []
+        self.has_next = False
+        self.message: Optional[discord.Message] = None
+
+    async def load(self) -> None:
+        """Charge la page courante (une ligne de plus pour savoir s'il y a une suite)"""
+        rows = await self.loader(self.cursors[self.page], self.page_size + 1)
+        self.has_next = len(rows) > self.page_size
+        self.rows = rows[:self.page_size]
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = not self.has_next
+
+    def page_embed(self) -> discord.Embed:
+        embed = discord.Embed(title=self.title, color=discord.Color.blue())
+        if not self.rows:
+            embed.description = "Aucune partie enregistrée."
+        else:
+            embed.description = "\n".join(
+                f"{'✅' if game['win'] else '❌'} {game['champion']} : **{game['score']}** points "
+                f"({game['kda']}) - {game['date']}"
+                for game in self.rows
+            )
+        embed.set_footer(text=f"Page {self.page + 1}")
+        return embed
+
+    def embeds(self) -> List[discord.Embed]:
+        return self.header_embeds + [self.page_embed()]
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message(
+                "❌ Seul l'auteur de la commande peut changer de page.", ephemeral=True)
+            return False
+        return True
+
+    async def _show(self, interaction: discord.Interaction) -> None:
+        await self.load()
+        await interaction.response.edit_message(embeds=self.embeds(), view=self)
+
+    @discord.ui.button(label="◀ Précédent", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if self.page > 0:
+            self.page -= 1
+        await self._show(interaction)
+
+    @discord.ui.button(label="Suivant ▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if self.has_next and self.rows:
+            if self.page + 1 == len(self.cursors):
+                self.cursors.append(self.rows[-1]['cursor'])
+            self.page += 1
+        await self._show(interaction)
+
+    async def on_timeout(self) -> None:
+        """Désactive les boutons une fois la vue expirée"""
+        for item in self.children:
+            item.disabled = True
+        if self.message is not None:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException as e:
+                logger.debug(f"Impossible de désactiver la pagination: {e}")
@@ -0,0 +1,106 @@
+# tilttracker/modules/match_decoder.py
+"""
+Décodage des payloads match-v5 limité aux champs utilisés.
+
+Une partie fait 30 à 60 Ko de JSON (environ 130 champs par participant,
+plus challenges et perks) dont le pipeline lit une quinzaine de valeurs.
+Trois décodeurs, du plus rapide au plus lent :
+
+- msgspec : décodage typé qui saute les champs inconnus sans créer d'objets
+- orjson : décodage complet en C, puis élagage
+- json (bibliothèque standard) : décodage complet, puis élagage
+
+MATCH_JSON_DECODER choisit le décodeur (auto par défaut : le plus rapide
+installé). Tous retournent le même payload élagué, lu par parse_match().
+"""
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, List, Optional
+from tilttracker.modules.match_records import PARTICIPANT_FIELDS
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Champs de info conservés
+INFO_FIELDS = ('gameDuration', 'gameVersion', 'queueId')
+
+# Riot ID au moment de la partie (absent des anciens payloads)
+RIOT_ID_FIELDS = ('riotIdGameName', 'riotIdTagline')
+
+_PARTICIPANT_KEYS = tuple(PARTICIPANT_FIELDS) + RIOT_ID_FIELDS
+
+Decoder = Callable[[bytes], Dict[str, Any]]
+
+
+def prune_match(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Ne garde d'un payload complet que les champs lus par parse_match()"""
+    info = payload['info']
+    pruned = {field: info[field] for field in INFO_FIELDS}
+    pruned['participants'] = [
+        {key: participant[key] for key in _PARTICIPANT_KEYS if key in participant}
+        for participant in info['participants']
+    ]
+    return {'info': pruned}
+
+
+def decode_json(raw: bytes) -> Dict[str, Any]:
+    return prune_match(json.loads(raw))
+
+
+def decode_orjson(raw: bytes) -> Dict[str, Any]:
+    return prune_match(orjson.loads(raw))
+
+
+if msgspec is not None:
+    # Schéma partiel : msgspec ignore les champs absents des structures
+    _ParticipantPayload = msgspec.defstruct(
+        '_ParticipantPayload',
+        [(key, Any) for key in PARTICIPANT_FIELDS] + [(key, Optional[str], None) for key in RIOT_ID_FIELDS],
+    )
+
+    class _InfoPayload(msgspec.Struct):
+        gameDuration: int
+        gameVersion: str
+        queueId: int
+        participants: List[_ParticipantPayload]
+
+    class _MatchPayload(msgspec.Struct):
+        info: _InfoPayload
+
+    _msgspec_decoder = msgspec.json.Decoder(_MatchPayload)
+
+    def decode_msgspec(raw: bytes) -> Dict[str, Any]:
+        return msgspec.to_builtins(_msgspec_decoder.decode(raw))
+
+
+DECODERS: Dict[str, Decoder] = {'json': decode_json}
+if orjson is not None:
+    DECODERS['orjson'] = decode_orjson
+if msgspec is not None:
+    DECODERS['msgspec'] = decode_msgspec
+
+
+def get_decoder(name: Optional[str] = None) -> Decoder:
+    """
+    Décodeur demandé (MATCH_JSON_DECODER), ou le plus rapide disponible.
+
+    Raises:
+        ValueError: décodeur inconnu ou non installé
+    """
+    name = name or os.getenv('MATCH_JSON_DECODER', 'auto')
+    if name == 'auto':
+        name = next(candidate for candidate in ('msgspec', 'orjson', 'json') if candidate in DECODERS)
+    if name not in DECODERS:
+        raise ValueError(f"Décodeur JSON indisponible: {name} (installés: {', '.join(DECODERS)})")
+    logger.info(f"Décodage des parties avec {name}")
+    return DECODERS[name]
@@ -0,0 +1,164 @@
+# tilttracker/modules/match_records.py
+from typing import Any, Dict, List, Optional
+
+# Champs lus dans chaque participant du payload match-v5 -> nom interne
+PARTICIPANT_FIELDS = {
+    'puuid': 'puuid',
+    'championId': 'champion_id',
+    'championName': 'champion_name',
+    'kills': 'kills',
+    'deaths': 'deaths',
+    'assists': 'assists',
+    'totalDamageDealtToChampions': 'total_damage_dealt_to_champions',
+    'totalDamageTaken': 'total_damage_taken',
+    'damageSelfMitigated': 'damage_self_mitigated',
+    'totalTimeCCDealt': 'total_time_crowd_control_dealt',
+    'visionScore': 'vision_score',
+    'goldEarned': 'gold_earned',
+    'win': 'win',
+    'teamId': 'team_id',
+}
+
+# Totaux d'équipe exposés par chaque participant
+TEAM_FIELDS = (
+    'team_kills',
+    'team_total_kills',
+    'team_total_damage_dealt',
+    'team_total_damage_taken',
+    'team_size',
+    'damage_rank',
+)
+
+
+class _Record:
+    """
+    Accès par clé pour les consommateurs qui utilisaient les anciens
+    dictionnaires (stats['kills'], stats.get('team_size', 5), **stats).
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: str) -> bool:
+        return hasattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+
+class Team(_Record):
+    """
+    Totaux d'une équipe, calculés une seule fois.
+
+    L'équipe ne référence pas ses participants (ils la référencent) : pas de
+    cycle, une partie est libérée dès sa dernière référence. Les membres se
+    retrouvent par la partie (Match.team_participants).
+    """
+    __slots__ = ('team_id', 'kills', 'total_damage_dealt', 'total_damage_taken', 'damage_dealt')
+
+    def __init__(self, team_id: int):
+        self.team_id = team_id
+        self.kills = 0
+        self.total_damage_dealt = 0
+        self.total_damage_taken = 0
+        # Dégâts aux champions de chaque membre, pour le rang en dégâts
+        self.damage_dealt: List[int] = []
+
+    def add(self, participant: 'Participant') -> None:
+        self.kills += participant.kills
+        self.total_damage_dealt += participant.total_damage_dealt_to_champions
+        self.total_damage_taken += participant.total_damage_taken
+        self.damage_dealt.append(participant.total_damage_dealt_to_champions)
+
+
+class Participant(_Record):
+    """Statistiques d'un participant, limitées aux champs utilisés"""
+    __slots__ = tuple(PARTICIPANT_FIELDS.values()) + ('riot_id', 'team', 'performance_score', 'rank_in_team')
+
+    def __init__(self, data: Dict[str, Any], team: Team):
+        for source, name in PARTICIPANT_FIELDS.items():
+            setattr(self, name, data[source])
+        # Riot ID au moment de la partie (absent des anciens payloads)
+        self.riot_id = (data.get('riotIdGameName'), data.get('riotIdTagline'))
+        self.team = team
+        self.performance_score: Optional[float] = None
+        self.rank_in_team: Optional[int] = None
+
+    @property
+    def team_kills(self) -> int:
+        return self.team.kills
+
+    team_total_kills = team_kills
+
+    @property
+    def team_total_damage_dealt(self) -> int:
+        return self.team.total_damage_dealt
+
+    @property
+    def team_total_damage_taken(self) -> int:
+        return self.team.total_damage_taken
+
+    @property
+    def team_size(self) -> int:
+        return len(self.team.damage_dealt)
+
+    @property
+    def damage_rank(self) -> int:
+        """Rang du joueur en dégâts aux champions dans son équipe"""
+        return 1 + sum(1 for damage in self.team.damage_dealt if damage > self.total_damage_dealt_to_champions)
+
+    def keys(self):
+        """Champs exposés lors d'un dépliage en dictionnaire (**participant)"""
+        return tuple(PARTICIPANT_FIELDS.values()) + TEAM_FIELDS
+
+
+class Match(_Record):
+    """Partie match-v5 analysée une seule fois"""
+    __slots__ = ('match_id', 'game_duration', 'game_version', 'queue_id', 'participants', 'teams')
+
+    def __init__(self, match_id: str, game_duration: int, game_version: str, queue_id: int):
+        self.match_id = match_id
+        self.game_duration = game_duration
+        self.game_version = game_version
+        self.queue_id = queue_id
+        self.participants: List[Participant] = []
+        self.teams: Dict[int, Team] = {}
+
+    def participant(self, puuid: str) -> Optional[Participant]:
+        """Participant correspondant à un PUUID, None s'il n'a pas joué la partie"""
+        return next((p for p in self.participants if p.puuid == puuid), None)
+
+    def team_participants(self, team_id: int) -> List[Participant]:
+        """Participants d'une équipe, dans l'ordre du payload"""
+        return [p for p in self.participants if p.team_id == team_id]
+
+    def opponents(self, participant: Participant) -> List[Participant]:
+        """Participants de l'équipe adverse"""
+        return [p for p in self.participants if p.team_id != participant.team_id]
+
+    def assign_ranks(self, team_id: int) -> None:
+        """Classe une équipe par score de performance (1 = meilleur)"""
+        ranked = sorted(self.team_participants(team_id), key=lambda p: p.performance_score, reverse=True)
+        for rank, participant in enumerate(ranked, start=1):
+            participant.rank_in_team = rank
+
+
+def parse_match(match_id: str, payload: Dict[str, Any]) -> Match:
+    """
+    Construit les enregistrements d'une partie à partir du payload match-v5.
+    Seuls les champs utilisés sont conservés.
+    """
+    info = payload['info']
+    match = Match(match_id, info['gameDuration'], info['gameVersion'], info['queueId'])
+    for data in info['participants']:
+        team = match.teams.get(data['teamId'])
+        if team is None:
+            team = match.teams[data['teamId']] = Team(data['teamId'])
+        participant = Participant(data, team)
+        team.add(participant)
+        match.participants.append(participant)
+    return match
@@ -1,19 +1,33 @@
 # tilttracker/modules/match_watcher.py
+import asyncio
 import logging
+import os
+from collections import defaultdict
 from typing import List, Dict, Optional
-from tilttracker.utils.database import Database
-from tilttracker.modules.riot_api import RiotAPI
-from tilttracker.modules.discord_publisher import DiscordPublisher
+from tilttracker.modules.match_records import Match
+from tilttracker.modules.riot_api import CircuitOpen, normalize_platform, regional_route
+from tilttracker.modules.services import ServiceContainer
+from tilttracker.utils.cache import RANKING_TAG, player_tag
+from tilttracker.modules.champion_baselines import ChampionBaselines
+from tilttracker.modules.rating_engine import RatingEngine, PlayerRating
 from game_data.calc_classe.calculator_factory import CalculatorFactory 
 
 logger = logging.getLogger(__name__)
 
 class MatchWatcher:
-    def __init__(self, riot_api_key: str):
-        self.db = Database()
-        self.riot_api = RiotAPI(riot_api_key)
-        self.discord_publisher = DiscordPublisher()
+    def __init__(self, riot_api_key: str = None, services: Optional[ServiceContainer] = None):
+        # Services partagés avec le bot quand ils sont fournis
+        self.owns_services = services is None
+        self.services = services or ServiceContainer(riot_api_key)
+        self.db = self.services.db
+        self.riot_api = self.services.riot_api
+        self.discord_publisher = self.services.discord_publisher
+        self.publish_router = self.services.publish_router
         self.calculator_factory = CalculatorFactory() 
+        self.baselines = ChampionBaselines(self.db)
+        self.rating_engine = RatingEngine()
+        # Classement par percentiles du champion plutôt que par stats brutes
+        self.use_percentiles = os.getenv('SCORING_USE_PERCENTILES', 'false').lower() == 'true'
         logger.info("Match Watcher initialisé avec succès")
 
     async def get_registered_players(self) -> List[Dict]:
@@ -26,11 +40,11 @@ class MatchWatcher:
                 logger.info(f"Nombre total de joueurs dans la base: {total_count}")
                 
                 cursor.execute("""
-                    SELECT id, summoner_name, tag_line, riot_puuid, discord_id
+                    SELECT id, summoner_name, tag_line, riot_puuid, discord_id, region
                     FROM players
                     WHERE riot_puuid IS NOT NULL
                 """)
-                players = [dict(zip(['id', 'summoner_name', 'tag_line', 'riot_puuid', 'discord_id'], row))
+                players = [dict(zip(['id', 'summoner_name', 'tag_line', 'riot_puuid', 'discord_id', 'region'], row))
                         for row in cursor.fetchall()]
                 
                 logger.info(f"Joueurs avec PUUID trouvés: {len(players)}")
@@ -39,6 +53,7 @@ class MatchWatcher:
                     
                 return players
         except Exception as e:
+            self.db.connection.rollback()
             logger.error(f"Erreur lors de la récupération des joueurs: {e}")
             return []
 
@@ -47,12 +62,15 @@ class MatchWatcher:
         try:
             logger.info(f"Traitement du joueur: {player['summoner_name']}#{player['tag_line']}")
             
-            matches = await self.riot_api.get_recent_aram_matches(player['riot_puuid'], count=5)
+            matches = await self.riot_api.get_recent_aram_matches(player['riot_puuid'], count=5,
+                                                                  platform=player.get('region'))
             if not matches:
                 logger.info(f"Aucune partie ARAM récente pour {player['summoner_name']}#{player['tag_line']}")
                 return
 
-            for match_id in matches:
+            # Traiter les parties de la plus ancienne à la plus récente pour que
+            # les ratings soient mis à jour dans l'ordre chronologique
+            for match_id in reversed(matches):
                 # Vérifier si la partie a déjà été traitée pour ce joueur spécifique
                 if await self._is_match_processed_for_player(match_id, player['id']):
                     logger.info(f"Match {match_id} déjà traité pour {player['summoner_name']}, ignoré")
@@ -60,14 +78,45 @@ class MatchWatcher:
                     
                 try:
                     logger.info(f"Traitement de la nouvelle partie {match_id} pour {player['summoner_name']}")
-                    await self._process_single_match(match_id, player)
+                    async with self.services.load_shedder.ingest():
+                        await self._process_single_match(match_id, player)
+                except CircuitOpen:
+                    raise
                 except Exception as e:
                     logger.error(f"Erreur lors du traitement de la partie {match_id}: {e}")
                     continue
 
+        except CircuitOpen:
+            # Riot est dégradé : inutile de continuer le cycle
+            raise
         except Exception as e:
             logger.error(f"Erreur lors du traitement des parties pour {player['summoner_name']}: {e}")
 
+    async def process_players(self, players: List[Dict], pause: float = 5) -> None:
+        """
+        Traite les joueurs de chaque cluster régional (europe, americas,
+        asia, sea) en parallèle : chaque cluster a son propre budget Riot.
+        Dans un cluster, les joueurs passent l'un après l'autre.
+        """
+        clusters = defaultdict(list)
+        for player in players:
+            platform = normalize_platform(player.get('region')) or self.riot_api.default_platform
+            clusters[regional_route(platform)].append(player)
+
+        async def process_cluster(cluster: str, cluster_players: List[Dict]):
+            logger.info(f"Cluster {cluster}: {len(cluster_players)} joueur(s)")
+            for index, player in enumerate(cluster_players):
+                try:
+                    await self.process_new_matches(player)
+                except CircuitOpen as e:
+                    logger.warning(f"Cluster {cluster} interrompu, Riot indisponible: {e}")
+                    return
+                if index + 1 < len(cluster_players):
+                    await asyncio.sleep(pause)  # Pause entre chaque joueur
+
+        await asyncio.gather(*(process_cluster(cluster, cluster_players)
+                               for cluster, cluster_players in clusters.items()))
+
     async def _process_single_match(self, match_id: str, player: Dict) -> bool:
         """
         Traite une seule partie et l'enregistre dans la base de données.
@@ -76,107 +125,122 @@ class MatchWatcher:
             # Récupérer le total actuel des points avant le nouveau match
             previous_total = await self.db.get_player_total_score(player['id'])
             
-            # Récupérer les détails du match
-            match_details = await self.riot_api.get_match_details(match_id)
-            if not match_details:
+            # Récupérer la partie (une seule requête pour les détails et les participants)
+            match = await self.riot_api.get_match_details(match_id)
+            if not match:
                 logger.warning(f"Impossible de récupérer les détails pour le match {match_id}")
                 return False
 
-            # Récupérer les stats de tous les joueurs de l'équipe
-            team_stats = await self.riot_api.get_team_match_stats(match_id, player['riot_puuid'])
-            if not team_stats:
-                logger.warning(f"Impossible de récupérer les stats d'équipe pour le match {match_id}")
-                return False
-
-            # Trouver les stats du joueur dans les stats d'équipe
-            player_stats = next((p for p in team_stats if p['puuid'] == player['riot_puuid']), None)
+            # Trouver les stats du joueur puis son équipe
+            player_stats = match.participant(player['riot_puuid'])
             if not player_stats:
                 logger.warning(f"Stats du joueur non trouvées dans l'équipe")
                 return False
+            team_stats = match.team_participants(player_stats.team_id)
 
-            # Ajouter summoner_name et tag_line aux stats du joueur
-            player_stats['summoner_name'] = player['summoner_name']
-            player_stats['tag_line'] = player['tag_line']
-
-            # Calculer le rang des dégâts et ajouter team_size
-            team_damages = [p['total_damage_dealt_to_champions'] for p in team_stats 
-                        if p['team_id'] == player_stats['team_id']]
-            team_damages.sort(reverse=True)
-            player_stats['damage_rank'] = team_damages.index(player_stats['total_damage_dealt_to_champions']) + 1
-            player_stats['team_size'] = len(team_damages)
+            # Riot rapporte le Riot ID actuel du joueur : détecter un renommage
+            renamed = await self.services.puuid_resolver.observe(
+                player['riot_puuid'], *player_stats.riot_id,
+                known=(player['summoner_name'], player['tag_line'])
+            )
+            if renamed:
+                # Publication et invalidation du cache sous le nouveau nom
+                player = {**player, 'summoner_name': renamed[0], 'tag_line': renamed[1]}
 
-            # Calculer les scores de performance pour chaque joueur de l'équipe
-            team_performances = []
-            for p_stats in team_stats:
-                calculator = self.calculator_factory.get_calculator(str(p_stats['champion_id']))
-                performance_score = calculator.calculate_performance_score(p_stats)
-                team_performances.append({
-                    'puuid': p_stats['puuid'],
-                    'performance_score': performance_score,
-                    'stats': p_stats
-                })
+            # Alimenter les percentiles de référence avec les 10 participants
+            await self.baselines.ingest_match(match_id, match.participants)
 
-            # Trier l'équipe par score de performance
-            team_performances.sort(key=lambda x: x['performance_score'], reverse=True)
+            # Les percentiles ne sont utilisés que si tous les champions de l'équipe ont assez d'historique
+            use_percentiles = self.use_percentiles and self.baselines.is_ready(
+                p.champion_id for p in team_stats
+            )
 
-            # Trouver le rang du joueur dans son équipe
-            player_rank = next(i + 1 for i, p in enumerate(team_performances) 
-                            if p['puuid'] == player['riot_puuid'])
+            # Calculer les scores de performance pour chaque joueur de l'équipe puis les classer
+            for p_stats in team_stats:
+                calculator = self.calculator_factory.get_calculator(str(p_stats.champion_id))
+                percentile = self.baselines.percentile_function(p_stats.champion_id) if use_percentiles else None
+                p_stats.performance_score = calculator.calculate_performance_score(p_stats, percentile)
+            match.assign_ranks(player_stats.team_id)
+            player_rank = player_stats.rank_in_team
 
             # Calculer les points selon le rang et la victoire/défaite
-            calculator = self.calculator_factory.get_calculator(str(player_stats['champion_id']))
+            calculator = self.calculator_factory.get_calculator(str(player_stats.champion_id))
             final_score = calculator.calculate_score(
                 stats=player_stats,
                 rank_in_team=player_rank,
-                is_victory=player_stats['win']
+                is_victory=player_stats.win
             )
 
-            # Ajouter le rang aux stats du joueur
-            player_stats['rank_in_team'] = player_rank
-
             # Stocker le match dans la base de données
-            match_db_id = await self._store_match(match_details)
+            match_db_id = await self._store_match(match)
             if not match_db_id:
                 return False
 
+            # Mettre à jour le rating face à l'équipe adverse, daté comme lors
+            # d'un recalcul depuis l'historique (matches.created_at)
+            played_at = await self.db.get_match_played_at(match_db_id)
+            known_ratings = await self.db.get_ratings_by_puuid([p.puuid for p in match.participants])
+            current_rating = PlayerRating(**known_ratings.get(player['riot_puuid'], {}))
+            opponents = [PlayerRating(**known_ratings[p.puuid]) for p in match.opponents(player_stats)
+                         if p.puuid in known_ratings]
+            new_rating = self.rating_engine.update(
+                current_rating,
+                opponents,
+                win=player_stats.win,
+                rank_in_team=player_rank,
+                played_at=played_at,
+                team_size=len(team_stats)
+            )
+
+            # Conserver les stats des 10 participants pour pouvoir rejouer le scoring
+            await self.db.store_match_participants(match_db_id, match.participants)
+
             # Stocker la performance du joueur avec le score et le rang
             player_data = {
+                **player_stats,
                 'player_id': player['id'],
                 'match_id': match_db_id,
                 'score': final_score,
                 'rank_in_team': player_rank,
-                **player_stats
+                'summoner_name': player['summoner_name'],
+                'tag_line': player['tag_line']
             }
 
-            # Enregistrer les stats du joueur
-            success = await self._store_performance(match_db_id, player_data)
-            if not success:
-                return False
-
-            # Récupérer le nouveau total après l'ajout du score
-            new_total = await self.db.get_player_total_score(player['id'])
-
             # Préparer les informations de score pour Discord
+            new_total = previous_total + final_score
             score_info = {
                 'final_score': final_score,
                 'total_score': new_total,
                 'previous_total': previous_total,
-                'score_change': new_total - previous_total,
+                'score_change': final_score,
                 'rank_in_team': player_rank,
                 'base_score': final_score  # Ajouté pour la compatibilité
             }
+            # Message construit une fois puis envoyé à chaque destination du joueur
+            payload = self.discord_publisher.build_match_payload(player_data, match, score_info)
+            routes = await self.publish_router.destinations(player['id'])
+            if not routes:
+                logger.warning(f"Aucune destination de publication pour {player['summoner_name']}")
 
-            # Publier sur Discord
-            await self.discord_publisher.publish_match_result(
-                player_stats=player_stats,
-                match_stats=match_details,
-                score_info=score_info
+            # Enregistrer les stats du joueur, son nouveau rating et les publications
+            # Discord dans la même transaction (publiées ensuite par l'OutboxWorker)
+            success = await self._store_performance(
+                match_db_id, player_data, new_rating, outbox=[(route.name, payload) for route in routes]
+            )
+            if not success:
+                return False
+
+            # Les réponses en cache du bot ne reflètent plus cette partie
+            self.services.command_cache.invalidate(
+                RANKING_TAG, player_tag(player['summoner_name'], player['tag_line'])
             )
 
             logger.info(f"Match {match_id} traité avec succès pour {player['summoner_name']} "
                     f"(Rang: {player_rank}, Score: {final_score})")
             return True
 
+        except CircuitOpen:
+            raise
         except Exception as e:
             logger.error(f"Erreur lors du traitement de la partie {match_id}: {e}")
             logger.exception(e)
@@ -196,28 +260,31 @@ class MatchWatcher:
                 """, (match_id, player_id))
                 return cursor.fetchone()[0]
         except Exception as e:
+            self.db.connection.rollback()
             logger.error(f"Erreur lors de la vérification de la partie {match_id} pour le joueur {player_id}: {e}")
             return False
 
-    async def _store_match(self, match_details: Dict) -> Optional[int]:
+    async def _store_match(self, match: Match) -> Optional[int]:
         """Stocke une partie dans la base de données"""
         try:
-            return await self.db.store_match(match_details)
+            return await self.db.store_match(match)
         except Exception as e:
             logger.error(f"Erreur lors du stockage de la partie: {e}")
             return None
 
-    async def _store_performance(self, match_id: int, player_data: Dict) -> bool:
-        """Stocke les performances d'un joueur"""
+    async def _store_performance(self, match_id: int, player_data: Dict,
+                                 rating: Optional[PlayerRating] = None,
+                                 outbox: Optional[List] = None) -> bool:
+        """Stocke les performances d'un joueur (rating et publications dans la même transaction)"""
         try:
-            return await self.db.store_player_performance(match_id, player_data)
+            return await self.db.store_player_performance(
+                match_id, player_data, vars(rating) if rating else None, outbox
+            )
         except Exception as e:
             logger.error(f"Erreur lors du stockage des performances: {e}")
             return False
 
-    def cleanup(self):
-        """Nettoie les ressources"""
-        try:
-            self.db.close()
-        except Exception as e:
-            logger.error(f"Erreur lors du nettoyage: {e}")
\ No newline at end of file
+    async def cleanup(self):
+        """Nettoie les ressources (seulement si elles ne sont pas partagées)"""
+        if self.owns_services:
+            await self.services.close()
\ No newline at end of file
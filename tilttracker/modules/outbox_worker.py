@@ -0,0 +1,126 @@
+# tilttracker/modules/outbox_worker.py
+import argparse
+import asyncio
+import logging
+import os
+from typing import Dict, Optional
+from dotenv import load_dotenv
+from tilttracker.utils.database import Database
+from tilttracker.modules.discord_publisher import DiscordPublisher
+from tilttracker.modules.publish_routing import PublishRouter
+from tilttracker.modules.services import ServiceContainer
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxWorker:
+    """
+    Publie les messages de la table publish_outbox.
+
+    Les messages sont écrits dans la même transaction que la performance du
+    joueur : une publication ne peut donc plus être perdue si Discord est
+    indisponible ou si le processus s'arrête. Plusieurs workers (dans le bot
+    ou lancés à part) peuvent tourner en parallèle, chaque message n'étant
+    réservé que par un seul d'entre eux. La livraison est « au moins une fois » :
+    un worker arrêté entre l'envoi et l'acquittement provoque un doublon.
+    """
+
+    def __init__(self, db: Database, publisher: DiscordPublisher, router: Optional[PublishRouter] = None):
+        load_dotenv()
+        self.db = db
+        self.publisher = publisher
+        self.router = router
+        self.batch_size = int(os.getenv('OUTBOX_BATCH_SIZE', '10'))
+        self.poll_interval = float(os.getenv('OUTBOX_POLL_INTERVAL', '5'))
+        self.max_attempts = int(os.getenv('OUTBOX_MAX_ATTEMPTS', '8'))
+        self.base_backoff = float(os.getenv('OUTBOX_BACKOFF_SECONDS', '10'))
+        self.max_backoff = 3600.0
+
+    def backoff(self, attempts: int) -> float:
+        """Délai avant nouvelle tentative (exponentiel, plafonné)"""
+        return min(self.base_backoff * 2 ** (attempts - 1), self.max_backoff)
+
+    async def _deliver(self, message: Dict) -> bool:
+        """Envoie un message réservé et enregistre le résultat"""
+        url = None
+        if self.router:
+            url = await self.router.webhook_for(message['channel'])
+            if url is None:
+                logger.error(f"Publication {message['id']} abandonnée: route {message['channel']} introuvable")
+                await self.db.mark_outbox_failed(message['id'], "Route de publication introuvable")
+                return False
+
+        try:
+            # Les publications d'une même partie sont regroupées dans un seul message
+            handle = self.publisher.enqueue(message['payload'], url=url, group=message.get('match_id'),
+                                            name=message['channel'])
+            await handle.wait()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if message['attempts'] >= self.max_attempts:
+                logger.error(f"Publication {message['id']} abandonnée après {message['attempts']} tentatives: {error}")
+                await self.db.mark_outbox_failed(message['id'], error)
+            else:
+                retry_in = self.backoff(message['attempts'])
+                logger.warning(f"Échec de la publication {message['id']} "
+                               f"(tentative {message['attempts']}), nouvel essai dans {retry_in:.0f}s: {error}")
+                await self.db.mark_outbox_failed(message['id'], error, retry_in)
+            return False
+
+        await self.db.mark_outbox_sent(message['id'])
+        return True
+
+    async def run_once(self) -> int:
+        """
+        Publie un lot de messages.
+
+        Returns:
+            Nombre de messages réservés
+        """
+        messages = await self.db.claim_outbox(self.batch_size)
+        if messages:
+            results = await asyncio.gather(*(self._deliver(message) for message in messages))
+            logger.info(f"{sum(results)}/{len(messages)} messages publiés")
+        return len(messages)
+
+    async def run(self):
+        """Boucle de publication : enchaîne les lots tant qu'il y a des messages"""
+        logger.info("Worker de publication démarré")
+        while True:
+            try:
+                if await self.run_once() < self.batch_size:
+                    await asyncio.sleep(self.poll_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Erreur dans le worker de publication: {e}")
+                await asyncio.sleep(self.poll_interval)
+
+
+async def _run_standalone(once: bool = False):
+    async with ServiceContainer() as services:
+        worker = OutboxWorker(services.db, services.discord_publisher, services.publish_router)
+        if once:
+            await worker.run_once()
+        else:
+            await worker.run()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Publie sur Discord les messages en attente")
+    parser.add_argument('--once', action='store_true', help="Publie un seul lot puis s'arrête")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    try:
+        asyncio.run(_run_standalone(args.once))
+    except KeyboardInterrupt:
+        logger.info("Worker de publication arrêté")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# tilttracker/modules/publish_routing.py
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+from tilttracker.utils.database import Database
+from tilttracker.modules.discord_publisher import DEFAULT_CHANNEL
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PublishRoute:
+    """Destination de publication (un webhook Discord)"""
+    name: str
+    webhook_url: Optional[str]
+    guild_id: Optional[str] = None
+    player_id: Optional[int] = None
+
+    @property
+    def targeted(self) -> bool:
+        """Route propre à un joueur ou à un serveur (et non globale)"""
+        return self.player_id is not None or self.guild_id is not None
+
+    def matches(self, player_id: int, guilds: Set[str]) -> bool:
+        """La route reçoit-elle les parties de ce joueur ?"""
+        if self.player_id is not None:
+            return self.player_id == player_id
+        if self.guild_id is not None:
+            return self.guild_id in guilds
+        return True
+
+
+class PublishRouter:
+    """
+    Détermine vers quels webhooks publier les parties d'un joueur.
+
+    Les routes (table publish_routes) ciblent un joueur, tous les joueurs
+    inscrits depuis un serveur Discord, ou toutes les parties. Le webhook
+    DISCORD_WEBHOOK_URL ne sert que de repli, pour les joueurs qu'aucune
+    route de joueur ou de serveur ne cible. Les routes sont gardées en
+    mémoire et rechargées périodiquement.
+    """
+
+    def __init__(self, db: Database, default_webhook_url: Optional[str] = None,
+                 refresh_seconds: Optional[float] = None):
+        self.db = db
+        self.default_route = PublishRoute(DEFAULT_CHANNEL, default_webhook_url) if default_webhook_url else None
+        self.refresh_seconds = refresh_seconds if refresh_seconds is not None else \
+            float(os.getenv('PUBLISH_ROUTES_REFRESH_SECONDS', '60'))
+        self.routes: List[PublishRoute] = []
+        self.player_guilds: Dict[int, Set[str]] = {}
+        self.loaded_at: Optional[float] = None
+
+    async def refresh(self, force: bool = False) -> None:
+        """Recharge les routes si le cache a expiré"""
+        if not force and self.loaded_at is not None and time.monotonic() - self.loaded_at < self.refresh_seconds:
+            return
+        routes = []
+        for row in await self.db.get_publish_routes():
+            if row['name'] == DEFAULT_CHANNEL:
+                # publish_outbox est indexée par nom de route : ce nom est celui du webhook par défaut
+                logger.error(f"Route de publication {row['name']} ignorée : nom réservé au webhook par défaut")
+                continue
+            routes.append(PublishRoute(row['name'], row['webhook_url'], row['guild_id'], row['player_id']))
+        self.routes = routes
+        self.player_guilds = await self.db.get_player_guilds()
+        self.loaded_at = time.monotonic()
+        logger.debug(f"{len(self.routes)} routes de publication chargées")
+
+    async def destinations(self, player_id: int) -> List[PublishRoute]:
+        """Routes qui reçoivent les parties d'un joueur"""
+        await self.refresh()
+        guilds = self.player_guilds.get(player_id, set())
+        routes = [route for route in self.routes if route.matches(player_id, guilds)]
+        if self.default_route and not any(route.targeted for route in routes):
+            routes.insert(0, self.default_route)
+        return routes
+
+    async def webhook_for(self, channel: str) -> Optional[str]:
+        """Webhook d'une route, None si elle n'existe plus"""
+        if self.default_route and channel == self.default_route.name:
+            return self.default_route.webhook_url
+        await self.refresh()
+        route = next((route for route in self.routes if route.name == channel), None)
+        if route is None:
+            # Route peut-être créée depuis le dernier chargement
+            await self.refresh(force=True)
+            route = next((route for route in self.routes if route.name == channel), None)
+        return route.webhook_url if route else None
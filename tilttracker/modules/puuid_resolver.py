@@ -0,0 +1,126 @@
+# tilttracker/modules/puuid_resolver.py
+import asyncio
+import logging
+import os
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from tilttracker.utils.database import Database
+from tilttracker.utils.metrics import REGISTRY
+from tilttracker.modules.riot_api import RiotAPI, riot_id_tag
+
+logger = logging.getLogger(__name__)
+
+RiotId = Tuple[str, str]
+# Appelé après un renommage : (puuid, ancien Riot ID, nouveau Riot ID)
+RenameListener = Callable[[str, RiotId, RiotId], None]
+
+
+def _key(summoner_name: str, tag_line: str) -> RiotId:
+    # Les Riot ID sont insensibles à la casse
+    return summoner_name.casefold(), tag_line.casefold()
+
+
+class PuuidResolver:
+    """
+    Résout les Riot ID (nom#tag) en PUUID : mémoire, puis table players,
+    puis account-v1 en dernier recours.
+
+    Un PUUID est permanent, mais un Riot ID peut changer de propriétaire
+    après un renommage : quand Riot rapporte un nouveau nom pour un PUUID
+    (observe), l'ancienne correspondance est invalidée partout, y compris
+    chez les abonnés (on_rename) qui gardent leurs propres copies.
+    """
+
+    def __init__(self, db: Database, riot_api: RiotAPI, concurrency: Optional[int] = None):
+        self.db = db
+        self.riot_api = riot_api
+        self.concurrency = concurrency or int(os.getenv('PUUID_RESOLVER_CONCURRENCY', '8'))
+        self.puuids: Dict[RiotId, str] = {}
+        self.riot_ids: Dict[str, RiotId] = {}
+        self.rename_listeners: List[RenameListener] = []
+
+    def _count(self, source: str):
+        REGISTRY.counter('puuid_resolutions_total', "Résolutions de PUUID par source", source=source).inc()
+
+    def on_rename(self, listener: RenameListener) -> None:
+        """Abonne un composant (index d'autocomplétion, cache du bot) aux renommages"""
+        self.rename_listeners.append(listener)
+
+    def remember(self, summoner_name: str, tag_line: str, puuid: str) -> None:
+        """Enregistre une correspondance connue (inscription, base)"""
+        previous = self.riot_ids.get(puuid)
+        if previous is not None and previous != (summoner_name, tag_line):
+            self.puuids.pop(_key(*previous), None)
+        self.puuids[_key(summoner_name, tag_line)] = puuid
+        self.riot_ids[puuid] = (summoner_name, tag_line)
+
+    async def resolve(self, summoner_name: str, tag_line: str) -> Optional[str]:
+        """PUUID d'un Riot ID, None si le compte n'existe pas"""
+        puuid = self.puuids.get(_key(summoner_name, tag_line))
+        if puuid:
+            self._count('memory')
+            return puuid
+
+        puuid = await self.db.get_puuid_by_riot_id(summoner_name, tag_line)
+        if puuid:
+            self._count('database')
+        else:
+            puuid = await self.riot_api.get_puuid(summoner_name, tag_line)
+            if not puuid:
+                self._count('unknown')
+                return None
+            self._count('riot')
+
+        self.remember(summoner_name, tag_line, puuid)
+        return puuid
+
+    async def resolve_many(self, riot_ids: Iterable[RiotId]) -> Dict[RiotId, Optional[str]]:
+        """
+        Résout plusieurs Riot ID en parallèle. Les appels à Riot restent
+        soumis au budget partagé de RiotAPI.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        unique = list(dict.fromkeys(riot_ids))
+
+        async def resolve_one(riot_id: RiotId) -> Optional[str]:
+            async with semaphore:
+                try:
+                    return await self.resolve(*riot_id)
+                except Exception as e:
+                    logger.error(f"Erreur lors de la résolution de {riot_id[0]}#{riot_id[1]}: {e}")
+                    return None
+
+        results = await asyncio.gather(*(resolve_one(riot_id) for riot_id in unique))
+        return dict(zip(unique, results))
+
+    async def observe(self, puuid: str, summoner_name: str, tag_line: str,
+                      known: Optional[RiotId] = None) -> Optional[RiotId]:
+        """
+        Riot rapporte le Riot ID actuel d'un PUUID (partie, account-v1).
+
+        Args:
+            known: Riot ID enregistré si le résolveur ne connaît pas encore ce PUUID
+
+        Returns:
+            Le nouveau Riot ID si un renommage a été détecté et propagé, None sinon
+            (une différence de casse seule n'est pas un renommage)
+        """
+        if not summoner_name or not tag_line:
+            return None
+        previous = self.riot_ids.get(puuid, known)
+        if previous is None or _key(*previous) == _key(summoner_name, tag_line):
+            if puuid not in self.riot_ids:
+                # Orthographe enregistrée conservée, comme en base
+                self.remember(*(previous or (summoner_name, tag_line)), puuid)
+            return None
+
+        logger.info(f"Renommage détecté: {previous[0]}#{previous[1]} -> {summoner_name}#{tag_line}")
+        self.puuids.pop(_key(*previous), None)
+        self.riot_api.cache.invalidate(riot_id_tag(*previous))
+        await self.db.update_player_riot_id(puuid, summoner_name, tag_line)
+        self.remember(summoner_name, tag_line, puuid)
+        for listener in self.rename_listeners:
+            try:
+                listener(puuid, previous, (summoner_name, tag_line))
+            except Exception as e:
+                logger.error(f"Erreur lors de la propagation du renommage de {previous[0]}#{previous[1]}: {e}")
+        return summoner_name, tag_line
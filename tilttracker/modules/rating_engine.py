@@ -0,0 +1,186 @@
+# tilttracker/modules/rating_engine.py
+import argparse
+import asyncio
+import logging
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+from tilttracker.utils.database import Database, DEFAULT_RATING, DEFAULT_DEVIATION
+
+logger = logging.getLogger(__name__)
+
+# Paramètres Glicko (rating par défaut défini dans database)
+MIN_DEVIATION = 30.0
+# Augmentation de l'incertitude par jour d'inactivité
+DEVIATION_DECAY_PER_DAY = 5.0
+# Part du classement dans l'équipe dans le résultat (le reste = victoire/défaite)
+PERFORMANCE_WEIGHT = 0.2
+TEAM_SIZE = 5
+
+_Q = math.log(10) / 400
+
+
+@dataclass
+class PlayerRating:
+    """Rating courant d'un joueur"""
+    rating: float = DEFAULT_RATING
+    deviation: float = DEFAULT_DEVIATION
+    games: int = 0
+    last_played_at: Optional[datetime] = None
+
+
+def _g(deviation: float) -> float:
+    return 1 / math.sqrt(1 + 3 * (_Q ** 2) * (deviation ** 2) / (math.pi ** 2))
+
+
+class RatingEngine:
+    """
+    Rating de compétence incrémental de type Glicko.
+
+    Chaque partie est traitée comme un duel entre le joueur et un adversaire
+    composite (moyenne des ratings de l'équipe adverse, les adversaires non
+    inscrits ayant le rating par défaut). Une mise à jour coûte O(taille d'équipe).
+    """
+
+    def __init__(self, performance_weight: float = PERFORMANCE_WEIGHT,
+                 deviation_decay_per_day: float = DEVIATION_DECAY_PER_DAY):
+        self.performance_weight = performance_weight
+        self.deviation_decay_per_day = deviation_decay_per_day
+
+    def outcome(self, win: bool, rank_in_team: Optional[int], team_size: int = TEAM_SIZE) -> float:
+        """Résultat de la partie entre 0 et 1, pondéré par le rang dans l'équipe"""
+        result = 1.0 if win else 0.0
+        if not rank_in_team or team_size < 2:
+            return result
+        performance = (team_size - rank_in_team) / (team_size - 1)
+        return (1 - self.performance_weight) * result + self.performance_weight * performance
+
+    def composite_opponent(self, opponents: Iterable[PlayerRating], team_size: int = TEAM_SIZE) -> PlayerRating:
+        """Adversaire composite : les places manquantes ont le rating par défaut"""
+        ratings = list(opponents)
+        missing = max(team_size - len(ratings), 0)
+        total = len(ratings) + missing
+        if not total:
+            return PlayerRating()
+
+        rating = (sum(r.rating for r in ratings) + missing * DEFAULT_RATING) / total
+        variance = (sum(r.deviation ** 2 for r in ratings) + missing * DEFAULT_DEVIATION ** 2) / total
+        return PlayerRating(rating=rating, deviation=math.sqrt(variance))
+
+    def _inflate(self, player: PlayerRating, played_at: Optional[datetime]) -> float:
+        """Incertitude augmentée selon le temps d'inactivité"""
+        if not player.last_played_at or not played_at:
+            return player.deviation
+        days = max((played_at - player.last_played_at).total_seconds() / 86400, 0)
+        return min(math.sqrt(player.deviation ** 2 + (self.deviation_decay_per_day ** 2) * days),
+                   DEFAULT_DEVIATION)
+
+    def update(self, player: PlayerRating, opponents: Iterable[PlayerRating], win: bool,
+               rank_in_team: Optional[int] = None, played_at: Optional[datetime] = None,
+               team_size: int = TEAM_SIZE) -> PlayerRating:
+        """
+        Calcule le nouveau rating d'un joueur après une partie.
+
+        Args:
+            player: Rating actuel du joueur
+            opponents: Ratings connus de l'équipe adverse
+            win: True si victoire
+            rank_in_team: Rang de performance dans l'équipe (1-5)
+            played_at: Date de la partie
+        """
+        opponent = self.composite_opponent(opponents, team_size)
+        deviation = self._inflate(player, played_at)
+
+        g = _g(opponent.deviation)
+        expected = 1 / (1 + 10 ** (-g * (player.rating - opponent.rating) / 400))
+        d_squared = 1 / ((_Q ** 2) * (g ** 2) * expected * (1 - expected))
+        denominator = 1 / deviation ** 2 + 1 / d_squared
+
+        score = self.outcome(win, rank_in_team, team_size)
+        rating = player.rating + _Q / denominator * g * (score - expected)
+        new_deviation = max(math.sqrt(1 / denominator), MIN_DEVIATION)
+
+        return PlayerRating(
+            rating=rating,
+            deviation=new_deviation,
+            games=player.games + 1,
+            last_played_at=played_at or datetime.now()
+        )
+
+    def replay(self, rows: Iterable[Dict]) -> Dict[int, PlayerRating]:
+        """
+        Recalcule tous les ratings à partir de l'historique.
+
+        Args:
+            rows: Performances triées chronologiquement, avec player_id,
+                match_id, team_id, win, rank_in_team et played_at
+
+        Returns:
+            Ratings finaux par player_id
+        """
+        ratings: Dict[int, PlayerRating] = {}
+        current_match = None
+        match_rows: List[Dict] = []
+
+        def flush():
+            for row in match_rows:
+                opponents = [ratings[other['player_id']] for other in match_rows
+                             if other['team_id'] != row['team_id'] and other['player_id'] in ratings]
+                ratings[row['player_id']] = self.update(
+                    ratings.get(row['player_id'], PlayerRating()),
+                    opponents,
+                    win=row['win'],
+                    rank_in_team=row['rank_in_team'],
+                    played_at=row['played_at']
+                )
+
+        for row in rows:
+            if row['match_id'] != current_match:
+                flush()
+                current_match = row['match_id']
+                match_rows = []
+            match_rows.append(row)
+        flush()
+
+        return ratings
+
+
+async def replay_ratings(db: Database, engine: RatingEngine, batch_size: int = 5000) -> int:
+    """
+    Reconstruit la table des ratings depuis l'historique stocké.
+
+    Returns:
+        Nombre de joueurs recalculés
+    """
+    logger.info("=== Recalcul des ratings depuis l'historique ===")
+    start_time = datetime.now()
+
+    ratings = engine.replay(db.iter_rating_history(batch_size))
+    await db.replace_player_ratings(ratings, batch_size)
+
+    duration = (datetime.now() - start_time).total_seconds()
+    logger.info(f"{len(ratings)} ratings recalculés en {duration:.2f} secondes")
+    return len(ratings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recalcule les ratings depuis l'historique des parties")
+    parser.add_argument('--batch-size', type=int, default=5000,
+                        help="Nombre de lignes lues et écrites par lot")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    db = Database()
+    try:
+        asyncio.run(replay_ratings(db, RatingEngine(), args.batch_size))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
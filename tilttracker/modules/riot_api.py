@@ -1,15 +1,149 @@
 # tilttracker/modules/riot_api.py
 import os
 import logging
+import random
 import time
 import urllib.parse
-from typing import Optional, List, Dict, Any
+from typing import Any, Callable, Optional, List, Dict
 import aiohttp
 import asyncio
+from collections import deque
+from aiohttp.compression_utils import HAS_BROTLI
 from dotenv import load_dotenv
+from tilttracker.modules.match_decoder import get_decoder
+from tilttracker.modules.match_records import Match, Participant, parse_match
+from tilttracker.utils.cache import TTLCache
+from tilttracker.utils.circuit_breaker import CircuitBreakers, CircuitOpen, backoff_delay
+from tilttracker.utils.metrics import REGISTRY
 
 logger = logging.getLogger(__name__)
 
+# Limites d'une clé de développement : 20 requêtes/s et 100 requêtes/2 min
+DEFAULT_RATE_LIMITS = "20:1,100:120"
+
+# Serveurs (routage "platform" : summoner-v4, league-v4) -> nom affiché et
+# cluster régional (account-v1, match-v5)
+PLATFORMS = {
+    'euw1': ('EUW', 'europe'),
+    'eun1': ('EUNE', 'europe'),
+    'tr1': ('TR', 'europe'),
+    'ru': ('RU', 'europe'),
+    'me1': ('ME', 'europe'),
+    'na1': ('NA', 'americas'),
+    'br1': ('BR', 'americas'),
+    'la1': ('LAN', 'americas'),
+    'la2': ('LAS', 'americas'),
+    'kr': ('KR', 'asia'),
+    'jp1': ('JP', 'asia'),
+    'oc1': ('OCE', 'sea'),
+    'ph2': ('PH', 'sea'),
+    'sg2': ('SG', 'sea'),
+    'th2': ('TH', 'sea'),
+    'tw2': ('TW', 'sea'),
+    'vn2': ('VN', 'sea'),
+}
+
+DEFAULT_PLATFORM = 'euw1'
+
+RIOT_HOST_SUFFIX = '.api.riotgames.com'
+
+
+def normalize_platform(platform: Optional[str]) -> Optional[str]:
+    """Serveur à partir de son identifiant (euw1) ou de son nom (EUW), None si inconnu"""
+    if not platform:
+        return None
+    platform = platform.strip().lower()
+    if platform in PLATFORMS:
+        return platform
+    return next((key for key, (label, _) in PLATFORMS.items() if label.lower() == platform), None)
+
+
+def regional_route(platform: str) -> str:
+    """Cluster régional d'un serveur (match-v5)"""
+    return PLATFORMS[platform][1]
+
+
+def account_route(platform: str) -> str:
+    """Cluster d'account-v1, qui n'est pas servi par sea"""
+    region = regional_route(platform)
+    return 'asia' if region == 'sea' else region
+
+
+def platform_of_match(match_id: str) -> Optional[str]:
+    """Serveur d'une partie d'après le préfixe de son ID (EUW1_123 -> euw1)"""
+    return normalize_platform(match_id.split('_', 1)[0]) if '_' in match_id else None
+
+
+def riot_id_tag(summoner_name: str, tag_line: str) -> tuple:
+    """Tag de cache d'un Riot ID (insensible à la casse)"""
+    return ('riot_id', summoner_name.casefold(), tag_line.casefold())
+
+
+def endpoint_name(url: str) -> str:
+    """Point d'accès d'une URL Riot (ex. match-v5), clé des disjoncteurs"""
+    parts = urllib.parse.urlsplit(url).path.strip('/').split('/')
+    if len(parts) >= 3:
+        return f"{parts[1]}-{parts[2]}"
+    return parts[0] or 'inconnu'
+
+
+class RiotUnavailable(Exception):
+    """Riot n'a pas répondu correctement avant la fin des tentatives ou du délai"""
+
+
+def parse_rate_limits(spec: str) -> List[tuple]:
+    """Analyse une spécification "requêtes:secondes,..." (format des en-têtes Riot)"""
+    limits = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        count, seconds = part.split(':')
+        limits.append((int(count), float(seconds)))
+    return limits
+
+
+class RiotRateLimiter:
+    """
+    Budget de requêtes de la clé API, en fenêtres glissantes. Toutes les
+    requêtes d'un même RiotAPI y puisent ; un 429 suspend tout le monde.
+    """
+
+    def __init__(self, limits: List[tuple], clock=time.monotonic, sleep=asyncio.sleep):
+        self.windows = [(count, seconds, deque()) for count, seconds in limits]
+        self.blocked_until = 0.0
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = asyncio.Lock()
+
+    def _delay(self, now: float) -> float:
+        delay = max(self.blocked_until - now, 0.0)
+        for count, seconds, calls in self.windows:
+            while calls and calls[0] <= now - seconds:
+                calls.popleft()
+            if len(calls) >= count:
+                delay = max(delay, calls[0] + seconds - now)
+        return delay
+
+    async def acquire(self) -> float:
+        """Attend qu'une requête soit autorisée, retourne le temps attendu"""
+        waited = 0.0
+        async with self._lock:
+            while True:
+                delay = self._delay(self.clock())
+                if delay <= 0:
+                    break
+                await self.sleep(delay)
+                waited += delay
+            now = self.clock()
+            for _, _, calls in self.windows:
+                calls.append(now)
+        return waited
+
+    def block(self, retry_after: float) -> None:
+        """Suspend toutes les requêtes après un 429"""
+        self.blocked_until = max(self.blocked_until, self.clock() + retry_after)
+
 class RiotAPI:
     def __init__(self, riot_api_key: str = None):
         load_dotenv()
@@ -19,11 +153,13 @@ class RiotAPI:
         if not self.api_key:
             raise ValueError("RIOT_API_KEY non trouvée")
         
-        # URLs de base pour différentes régions
-        self.base_urls = {
-            'europe': 'https://europe.api.riotgames.com',
-            'euw1': 'https://euw1.api.riotgames.com'
-        }
+        # Serveur des appels sans région explicite (anciens joueurs, comptes)
+        self.default_platform = normalize_platform(os.getenv('RIOT_DEFAULT_PLATFORM', DEFAULT_PLATFORM))
+        if not self.default_platform:
+            raise ValueError(f"RIOT_DEFAULT_PLATFORM inconnu: {os.getenv('RIOT_DEFAULT_PLATFORM')}")
+
+        # Hôtes surchargés par routage (proxy, tests) ; sinon https://{routage}.api.riotgames.com
+        self.base_urls: Dict[str, str] = {}
         
         # ID de la file ARAM
         self.ARAM_QUEUE_ID = 450
@@ -33,60 +169,275 @@ class RiotAPI:
             'X-Riot-Token': self.api_key
         }
 
-        # Session aiohttp
+        # Session aiohttp, créée au premier appel et fermée par cleanup()
         self.session = None
+        self.connector = None
+        self.connections = {'new': 0, 'reused': 0}
+        # Requêtes envoyées dont la réponse (ou l'erreur) n'est pas encore arrivée
+        self.requests_in_flight = 0
+
+        # Riot applique les limites de la clé par routage : chaque hôte
+        # (euw1, europe, na1, ...) a son propre budget, créé à la demande
+        rate_limits = parse_rate_limits(os.getenv('RIOT_RATE_LIMITS', DEFAULT_RATE_LIMITS))
+        self.rate_limits = rate_limits
+        self.rate_limiters: Dict[str, RiotRateLimiter] = {}
+
+        # Transport : au-delà de la plus petite fenêtre du budget, des
+        # connexions supplémentaires ne feraient qu'attendre le limiteur
+        self.pool_size = int(os.getenv('RIOT_HTTP_POOL_SIZE') or 0) or \
+            min((count for count, _ in rate_limits), default=20)
+        self.keepalive_timeout = float(os.getenv('RIOT_HTTP_KEEPALIVE', '60'))
+        self.dns_ttl = int(os.getenv('RIOT_HTTP_DNS_TTL', '300'))
+        self.connect_timeout = float(os.getenv('RIOT_HTTP_CONNECT_TIMEOUT', '5'))
+        self.read_timeout = float(os.getenv('RIOT_HTTP_READ_TIMEOUT', '10'))
+
+        # Cache des comptes : un Riot ID ne change de PUUID qu'au renommage,
+        # le profil évolue lentement, les rangs après chaque partie classée
+        self.cache = TTLCache(ttl=300, max_entries=4096, name='riot')
+        self.puuid_ttl = float(os.getenv('RIOT_CACHE_PUUID_TTL', '86400'))
+        self.summoner_ttl = float(os.getenv('RIOT_CACHE_SUMMONER_TTL', '3600'))
+        self.rank_ttl = float(os.getenv('RIOT_CACHE_RANK_TTL', '300'))
+
+        # Décodage des parties limité aux champs utilisés (MATCH_JSON_DECODER)
+        self.decode_match = get_decoder()
+
+        # Nouvelles tentatives bornées (5xx, 429, délais dépassés) et
+        # disjoncteur par point d'accès pendant les incidents Riot
+        self.max_retries = int(os.getenv('RIOT_MAX_RETRIES', '3'))
+        self.backoff_base = float(os.getenv('RIOT_BACKOFF_BASE', '0.5'))
+        self.backoff_cap = float(os.getenv('RIOT_BACKOFF_CAP', '8'))
+        self.request_deadline = float(os.getenv('RIOT_REQUEST_DEADLINE', '30'))
+        self.breakers = CircuitBreakers(
+            failure_threshold=int(os.getenv('RIOT_BREAKER_THRESHOLD', '5')),
+            cooldown=float(os.getenv('RIOT_BREAKER_COOLDOWN', '30'))
+        )
+        self.clock = time.monotonic
+        self.sleep = asyncio.sleep
+        self.rng = random.Random()
 
         logger.info("RiotAPI initialisée avec succès")
 
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        """Compte les connexions ouvertes et réutilisées, et les requêtes en vol"""
+        def counting(kind: str):
+            async def on_connection(session, context, params):
+                self.connections[kind] += 1
+                REGISTRY.counter('riot_http_connections_total', "Connexions HTTP vers Riot par origine",
+                                 kind=kind).inc()
+            return on_connection
+
+        def in_flight(step: int):
+            async def on_request(session, context, params):
+                self.requests_in_flight += step
+            return on_request
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(counting('new'))
+        trace_config.on_connection_reuseconn.append(counting('reused'))
+        trace_config.on_request_start.append(in_flight(1))
+        trace_config.on_request_end.append(in_flight(-1))
+        trace_config.on_request_exception.append(in_flight(-1))
+        return trace_config
+
     async def _ensure_session(self):
         """S'assure qu'une session est active"""
-        if self.session is None:
-            self.session = aiohttp.ClientSession()
+        if self.session is None or self.session.closed:
+            # Pas de limite globale : chaque hôte a son pool de pool_size connexions
+            self.connector = aiohttp.TCPConnector(
+                limit=0,
+                limit_per_host=self.pool_size,
+                keepalive_timeout=self.keepalive_timeout,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_ttl,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=self.connector,
+                headers={
+                    **self.headers,
+                    # Le décodage brotli dépend du paquet Brotli
+                    'Accept-Encoding': 'gzip, deflate, br' if HAS_BROTLI else 'gzip, deflate',
+                },
+                timeout=aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.read_timeout),
+                trace_configs=[self._trace_config()],
+            )
+
+    def pool_stats(self) -> Dict[str, int]:
+        """État du pool de connexions, pour vérifier leur réutilisation"""
+        stats = {
+            'limit': self.connector.limit if self.connector else 0,
+            'limit_per_host': self.connector.limit_per_host if self.connector else 0,
+            'in_use': 0,
+            'idle': 0,
+            'hosts': {},
+            'requests_in_flight': self.requests_in_flight,
+            **self.connections,
+        }
+        if self.connector is not None and not self.connector.closed:
+            # Pas d'accesseur public dans aiohttp pour l'occupation du pool : attributs
+            # internes lus s'ils existent, compteurs des traces sinon
+            acquired = getattr(self.connector, '_acquired', None)
+            idle = getattr(self.connector, '_conns', None)
+            stats['in_use'] = len(acquired) if acquired is not None else self.requests_in_flight
+            if isinstance(idle, dict):
+                stats['idle'] = sum(len(conns) for conns in idle.values())
+                stats['hosts'] = {getattr(key, 'host', str(key)): len(conns)
+                                  for key, conns in idle.items() if conns}
+        return stats
+
+    def _url(self, routing: str, path: str) -> str:
+        """URL d'un appel sur un routage (serveur ou cluster régional)"""
+        return f"{self.base_urls.get(routing, f'https://{routing}{RIOT_HOST_SUFFIX}')}{path}"
 
-    async def _make_request(self, url: str) -> Optional[Dict]:
+    def _platform(self, platform: Optional[str]) -> str:
+        return normalize_platform(platform) or self.default_platform
+
+    def rate_limiter_for(self, host: str) -> RiotRateLimiter:
+        """Budget de requêtes d'un hôte Riot"""
+        limiter = self.rate_limiters.get(host)
+        if limiter is None:
+            limiter = self.rate_limiters[host] = RiotRateLimiter(self.rate_limits, self.clock, self.sleep)
+        return limiter
+
+    def _retry(self, endpoint: str, reason: str, attempt: int, deadline: float,
+                retry_after: Optional[float] = None) -> float:
+        """
+        Délai avant la tentative suivante, ou RiotUnavailable si les
+        tentatives ou le temps alloué à la requête sont épuisés.
+        """
+        if attempt >= self.max_retries:
+            raise RiotUnavailable(f"{endpoint}: échec après {attempt + 1} tentatives ({reason})")
+        delay = retry_after if retry_after is not None else \
+            backoff_delay(attempt, self.backoff_base, self.backoff_cap, self.rng)
+        if self.clock() + delay >= deadline:
+            raise RiotUnavailable(f"{endpoint}: délai de {self.request_deadline:.0f}s dépassé ({reason})")
+        REGISTRY.counter('riot_retries_total', "Nouvelles tentatives de requêtes Riot",
+                         endpoint=endpoint, reason=reason).inc()
+        return delay
+
+    async def _make_request(self, url: str, decode: Optional[Callable[[bytes], Any]] = None) -> Optional[Dict]:
         """
         Effectue une requête HTTP avec gestion des erreurs et des limites de taux.
+
+        Les 5xx, 429, délais dépassés et erreurs de connexion sont retentés
+        avec un délai exponentiel à gigue, dans la limite de RIOT_MAX_RETRIES
+        et de RIOT_REQUEST_DEADLINE secondes. Un disjoncteur par point
+        d'accès fait échouer immédiatement (CircuitOpen) pendant un incident.
+
+        Args:
+            decode: décodeur du corps brut de la réponse, à la place de json()
         """
         await self._ensure_session()
-        
-        try:
-            async with self.session.get(url, headers=self.headers) as response:
-                if response.status == 429:  # Rate limit
-                    retry_after = int(response.headers.get('Retry-After', 60))
-                    logger.warning(f"Limite de taux atteinte, attente de {retry_after} secondes")
-                    await asyncio.sleep(retry_after)
-                    return await self._make_request(url)
-                    
-                response.raise_for_status()
-                return await response.json()
-                
-        except aiohttp.ClientResponseError as e:
-            if e.status == 404:
-                logger.warning(f"Ressource non trouvée: {url}")
-                return None
-            else:
+        host = urllib.parse.urlsplit(url).netloc
+        rate_limiter = self.rate_limiter_for(host)
+        # Un incident sur un serveur ne coupe pas les autres
+        routing = host[:-len(RIOT_HOST_SUFFIX)] if host.endswith(RIOT_HOST_SUFFIX) else host
+        endpoint = f"{endpoint_name(url)}@{routing}"
+        breaker = self.breakers.get(endpoint)
+        deadline = None
+        attempt = 0
+
+        while True:
+            breaker.before_request()
+            waited = await rate_limiter.acquire()
+            if waited:
+                logger.debug(f"Attente de {waited:.2f}s imposée par le budget Riot")
+            if deadline is None:
+                # L'attente initiale du budget n'est pas un signe de panne
+                deadline = self.clock() + self.request_deadline
+            timeout = aiohttp.ClientTimeout(total=max(deadline - self.clock(), 0.1),
+                                            sock_connect=self.connect_timeout, sock_read=self.read_timeout)
+
+            try:
+                async with self.session.get(url, timeout=timeout) as response:
+                    if response.status == 429:  # Rate limit
+                        retry_after = float(response.headers.get('Retry-After', 60))
+                        logger.warning(f"Limite de taux atteinte, attente de {retry_after} secondes")
+                        rate_limiter.block(retry_after)
+                        # Le service répond : pas un échec pour le disjoncteur
+                        breaker.record_success()
+                        self._retry(endpoint, '429', attempt, deadline, retry_after)
+                        attempt += 1
+                        continue
+
+                    if response.status >= 500:
+                        breaker.record_failure()
+                        delay = self._retry(endpoint, str(response.status), attempt, deadline)
+                        logger.warning(f"Erreur {response.status} de Riot sur {endpoint}, "
+                                       f"nouvel essai dans {delay:.2f}s")
+                    else:
+                        breaker.record_success()
+                        if response.status == 404:
+                            logger.warning(f"Ressource non trouvée: {url}")
+                            return None
+                        response.raise_for_status()
+                        if decode is not None:
+                            return decode(await response.read())
+                        return await response.json()
+
+            except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as e:
+                breaker.record_failure()
+                reason = 'timeout' if isinstance(e, asyncio.TimeoutError) else 'connexion'
+                delay = self._retry(endpoint, reason, attempt, deadline)
+                logger.warning(f"Requête à {endpoint} en échec ({reason}), nouvel essai dans {delay:.2f}s")
+
+            except aiohttp.ClientResponseError as e:
                 logger.error(f"Erreur HTTP lors de la requête à {url}: {e}")
                 raise
-                
-        except Exception as e:
-            logger.error(f"Erreur lors de la requête à {url}: {e}")
-            raise
 
-    async def get_puuid(self, summoner_name: str, tag_line: str) -> Optional[str]:
+            except Exception as e:
+                logger.error(f"Erreur lors de la requête à {url}: {e}")
+                raise
+
+            # Attente hors du contexte de la réponse : la connexion est rendue au pool
+            await self.sleep(delay)
+            attempt += 1
+
+    def breaker_states(self) -> Dict[str, str]:
+        """État des disjoncteurs par point d'accès"""
+        return self.breakers.states()
+
+    async def get_puuid(self, summoner_name: str, tag_line: str, platform: Optional[str] = None) -> Optional[str]:
         """
         Récupère le PUUID d'un joueur à partir de son nom d'invocateur et de son tag.
+        Les Riot ID sont globaux : le serveur ne choisit que le cluster interrogé.
         """
-        encoded_name = urllib.parse.quote(summoner_name)
-        encoded_tag = urllib.parse.quote(tag_line)
-        url = f"{self.base_urls['europe']}/riot/account/v1/accounts/by-riot-id/{encoded_name}/{encoded_tag}"
-        
-        response = await self._make_request(url)
-        if response:
-            logger.info(f"PUUID récupéré pour {summoner_name}#{tag_line}")
-            return response.get('puuid')
-        return None
+        async def fetch():
+            encoded_name = urllib.parse.quote(summoner_name)
+            encoded_tag = urllib.parse.quote(tag_line)
+            url = self._url(account_route(self._platform(platform)),
+                            f"/riot/account/v1/accounts/by-riot-id/{encoded_name}/{encoded_tag}")
+            response = await self._make_request(url)
+            if response:
+                logger.info(f"PUUID récupéré pour {summoner_name}#{tag_line}")
+                return response.get('puuid')
+            return None
+
+        # Les Riot ID sont insensibles à la casse
+        return await self.cache.get_or_load(
+            'puuid', (summoner_name.casefold(), tag_line.casefold()), fetch,
+            tags=(riot_id_tag(summoner_name, tag_line),), ttl=self.puuid_ttl
+        )
 
-    async def get_recent_aram_matches(self, puuid: str, count: int = 20) -> List[str]:
+    async def get_summoner(self, puuid: str, platform: Optional[str] = None) -> Optional[Dict]:
+        """Profil summoner-v4 d'un joueur (niveau, icône) sur son serveur"""
+        platform = self._platform(platform)
+        return await self.cache.get_or_load(
+            'summoner', (platform, puuid),
+            lambda: self._make_request(self._url(platform, f"/lol/summoner/v4/summoners/by-puuid/{puuid}")),
+            ttl=self.summoner_ttl
+        )
+
+    async def get_league_entries(self, puuid: str, platform: Optional[str] = None) -> Optional[List[Dict]]:
+        """Rangs league-v4 d'un joueur sur son serveur, directement par PUUID"""
+        platform = self._platform(platform)
+        return await self.cache.get_or_load(
+            'league', (platform, puuid),
+            lambda: self._make_request(self._url(platform, f"/lol/league/v4/entries/by-puuid/{puuid}")),
+            ttl=self.rank_ttl
+        )
+
+    async def get_recent_aram_matches(self, puuid: str, count: int = 20,
+                                      platform: Optional[str] = None) -> List[str]:
         """
         Récupère les IDs des dernières parties ARAM d'un joueur.
         """
@@ -96,7 +447,7 @@ class RiotAPI:
             'count': count
         }
         
-        url = f"{self.base_urls['europe']}/lol/match/v5/matches/by-puuid/{puuid}/ids"
+        url = self._url(regional_route(self._platform(platform)), f"/lol/match/v5/matches/by-puuid/{puuid}/ids")
         params_str = '&'.join(f'{k}={v}' for k, v in params.items())
         full_url = f"{url}?{params_str}"
         
@@ -107,220 +458,130 @@ class RiotAPI:
             return matches
         return []
 
-    async def get_match_details(self, match_id: str) -> Optional[Dict[str, Any]]:
+    async def get_match(self, match_id: str) -> Optional[Match]:
+        """
+        Récupère une partie et l'analyse en enregistrements compacts.
+        Une seule requête par partie, quel que soit l'usage qui en est fait.
+        Le cluster est déduit du préfixe de l'ID (EUW1_, NA1_, KR_...).
+        """
+        platform = self._platform(platform_of_match(match_id))
+        match_data = await self._make_request(
+            self._url(regional_route(platform), f"/lol/match/v5/matches/{match_id}"), decode=self.decode_match
+        )
+        if not match_data:
+            return None
+        return parse_match(match_id, match_data)
+
+    async def get_match_details(self, match_id: str) -> Optional[Match]:
         """
         Récupère les détails d'une partie spécifique.
         Ne retourne que les parties ARAM.
         """
-        url = f"{self.base_urls['europe']}/lol/match/v5/matches/{match_id}"
-        match_data = await self._make_request(url)
-        
-        if not match_data:
+        match = await self.get_match(match_id)
+        if not match:
             return None
             
         # Vérifier que c'est bien une partie ARAM
-        if match_data.get('info', {}).get('queueId') != self.ARAM_QUEUE_ID:
+        if match.queue_id != self.ARAM_QUEUE_ID:
             logger.debug(f"Match {match_id} n'est pas une partie ARAM")
             return None
-            
-        info = match_data['info']
-        
-        match_details = {
-            'match_id': match_id,
-            'game_duration': info['gameDuration'],
-            'game_version': info['gameVersion'],
-            'queue_id': info['queueId']
-        }
         
         logger.info(f"Détails récupérés pour le match {match_id}")
-        return match_details
+        return match
 
-    async def get_team_match_stats(self, match_id: str, player_puuid: str) -> List[Dict[str, Any]]:
+    async def get_match_participants_stats(self, match_id: str) -> Optional[List[Participant]]:
         """
-        Récupère les statistiques de tous les joueurs de l'équipe d'un joueur spécifique.
+        Récupère les statistiques de tous les participants d'une partie,
+        avec les totaux de leur équipe.
         
         Args:
             match_id: ID de la partie
-            player_puuid: PUUID du joueur dont on veut l'équipe
             
         Returns:
-            Liste des stats de chaque joueur de l'équipe
+            Participants des deux équipes
             None si erreur
         """
         try:
-            # Récupérer les données complètes du match
-            match_data = await self._make_request(
-                f"{self.base_urls['europe']}/lol/match/v5/matches/{match_id}"
-            )
-            
-            if not match_data:
+            match = await self.get_match(match_id)
+            if not match:
                 return None
-                
-            # Trouver l'équipe du joueur
-            player_data = None
-            player_team_id = None
-            for participant in match_data['info']['participants']:
-                if participant['puuid'] == player_puuid:
-                    player_data = participant
-                    player_team_id = participant['teamId']
-                    break
-                    
-            if not player_team_id:
-                logger.error(f"Joueur {player_puuid} non trouvé dans le match {match_id}")
-                return None
-                
-            # Calculer les totaux de l'équipe
-            team_totals = {
-                'kills': 0,
-                'damage_dealt': 0,
-                'damage_taken': 0
-            }
-            
-            # Récupérer les stats de tous les joueurs de l'équipe
-            team_stats = []
-            for participant in match_data['info']['participants']:
-                if participant['teamId'] == player_team_id:
-                    team_totals['kills'] += participant['kills']
-                    team_totals['damage_dealt'] += participant['totalDamageDealtToChampions']
-                    team_totals['damage_taken'] += participant['totalDamageTaken']
-            
-            # Créer les statistiques détaillées pour chaque joueur
-            for participant in match_data['info']['participants']:
-                if participant['teamId'] == player_team_id:
-                    player_stats = {
-                        'puuid': participant['puuid'],
-                        'champion_id': participant['championId'],
-                        'champion_name': participant['championName'],
-                        'kills': participant['kills'],
-                        'deaths': participant['deaths'],
-                        'assists': participant['assists'],
-                        'total_damage_dealt_to_champions': participant['totalDamageDealtToChampions'],
-                        'total_damage_taken': participant['totalDamageTaken'],
-                        'damage_self_mitigated': participant['damageSelfMitigated'],
-                        'total_time_crowd_control_dealt': participant['totalTimeCCDealt'],
-                        'vision_score': participant['visionScore'],
-                        'gold_earned': participant['goldEarned'],
-                        'win': participant['win'],
-                        'team_id': participant['teamId'],
-                        # Ajouter les totaux de l'équipe pour les calculs de pourcentage
-                        'team_kills': team_totals['kills'],
-                        'team_total_damage_dealt': team_totals['damage_dealt'],
-                        'team_total_damage_taken': team_totals['damage_taken']
-                    }
-                    team_stats.append(player_stats)
-            
-            logger.info(f"Stats d'équipe récupérées pour le match {match_id} - "
-                    f"{len(team_stats)} joueurs trouvés")
-            return team_stats
+
+            logger.info(f"Stats des participants récupérées pour le match {match_id} - "
+                    f"{len(match.participants)} joueurs trouvés")
+            return match.participants
 
         except Exception as e:
-            logger.error(f"Erreur lors de la récupération des stats d'équipe: {e}")
+            logger.error(f"Erreur lors de la récupération des stats des participants: {e}")
             logger.exception(e)
             return None
 
-    async def get_player_match_stats(self, match_id: str, puuid: str) -> Optional[Dict[str, Any]]:
-        """
-        Récupère les statistiques d'un joueur spécifique dans une partie.
+    async def get_team_match_stats(self, match_id: str, player_puuid: str) -> Optional[List[Participant]]:
         """
-        match_data = await self._make_request(
-            f"{self.base_urls['europe']}/lol/match/v5/matches/{match_id}"
-        )
+        Récupère les statistiques de tous les joueurs de l'équipe d'un joueur spécifique.
         
-        if not match_data:
-            return None
+        Args:
+            match_id: ID de la partie
+            player_puuid: PUUID du joueur dont on veut l'équipe
             
-        # Initialiser les totaux d'équipe
-        team_totals = {
-            'team1': {
-                'kills': 0,
-                'damage_dealt': 0,
-                'damage_taken': 0,
-                'players_damage': []  # Liste pour stocker les dégâts de chaque joueur
-            },
-            'team2': {
-                'kills': 0,
-                'damage_dealt': 0,
-                'damage_taken': 0,
-                'players_damage': []  # Liste pour stocker les dégâts de chaque joueur
-            }
-        }
-        
-        player_stats = None
-        
-        # Parcourir tous les participants pour calculer les totaux
-        for participant in match_data['info']['participants']:
-            team_key = 'team1' if participant['teamId'] == 100 else 'team2'
+        Returns:
+            Participants de l'équipe du joueur
+            None si erreur
+        """
+        match = await self.get_match(match_id)
+        if not match:
+            return None
             
-            # Ajouter aux totaux de l'équipe
-            team_totals[team_key]['kills'] += participant['kills']
-            team_totals[team_key]['damage_dealt'] += participant['totalDamageDealtToChampions']
-            team_totals[team_key]['damage_taken'] += participant['totalDamageTaken']
-            team_totals[team_key]['players_damage'].append(participant['totalDamageDealtToChampions'])
+        # Trouver l'équipe du joueur
+        player = match.participant(player_puuid)
+        if not player:
+            logger.error(f"Joueur {player_puuid} non trouvé dans le match {match_id}")
+            return None
             
-            # Si c'est notre joueur, sauvegarder ses stats
-            if participant['puuid'] == puuid:
-                team_id = participant['teamId']
-                player_stats = {
-                    'champion_id': participant['championId'],
-                    'champion_name': participant['championName'],
-                    'kills': participant['kills'],
-                    'deaths': participant['deaths'],
-                    'assists': participant['assists'],
-                    'total_damage_dealt_to_champions': participant['totalDamageDealtToChampions'],
-                    'total_damage_taken': participant['totalDamageTaken'],
-                    'damage_self_mitigated': participant['damageSelfMitigated'],
-                    'total_time_crowd_control_dealt': participant['totalTimeCCDealt'],
-                    'vision_score': participant['visionScore'],
-                    'gold_earned': participant['goldEarned'],
-                    'win': participant['win'],
-                    'team_id': team_id
-                }
+        team_stats = match.team_participants(player.team_id)
+        logger.info(f"Stats d'équipe récupérées pour le match {match_id} - "
+                f"{len(team_stats)} joueurs trouvés")
+        return team_stats
 
+    async def get_player_match_stats(self, match_id: str, puuid: str) -> Optional[Participant]:
+        """
+        Récupère les statistiques d'un joueur spécifique dans une partie
+        (totaux d'équipe, rang en dégâts et taille d'équipe inclus).
+        """
+        match = await self.get_match(match_id)
+        if not match:
+            return None
+
+        player_stats = match.participant(puuid)
         if player_stats:
-            # Déterminer quelle équipe est celle du joueur
-            team_key = 'team1' if player_stats['team_id'] == 100 else 'team2'
-            
-            # Calculer le rang en dégâts du joueur
-            team_damages = sorted(team_totals[team_key]['players_damage'], reverse=True)
-            damage_rank = team_damages.index(player_stats['total_damage_dealt_to_champions']) + 1
-            
-            # Ajouter les totaux de l'équipe et le rang aux stats du joueur
-            player_stats.update({
-                'team_total_kills': team_totals[team_key]['kills'],
-                'team_total_damage_dealt': team_totals[team_key]['damage_dealt'],
-                'team_total_damage_taken': team_totals[team_key]['damage_taken'],
-                'damage_rank': damage_rank,
-                'team_size': len(team_totals[team_key]['players_damage'])
-            })
-            
             logger.info(f"Stats récupérées pour le joueur {puuid} dans le match {match_id}")
             return player_stats
         
         logger.warning(f"Joueur {puuid} non trouvé dans le match {match_id}")
         return None
 
-    async def get_account_info(self, game_name: str, tag_line: str) -> Optional[Dict]:
+    async def get_account_info(self, game_name: str, tag_line: str,
+                               platform: Optional[str] = None) -> Optional[Dict]:
         """
-        Récupère les informations détaillées d'un compte Riot à partir du Riot ID.
+        Récupère les informations détaillées d'un compte Riot à partir du Riot ID,
+        profil et rangs étant lus sur le serveur du joueur.
         """
+        platform = self._platform(platform)
         try:
             # D'abord récupérer le PUUID
-            puuid = await self.get_puuid(game_name, tag_line)
+            puuid = await self.get_puuid(game_name, tag_line, platform)
             if not puuid:
                 logger.error(f"PUUID non trouvé pour {game_name}#{tag_line}")
                 return None
 
-            # Récupérer les infos du compte via PUUID
-            summoner_url = f"{self.base_urls['euw1']}/lol/summoner/v4/summoners/by-puuid/{puuid}"
-            summoner_data = await self._make_request(summoner_url)
+            # Profil et rangs ne dépendent que du PUUID : requêtes en parallèle
+            summoner_data, rank_data = await asyncio.gather(
+                self.get_summoner(puuid, platform),
+                self.get_league_entries(puuid, platform)
+            )
             
             if not summoner_data:
                 logger.error(f"Données summoner non trouvées pour {game_name}#{tag_line}")
                 return None
-
-            # Récupérer les infos de rang
-            rank_url = f"{self.base_urls['euw1']}/lol/league/v4/entries/by-summoner/{summoner_data['id']}"
-            rank_data = await self._make_request(rank_url)
             
             # Préparer les données de rang
             ranks = {}
@@ -345,11 +606,12 @@ class RiotAPI:
 
             # Construire la réponse
             account_info = {
-                'summonerId': summoner_data['id'],
+                'summonerId': summoner_data.get('id'),
                 'accountId': summoner_data.get('accountId'),
                 'puuid': puuid,
                 'name': game_name,
                 'tag_line': tag_line,
+                'region': platform,
                 'profileIconId': summoner_data['profileIconId'],
                 'summonerLevel': summoner_data['summonerLevel'],
                 'ranks': ranks
@@ -358,13 +620,17 @@ class RiotAPI:
             logger.info(f"Informations du compte récupérées pour {game_name}#{tag_line}")
             return account_info
 
+        except (CircuitOpen, RiotUnavailable):
+            # Riot indisponible : à distinguer d'un compte introuvable
+            raise
         except Exception as e:
             logger.error(f"Erreur lors de la récupération des informations du compte: {e}")
             logger.exception(e)  # Pour voir la stack trace complète
             return None
 
     async def cleanup(self):
-        """Nettoie les ressources"""
+        """Nettoie les ressources (ferme la session et son pool de connexions)"""
         if self.session:
             await self.session.close()
-            self.session = None
\ No newline at end of file
+            self.session = None
+            self.connector = None
@@ -0,0 +1,116 @@
+# tilttracker/modules/services.py
+import logging
+import os
+from typing import Optional
+from tilttracker.utils.cache import TTLCache
+from tilttracker.utils.database import Database
+from tilttracker.utils.load_shedder import LoadShedder
+from tilttracker.modules.riot_api import RiotAPI
+from tilttracker.modules.discord_publisher import DiscordPublisher
+from tilttracker.modules.publish_routing import PublishRouter
+from tilttracker.modules.chart_renderer import ChartRenderer
+from tilttracker.modules.puuid_resolver import PuuidResolver
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceContainer:
+    """
+    Services partagés par tout le processus (bot, watcher, outbox).
+
+    Chaque service est créé une seule fois, au premier accès : une seule
+    connexion PostgreSQL, une seule session aiohttp vers Riot et donc un
+    seul budget de limites de taux, un seul publisher Discord.
+    """
+
+    def __init__(self, riot_api_key: Optional[str] = None):
+        self.riot_api_key = riot_api_key
+        self._db: Optional[Database] = None
+        self._riot_api: Optional[RiotAPI] = None
+        self._discord_publisher: Optional[DiscordPublisher] = None
+        self._publish_router: Optional[PublishRouter] = None
+        self._command_cache: Optional[TTLCache] = None
+        self._chart_renderer: Optional[ChartRenderer] = None
+        self._load_shedder: Optional[LoadShedder] = None
+        self._puuid_resolver: Optional[PuuidResolver] = None
+
+    @property
+    def db(self) -> Database:
+        if self._db is None:
+            self._db = Database()
+        return self._db
+
+    @property
+    def riot_api(self) -> RiotAPI:
+        if self._riot_api is None:
+            self._riot_api = RiotAPI(self.riot_api_key)
+        return self._riot_api
+
+    @property
+    def discord_publisher(self) -> DiscordPublisher:
+        if self._discord_publisher is None:
+            self._discord_publisher = DiscordPublisher()
+        return self._discord_publisher
+
+    @property
+    def publish_router(self) -> PublishRouter:
+        if self._publish_router is None:
+            self._publish_router = PublishRouter(self.db, self.discord_publisher.webhook_url)
+        return self._publish_router
+
+    @property
+    def command_cache(self) -> TTLCache:
+        """Cache des résultats des commandes, invalidé par le watcher"""
+        if self._command_cache is None:
+            self._command_cache = TTLCache(float(os.getenv('COMMAND_CACHE_TTL', '30')))
+        return self._command_cache
+
+    @property
+    def chart_renderer(self) -> ChartRenderer:
+        if self._chart_renderer is None:
+            self._chart_renderer = ChartRenderer()
+        return self._chart_renderer
+
+    @property
+    def load_shedder(self) -> LoadShedder:
+        """Arbitre entre commandes lourdes du bot et ingestion du watcher"""
+        if self._load_shedder is None:
+            self._load_shedder = LoadShedder()
+        return self._load_shedder
+
+    @property
+    def puuid_resolver(self) -> PuuidResolver:
+        if self._puuid_resolver is None:
+            self._puuid_resolver = PuuidResolver(self.db, self.riot_api)
+        return self._puuid_resolver
+
+    async def close(self) -> None:
+        """Ferme les services créés, dans l'ordre inverse des dépendances"""
+        if self._chart_renderer is not None:
+            self._chart_renderer.close()
+        if self._discord_publisher is not None:
+            # Envoyer les publications Discord encore en file
+            try:
+                await self._discord_publisher.close()
+            except Exception as e:
+                logger.error(f"Erreur lors de la fermeture du publisher Discord: {e}")
+        if self._riot_api is not None:
+            try:
+                await self._riot_api.cleanup()
+            except Exception as e:
+                logger.error(f"Erreur lors de la fermeture de la session Riot: {e}")
+        if self._db is not None:
+            try:
+                self._db.close()
+            except Exception as e:
+                logger.error(f"Erreur lors de la fermeture de la base de données: {e}")
+        self._discord_publisher = self._riot_api = self._db = self._publish_router = None
+        self._puuid_resolver = None
+        self._chart_renderer = None
+        logger.info("Services arrêtés")
+
+    async def __aenter__(self) -> 'ServiceContainer':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
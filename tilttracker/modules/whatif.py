@@ -0,0 +1,216 @@
+# tilttracker/modules/whatif.py
+import argparse
+import json
+import logging
+import sys
+import time
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from tilttracker.utils.database import Database
+from game_data.calc_classe.batch_scorer import BatchScorer
+from game_data.calc_classe.calculator_factory import CalculatorFactory
+from game_data.calc_classe.champion_class_config import ChampionClass, WeightSet
+
+logger = logging.getLogger(__name__)
+
+PARTICIPANT_COLUMNS = [
+    'match_id', 'team_id', 'champion_id', 'win', 'kills', 'assists', 'team_kills',
+    'total_damage_dealt_to_champions', 'total_damage_taken', 'damage_self_mitigated',
+    'total_time_crowd_control_dealt', 'vision_score', 'player_id'
+]
+
+HISTORY_COLUMNS = ['player_id', 'match_id', 'win', 'rank_in_team', 'score']
+
+
+def _load_columns(batches: Iterable[List[tuple]], names: List[str]) -> Dict[str, np.ndarray]:
+    """Convertit des lots de lignes en un tableau numpy par colonne"""
+    chunks = [np.array(rows, dtype=np.int64) for rows in batches]
+    if chunks:
+        data = np.concatenate(chunks)
+    else:
+        data = np.empty((0, len(names)), dtype=np.int64)
+    return {name: data[:, i] for i, name in enumerate(names)}
+
+
+def _tank_lookup(factory: CalculatorFactory) -> np.ndarray:
+    """Tableau indexé par ID de champion : True si le champion est un TANK"""
+    keys = [int(champ['key']) for champ in factory.champions_data.values()]
+    lookup = np.zeros(max(keys) + 1, dtype=bool)
+    for key in keys:
+        lookup[key] = factory.get_champion_class_type(str(key)) == ChampionClass.TANK
+    return lookup
+
+
+def _ranking(totals: np.ndarray, player_ids: np.ndarray) -> np.ndarray:
+    """Position (1 = premier) de chaque joueur selon son total de points"""
+    order = np.lexsort((player_ids, -totals))
+    positions = np.empty(len(order), dtype=np.int64)
+    positions[order] = np.arange(1, len(order) + 1)
+    return positions
+
+
+def _distribution(points: np.ndarray, totals: np.ndarray) -> Dict:
+    """Distribution des points par partie et des totaux par joueur"""
+    values, counts = np.unique(points, return_counts=True)
+    return {
+        'points_per_game': {str(int(v)): int(c) for v, c in zip(values, counts)},
+        'mean_points_per_game': float(points.mean()) if len(points) else 0.0,
+        'total_percentiles': {
+            f"p{q}": float(np.percentile(totals, q)) if len(totals) else 0.0
+            for q in (10, 25, 50, 75, 90)
+        },
+    }
+
+
+def simulate(db: Database, weight_set: WeightSet, factory: Optional[CalculatorFactory] = None,
+             batch_size: int = 50000, top: Optional[int] = None) -> Dict:
+    """
+    Rejoue tout l'historique avec un autre jeu de pondérations, en mémoire.
+    Rien n'est écrit en base.
+
+    Les parties dont les 10 participants sont stockés sont entièrement
+    rescorées (nouveau rang dans l'équipe). Pour les parties plus anciennes,
+    le rang enregistré est conservé et seule la nouvelle table de points
+    est appliquée.
+
+    Returns:
+        Classement simulé, écarts de rang par joueur et distribution des scores
+    """
+    start = time.perf_counter()
+    factory = factory or CalculatorFactory()
+    scorer = BatchScorer(weight_set)
+
+    # 1. Rescorer tous les participants stockés
+    participants = _load_columns(db.iter_match_participant_columns(batch_size), PARTICIPANT_COLUMNS)
+    history = _load_columns(db.iter_player_match_columns(batch_size), HISTORY_COLUMNS)
+    load_time = time.perf_counter() - start
+
+    tank_lookup = _tank_lookup(factory)
+    champion_ids = participants['champion_id']
+    known = champion_ids < len(tank_lookup)
+    participants['is_tank'] = known & tank_lookup[np.where(known, champion_ids, 0)]
+    scores = scorer.performance_scores(participants)
+    groups = participants['match_id'] * 2 + (participants['team_id'] != 100)
+    ranks = scorer.rank_in_groups(groups, scores)
+
+    # 2. Associer les nouveaux rangs aux performances enregistrées
+    max_player = max(int(history['player_id'].max(initial=0)), int(participants['player_id'].max(initial=0))) + 1
+    registered = participants['player_id'] >= 0
+    simulated_keys = participants['match_id'][registered] * max_player + participants['player_id'][registered]
+    simulated_ranks = ranks[registered]
+    key_order = np.argsort(simulated_keys)
+    simulated_keys = simulated_keys[key_order]
+    simulated_ranks = simulated_ranks[key_order]
+
+    history_keys = history['match_id'] * max_player + history['player_id']
+    if len(simulated_keys):
+        positions = np.minimum(np.searchsorted(simulated_keys, history_keys), len(simulated_keys) - 1)
+        rescored = simulated_keys[positions] == history_keys
+        new_ranks = np.where(rescored, simulated_ranks[positions], history['rank_in_team'])
+    else:
+        rescored = np.zeros(len(history_keys), dtype=bool)
+        new_ranks = history['rank_in_team']
+
+    # Sans rang connu, le score enregistré est conservé
+    new_points = np.where(
+        new_ranks > 0,
+        scorer.points(new_ranks, history['win']),
+        history['score']
+    )
+
+    # 3. Classements avant / après
+    player_ids = np.unique(history['player_id'])
+    index = np.searchsorted(player_ids, history['player_id'])
+    old_totals = np.bincount(index, weights=history['score'], minlength=len(player_ids))
+    new_totals = np.bincount(index, weights=new_points, minlength=len(player_ids))
+    games = np.bincount(index, minlength=len(player_ids))
+    old_positions = _ranking(old_totals, player_ids)
+    new_positions = _ranking(new_totals, player_ids)
+
+    names = db.get_player_names()
+    leaderboard = sorted((
+        {
+            'player_id': int(player_id),
+            'name': names.get(int(player_id), str(player_id)),
+            'games': int(games[i]),
+            'old_total': int(old_totals[i]),
+            'new_total': int(new_totals[i]),
+            'old_rank': int(old_positions[i]),
+            'new_rank': int(new_positions[i]),
+            'rank_delta': int(old_positions[i] - new_positions[i]),
+        }
+        for i, player_id in enumerate(player_ids)
+    ), key=lambda entry: entry['new_rank'])
+
+    duration = time.perf_counter() - start
+    logger.info(f"Simulation terminée: {len(history['score'])} performances "
+                f"({int(rescored.sum())} rescorées) en {duration:.2f}s (chargement {load_time:.2f}s)")
+
+    return {
+        'weight_set': weight_set.to_dict(),
+        'performances': int(len(history['score'])),
+        'rescored_performances': int(rescored.sum()),
+        'participants_scored': int(len(scores)),
+        'leaderboard': leaderboard[:top] if top else leaderboard,
+        'rank_changes': {entry['name']: entry['rank_delta'] for entry in leaderboard if entry['rank_delta']},
+        'distribution': {
+            'current': _distribution(history['score'], old_totals),
+            'simulated': _distribution(new_points, new_totals),
+        },
+        'duration_seconds': round(duration, 3),
+    }
+
+
+def run_simulation(weights: Dict, top: Optional[int] = None, batch_size: int = 50000) -> Dict:
+    """
+    Lance une simulation avec sa propre connexion à la base.
+
+    Raises:
+        ValueError si le jeu de pondérations est invalide
+    """
+    weight_set = WeightSet.from_dict(weights)
+    db = Database()
+    try:
+        return simulate(db, weight_set, batch_size=batch_size, top=top)
+    finally:
+        db.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Simule le classement avec d'autres pondérations")
+    parser.add_argument('weights', help="Fichier JSON du jeu de pondérations à tester")
+    parser.add_argument('--top', type=int, help="Nombre de joueurs affichés")
+    parser.add_argument('--batch-size', type=int, default=50000)
+    parser.add_argument('--output', help="Fichier JSON où écrire le résultat complet")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    with open(args.weights, 'r', encoding='utf-8') as f:
+        weights = json.load(f)
+
+    try:
+        result = run_simulation(weights, top=args.top, batch_size=args.batch_size)
+    except ValueError as e:
+        logger.error(f"Jeu de pondérations invalide: {e}")
+        return 1
+
+    logger.info("=== Classement simulé ===")
+    for entry in result['leaderboard']:
+        delta = entry['rank_delta']
+        delta_str = f"+{delta}" if delta > 0 else str(delta) if delta else "="
+        logger.info(f"{entry['new_rank']:>3}. {entry['name']} - {entry['new_total']} pts "
+                    f"(actuel: {entry['old_total']} pts, #{entry['old_rank']}, {delta_str})")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        logger.info(f"Résultat écrit dans {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+# tilttracker/utils/cache.py
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+from tilttracker.utils.metrics import REGISTRY
+
+
+class TTLCache:
+    """
+    Cache de résultats à durée de vie courte, par espace de noms (une commande,
+    un type de requête) et arguments.
+
+    Les appels identiques concurrents partagent un seul chargement (si son
+    appelant est annulé, un appel en attente prend le relais). Chaque
+    entrée porte des tags (joueur, classement) permettant de l'invalider
+    explicitement quand les données changent ; un chargement en cours pendant
+    une invalidation n'est pas mis en cache, pas plus qu'un résultat None.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 1024, clock=time.monotonic, name: str = 'commands'):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: 'OrderedDict[Tuple, Tuple[float, Any, Tuple[Hashable, ...]]]' = OrderedDict()
+        self._tags: Dict[Hashable, Set[Tuple]] = {}
+        self._pending: Dict[Tuple, asyncio.Future] = {}
+        self._generation = 0
+
+    def _count(self, namespace: str, result: str):
+        REGISTRY.counter('cache_requests_total', "Requêtes aux caches en mémoire",
+                         cache=self.name, namespace=namespace, result=result).inc()
+
+    def _drop(self, key: Tuple):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def _store(self, key: Tuple, value: Any, tags: Tuple[Hashable, ...], ttl: float):
+        self._drop(key)
+        self._entries[key] = (self.clock() + ttl, value, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    async def get_or_load(self, namespace: str, args: Tuple, loader: Callable[[], Awaitable[Any]],
+                          tags: Iterable[Hashable] = (), ttl: Optional[float] = None) -> Any:
+        """
+        Résultat en cache s'il est encore valide, sinon appelle loader().
+        ttl remplace la durée de vie par défaut pour cette entrée.
+        """
+        key = (namespace,) + tuple(args)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > self.clock():
+                self._entries.move_to_end(key)
+                self._count(namespace, 'hit')
+                return entry[1]
+            self._drop(key)
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            self._count(namespace, 'hit')
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # Chargement partagé annulé (et non cet appel) : en relancer un
+                return await self.get_or_load(namespace, args, loader, tags, ttl)
+
+        self._count(namespace, 'miss')
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        generation = self._generation
+        try:
+            value = await loader()
+        except Exception as e:
+            future.set_exception(e)
+            # Évite l'avertissement « exception never retrieved » sans attente concurrente
+            future.exception()
+            raise
+        else:
+            if value is not None and generation == self._generation:
+                self._store(key, value, tuple(tags), self.ttl if ttl is None else ttl)
+            future.set_result(value)
+            return value
+        finally:
+            self._pending.pop(key, None)
+            if not future.done():
+                # Chargement annulé : les appels en attente ne restent pas bloqués
+                future.cancel()
+
+    def invalidate(self, *tags: Hashable) -> int:
+        """Supprime les entrées portant l'un des tags, retourne leur nombre"""
+        self._generation += 1
+        keys = set()
+        for tag in tags:
+            keys |= self._tags.get(tag, set())
+        for key in keys:
+            self._drop(key)
+        return len(keys)
+
+    def clear(self):
+        self._generation += 1
+        self._entries.clear()
+        self._tags.clear()
+
+    def hit_rates(self) -> Dict[str, float]:
+        """Taux de succès par espace de noms depuis le démarrage"""
+        counts: Dict[str, Dict[str, float]] = {}
+        for entry in REGISTRY.snapshot().get('cache_requests_total', []):
+            labels = entry['labels']
+            if labels['cache'] == self.name:
+                counts.setdefault(labels['namespace'], {})[labels['result']] = entry['value']
+        return {
+            namespace: values.get('hit', 0) / (values.get('hit', 0) + values.get('miss', 0))
+            for namespace, values in counts.items()
+            if values.get('hit', 0) + values.get('miss', 0)
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Tags d'invalidation des commandes du bot
+RANKING_TAG = 'ranking'
+
+
+def player_tag(summoner_name: str, tag_line: str) -> Tuple[str, str, str]:
+    """Tag des résultats propres à un joueur"""
+    return ('player', summoner_name, tag_line)
@@ -0,0 +1,114 @@
+# tilttracker/utils/circuit_breaker.py
+import logging
+import random
+import time
+from typing import Dict, Optional
+from tilttracker.utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# États d'un disjoncteur (valeur de la jauge entre parenthèses)
+CLOSED = 'closed'        # (0) les requêtes passent
+HALF_OPEN = 'half_open'  # (1) une requête de test est en cours
+OPEN = 'open'            # (2) les requêtes échouent immédiatement
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpen(Exception):
+    """Requête refusée sans appel réseau : le service est considéré dégradé"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit {name} ouvert, nouvel essai dans {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur d'un point d'accès.
+
+    Après `failure_threshold` échecs consécutifs, le circuit s'ouvre : les
+    requêtes échouent immédiatement pendant `cooldown` secondes. Une seule
+    requête de test passe ensuite (semi-ouvert) ; son succès referme le
+    circuit, son échec le rouvre pour un nouveau délai. Une requête de test
+    qui ne se conclut pas (annulée, erreur inattendue) est remplacée par une
+    nouvelle après le même délai.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, cooldown: float = 30.0,
+                 clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started = 0.0
+        self.state_gauge = REGISTRY.gauge(
+            'riot_circuit_state', "État des disjoncteurs (0 fermé, 1 semi-ouvert, 2 ouvert)", endpoint=name)
+        self.state_gauge.set(_STATE_VALUES[CLOSED])
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            logger.warning(f"Circuit {self.name}: {self.state} -> {state}")
+            REGISTRY.counter('riot_circuit_transitions_total', "Changements d'état des disjoncteurs",
+                             endpoint=self.name, state=state).inc()
+        self.state = state
+        self.state_gauge.set(_STATE_VALUES[state])
+
+    def before_request(self) -> None:
+        """Laisse passer la requête ou lève CircuitOpen"""
+        if self.state == CLOSED:
+            return
+        now = self.clock()
+        started = self.opened_at if self.state == OPEN else self.probe_started
+        remaining = started + self.cooldown - now
+        if remaining <= 0:
+            # Délai écoulé (ou test précédent jamais conclu) : cette requête sert de test
+            self.probe_started = now
+            self._set_state(HALF_OPEN)
+            return
+        REGISTRY.counter('riot_circuit_rejections_total', "Requêtes refusées par un disjoncteur ouvert",
+                         endpoint=self.name).inc()
+        raise CircuitOpen(self.name, remaining)
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = self.clock()
+            self._set_state(OPEN)
+
+
+class CircuitBreakers:
+    """Disjoncteurs créés à la demande, un par point d'accès"""
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self.breakers.get(name)
+        if breaker is None:
+            breaker = self.breakers[name] = CircuitBreaker(
+                name, self.failure_threshold, self.cooldown, self.clock)
+        return breaker
+
+    def states(self) -> Dict[str, str]:
+        """État de chaque disjoncteur, pour la supervision"""
+        return {name: breaker.state for name, breaker in sorted(self.breakers.items())}
+
+
+def backoff_delay(attempt: int, base: float, cap: float, rng: Optional[random.Random] = None) -> float:
+    """
+    Délai avant la tentative suivante : exponentiel plafonné avec gigue
+    complète (tiré uniformément entre 0 et base * 2^attempt).
+    """
+    return (rng or random).uniform(0, min(cap, base * 2 ** attempt))
@@ -2,13 +2,125 @@ import os
 import logging
 from datetime import datetime
 import psycopg2
-from psycopg2.extras import DictCursor
+from psycopg2.extras import DictCursor, Json, execute_values
 from dotenv import load_dotenv
 import asyncpg
 
 # Configuration du logger
 logger = logging.getLogger(__name__)
 
+# Tables créées automatiquement au démarrage si elles n'existent pas
+SCHEMA_STATEMENTS = [
+    # Serveur Riot du joueur (euw1, na1, kr...) ; les inscrits existants sont sur EUW
+    "ALTER TABLE players ADD COLUMN IF NOT EXISTS region VARCHAR(8) NOT NULL DEFAULT 'euw1'",
+    """
+    CREATE TABLE IF NOT EXISTS champion_stat_baselines (
+        champion_id INTEGER NOT NULL,
+        stat VARCHAR(64) NOT NULL,
+        sample_count BIGINT NOT NULL DEFAULT 0,
+        digest BYTEA NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (champion_id, stat)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS champion_baseline_matches (
+        match_id VARCHAR(64) PRIMARY KEY,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS player_ratings (
+        player_id INTEGER PRIMARY KEY REFERENCES players(id) ON DELETE CASCADE,
+        rating DOUBLE PRECISION NOT NULL,
+        deviation DOUBLE PRECISION NOT NULL,
+        games INTEGER NOT NULL DEFAULT 0,
+        last_played_at TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_player_ratings_rating ON player_ratings (rating DESC)",
+    # Historique d'un joueur : parcours de ses seules lignes, du match le plus récent au plus ancien
+    "CREATE INDEX IF NOT EXISTS idx_player_matches_player_match ON player_matches (player_id, match_id DESC)",
+    """
+    CREATE TABLE IF NOT EXISTS match_participants (
+        match_id INTEGER NOT NULL REFERENCES matches(id) ON DELETE CASCADE,
+        puuid VARCHAR(100) NOT NULL,
+        champion_id INTEGER NOT NULL,
+        team_id SMALLINT NOT NULL,
+        win BOOLEAN NOT NULL,
+        kills SMALLINT NOT NULL,
+        deaths SMALLINT NOT NULL,
+        assists SMALLINT NOT NULL,
+        team_kills SMALLINT NOT NULL,
+        total_damage_dealt_to_champions INTEGER NOT NULL,
+        total_damage_taken INTEGER NOT NULL,
+        damage_self_mitigated INTEGER NOT NULL,
+        total_time_crowd_control_dealt INTEGER NOT NULL,
+        vision_score SMALLINT NOT NULL,
+        gold_earned INTEGER NOT NULL,
+        PRIMARY KEY (match_id, puuid)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS publish_outbox (
+        id BIGSERIAL PRIMARY KEY,
+        match_id INTEGER NOT NULL REFERENCES matches(id) ON DELETE CASCADE,
+        player_id INTEGER NOT NULL REFERENCES players(id) ON DELETE CASCADE,
+        channel VARCHAR(64) NOT NULL,
+        payload JSONB NOT NULL,
+        status VARCHAR(16) NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        next_attempt_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        claimed_at TIMESTAMP,
+        sent_at TIMESTAMP,
+        last_error TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (match_id, player_id, channel)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_publish_outbox_pending
+    ON publish_outbox (next_attempt_at) WHERE status IN ('pending', 'sending')
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS player_guilds (
+        player_id INTEGER NOT NULL REFERENCES players(id) ON DELETE CASCADE,
+        guild_id VARCHAR(32) NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (player_id, guild_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS publish_routes (
+        id SERIAL PRIMARY KEY,
+        name VARCHAR(64) NOT NULL UNIQUE,
+        webhook_url TEXT NOT NULL,
+        guild_id VARCHAR(32),
+        player_id INTEGER REFERENCES players(id) ON DELETE CASCADE,
+        enabled BOOLEAN NOT NULL DEFAULT TRUE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+]
+
+# Rating attribué aux joueurs sans historique (voir rating_engine)
+DEFAULT_RATING = 1500.0
+DEFAULT_DEVIATION = 350.0
+
+# Colonnes de tri autorisées pour le classement
+LEADERBOARD_ORDERS = {
+    'score': 'total_score DESC',
+    'rating': 'rating DESC',
+}
+
+# Statuts d'un message de la table publish_outbox
+OUTBOX_PENDING = 'pending'
+OUTBOX_SENDING = 'sending'
+OUTBOX_SENT = 'sent'
+OUTBOX_FAILED = 'failed'
+
 class Database:
     def __init__(self):
         load_dotenv()
@@ -24,6 +136,7 @@ class Database:
         
         self.connection = None
         self.connect()
+        self.ensure_schema()
 
     def connect(self):
         """Établit la connexion à la base de données."""
@@ -34,10 +147,28 @@ class Database:
             logger.error(f"Erreur lors de la connexion à la base de données: {e}")
             raise
 
-    async def register_player(self, discord_id: str, riot_puuid: str, summoner_name: str, tag_line: str) -> bool:
+    def ensure_schema(self):
+        """Crée les tables annexes manquantes."""
+        try:
+            with self.connection.cursor() as cursor:
+                for statement in SCHEMA_STATEMENTS:
+                    cursor.execute(statement)
+            self.connection.commit()
+            logger.info("Schéma de la base de données vérifié")
+        except psycopg2.Error as e:
+            self.connection.rollback()
+            logger.error(f"Erreur lors de la vérification du schéma: {e}")
+            raise
+
+    async def register_player(self, discord_id: str, riot_puuid: str, summoner_name: str, tag_line: str,
+                              guild_id: str = None, region: str = 'euw1') -> bool:
         """
         Enregistre un nouveau joueur dans la base de données.
         Version asynchrone qui utilise psycopg2 de manière synchrone.
+
+        Args:
+            guild_id: Serveur Discord où le joueur s'est inscrit (routage des publications)
+            region: Serveur Riot du compte (euw1, na1, kr...)
         """
         try:
             with self.connection.cursor() as cursor:
@@ -55,17 +186,26 @@ class Database:
                         UPDATE players 
                         SET riot_puuid = %s,
                             discord_id = %s,
+                            region = %s,
                             updated_at = CURRENT_TIMESTAMP
                         WHERE summoner_name = %s AND tag_line = %s
                         RETURNING id
-                    """, (riot_puuid, discord_id, summoner_name, tag_line))
+                    """, (riot_puuid, discord_id, region, summoner_name, tag_line))
                 else:
                     # Insertion d'un nouveau joueur
                     cursor.execute("""
-                        INSERT INTO players (discord_id, riot_puuid, summoner_name, tag_line)
-                        VALUES (%s, %s, %s, %s)
+                        INSERT INTO players (discord_id, riot_puuid, summoner_name, tag_line, region)
+                        VALUES (%s, %s, %s, %s, %s)
                         RETURNING id
-                    """, (discord_id, riot_puuid, summoner_name, tag_line))
+                    """, (discord_id, riot_puuid, summoner_name, tag_line, region))
+
+                player_id = cursor.fetchone()[0]
+                if guild_id:
+                    cursor.execute("""
+                        INSERT INTO player_guilds (player_id, guild_id)
+                        VALUES (%s, %s)
+                        ON CONFLICT DO NOTHING
+                    """, (player_id, guild_id))
                 
                 self.connection.commit()
                 logger.info(f"Joueur {summoner_name}#{tag_line} {'mis à jour' if existing_player else 'enregistré'} avec succès")
@@ -106,13 +246,66 @@ class Database:
             logger.error(f"Erreur lors du stockage de la partie: {e}")
             raise
 
-    async def store_player_performance(self, match_id: int, player_data: dict) -> bool:
+    async def get_match_played_at(self, match_id: int):
+        """Date d'une partie stockée (celle utilisée par le recalcul des ratings)"""
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("SELECT created_at FROM matches WHERE id = %s", (match_id,))
+                row = cursor.fetchone()
+                return row[0] if row else None
+        except Exception as e:
+            self.connection.rollback()
+            logger.error(f"Erreur lors de la récupération de la date du match {match_id}: {e}")
+            return None
+
+    async def store_match_participants(self, match_id: int, participants: list) -> bool:
+        """
+        Stocke les statistiques de tous les participants d'une partie.
+        Utilisées pour rejouer le scoring d'une partie (simulateur what-if).
+
+        Args:
+            match_id: ID du match dans la base de données
+            participants: Stats de chaque participant (format RiotAPI)
+        """
+        try:
+            with self.connection.cursor() as cursor:
+                execute_values(cursor, """
+                    INSERT INTO match_participants (
+                        match_id, puuid, champion_id, team_id, win,
+                        kills, deaths, assists, team_kills,
+                        total_damage_dealt_to_champions, total_damage_taken,
+                        damage_self_mitigated, total_time_crowd_control_dealt,
+                        vision_score, gold_earned
+                    ) VALUES %s
+                    ON CONFLICT (match_id, puuid) DO NOTHING
+                """, [(
+                    match_id, p['puuid'], p['champion_id'], p['team_id'], p['win'],
+                    p['kills'], p['deaths'], p['assists'], p['team_kills'],
+                    p['total_damage_dealt_to_champions'], p['total_damage_taken'],
+                    p['damage_self_mitigated'], p['total_time_crowd_control_dealt'],
+                    p['vision_score'], p['gold_earned']
+                ) for p in participants])
+
+            self.connection.commit()
+            return True
+
+        except Exception as e:
+            self.connection.rollback()
+            logger.error(f"Erreur lors du stockage des participants du match {match_id}: {e}")
+            return False
+
+    async def store_player_performance(self, match_id: int, player_data: dict, rating: dict = None,
+                                       outbox: list = None) -> bool:
         """
         Stocke les performances d'un joueur pour un match donné.
         
         Args:
             match_id: ID du match dans la base de données
             player_data: Données du joueur incluant le rang dans l'équipe
+            rating: Nouveau rating du joueur (rating, deviation, games, last_played_at),
+                enregistré dans la même transaction que la performance
+            outbox: Messages à publier [(channel, payload)], mis en file dans la
+                même transaction pour ne jamais perdre une publication
         """
         try:
             logger.info(f"Enregistrement des performances pour le match {match_id}")
@@ -135,6 +328,17 @@ class Database:
                         %(rank_in_team)s  -- Nouveau champ
                     )
                 """, player_data)
+
+                if rating:
+                    self._upsert_player_rating(cursor, player_data['player_id'], rating)
+
+                if outbox:
+                    execute_values(cursor, """
+                        INSERT INTO publish_outbox (match_id, player_id, channel, payload)
+                        VALUES %s
+                        ON CONFLICT (match_id, player_id, channel) DO NOTHING
+                    """, [(match_id, player_data['player_id'], channel, Json(payload))
+                          for channel, payload in outbox])
                 
                 self.connection.commit()
                 logger.info(f"Performance du joueur stockée avec succès pour le match {match_id}")
@@ -145,8 +349,209 @@ class Database:
             logger.error(f"Erreur lors du stockage des performances du joueur: {e}")
             return False
 
-    async def get_player_stats(self, game_name: str, tag_line: str) -> dict:
-        """Récupère les statistiques et l'historique des parties d'un joueur"""
+    def _upsert_player_rating(self, cursor, player_id: int, rating: dict):
+        """Met à jour le rating d'un joueur dans la transaction en cours"""
+        cursor.execute("""
+            INSERT INTO player_ratings (player_id, rating, deviation, games, last_played_at)
+            VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT (player_id) DO UPDATE
+            SET rating = EXCLUDED.rating,
+                deviation = EXCLUDED.deviation,
+                games = EXCLUDED.games,
+                last_played_at = EXCLUDED.last_played_at,
+                updated_at = CURRENT_TIMESTAMP
+        """, (player_id, rating['rating'], rating['deviation'], rating['games'], rating['last_played_at']))
+
+    async def get_ratings_by_puuid(self, puuids: list) -> dict:
+        """
+        Récupère les ratings des joueurs inscrits parmi une liste de PUUID.
+
+        Returns:
+            Dictionnaire {puuid: {rating, deviation, games, last_played_at}}
+        """
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("""
+                    SELECT p.riot_puuid, r.rating, r.deviation, r.games, r.last_played_at
+                    FROM player_ratings r
+                    JOIN players p ON p.id = r.player_id
+                    WHERE p.riot_puuid = ANY(%s)
+                """, (list(puuids),))
+
+                return {
+                    row[0]: {
+                        'rating': row[1],
+                        'deviation': row[2],
+                        'games': row[3],
+                        'last_played_at': row[4]
+                    }
+                    for row in cursor.fetchall()
+                }
+
+        except Exception as e:
+            logger.error(f"Erreur lors de la récupération des ratings: {e}")
+            return {}
+
+    def iter_rating_history(self, batch_size: int = 5000):
+        """
+        Parcourt l'historique des performances dans l'ordre chronologique,
+        par lots, via un curseur serveur.
+        """
+        with self.connection.cursor(name='rating_history') as cursor:
+            cursor.itersize = batch_size
+            cursor.execute("""
+                SELECT pm.player_id, m.id, pm.team_id, pm.win, pm.rank_in_team, m.created_at
+                FROM player_matches pm
+                JOIN matches m ON m.id = pm.match_id
+                ORDER BY m.created_at ASC, m.id ASC, pm.id ASC
+            """)
+            for row in cursor:
+                yield {
+                    'player_id': row[0],
+                    'match_id': row[1],
+                    'team_id': row[2],
+                    'win': row[3],
+                    'rank_in_team': row[4],
+                    'played_at': row[5]
+                }
+        self.connection.commit()
+
+    def iter_match_participant_columns(self, batch_size: int = 50000):
+        """
+        Parcourt les participants stockés par lots de tuples numériques
+        (match_id, team_id, champion_id, win, kills, assists, team_kills,
+        dégâts, dégâts subis, dégâts mitigés, CC, vision, player_id ou -1).
+        """
+        with self.connection.cursor(name='whatif_participants') as cursor:
+            cursor.itersize = batch_size
+            cursor.execute("""
+                SELECT
+                    mp.match_id, mp.team_id, mp.champion_id, mp.win::int,
+                    mp.kills, mp.assists, mp.team_kills,
+                    mp.total_damage_dealt_to_champions, mp.total_damage_taken,
+                    mp.damage_self_mitigated, mp.total_time_crowd_control_dealt,
+                    mp.vision_score, COALESCE(p.id, -1)
+                FROM match_participants mp
+                LEFT JOIN players p ON p.riot_puuid = mp.puuid
+            """)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        self.connection.commit()
+
+    def iter_player_match_columns(self, batch_size: int = 50000):
+        """
+        Parcourt les performances enregistrées par lots de tuples
+        (player_id, match_id, win, rank_in_team ou 0, score).
+        """
+        with self.connection.cursor(name='whatif_player_matches') as cursor:
+            cursor.itersize = batch_size
+            cursor.execute("""
+                SELECT player_id, match_id, win::int, COALESCE(rank_in_team, 0), score
+                FROM player_matches
+            """)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        self.connection.commit()
+
+    def get_player_names(self) -> dict:
+        """Retourne {player_id: 'nom#tag'} pour tous les joueurs inscrits"""
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("SELECT id, summoner_name, tag_line FROM players")
+                return {row[0]: f"{row[1]}#{row[2]}" for row in cursor.fetchall()}
+        except Exception as e:
+            logger.error(f"Erreur lors de la récupération des noms des joueurs: {e}")
+            return {}
+
+    async def get_registered_riot_ids(self) -> list:
+        """Retourne les (summoner_name, tag_line) de tous les joueurs inscrits"""
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("SELECT summoner_name, tag_line FROM players")
+                return [(row[0], row[1]) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Erreur lors de la récupération des Riot ID: {e}")
+            return []
+
+    async def get_puuid_by_riot_id(self, summoner_name: str, tag_line: str) -> str:
+        """PUUID enregistré pour un Riot ID (insensible à la casse), None si inconnu"""
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("""
+                    SELECT riot_puuid FROM players
+                    WHERE LOWER(summoner_name) = LOWER(%s) AND LOWER(tag_line) = LOWER(%s)
+                    AND riot_puuid IS NOT NULL
+                    LIMIT 1
+                """, (summoner_name, tag_line))
+                row = cursor.fetchone()
+                return row[0] if row else None
+        except Exception as e:
+            self.connection.rollback()
+            logger.error(f"Erreur lors de la recherche du PUUID de {summoner_name}#{tag_line}: {e}")
+            return None
+
+    async def update_player_riot_id(self, riot_puuid: str, summoner_name: str, tag_line: str) -> bool:
+        """Met à jour le Riot ID d'un joueur après un renommage"""
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("""
+                    UPDATE players
+                    SET summoner_name = %s,
+                        tag_line = %s,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE riot_puuid = %s
+                """, (summoner_name, tag_line, riot_puuid))
+            self.connection.commit()
+            return True
+        except Exception as e:
+            self.connection.rollback()
+            logger.error(f"Erreur lors du renommage du joueur {riot_puuid}: {e}")
+            return False
+
+    async def replace_player_ratings(self, ratings: dict, batch_size: int = 5000) -> bool:
+        """
+        Remplace tous les ratings en une seule transaction.
+
+        Args:
+            ratings: Dictionnaire {player_id: rating} (objets avec rating, deviation,
+                games et last_played_at)
+        """
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("DELETE FROM player_ratings")
+                execute_values(cursor, """
+                    INSERT INTO player_ratings (player_id, rating, deviation, games, last_played_at)
+                    VALUES %s
+                """, [
+                    (player_id, r.rating, r.deviation, r.games, r.last_played_at)
+                    for player_id, r in ratings.items()
+                ], page_size=batch_size)
+
+            self.connection.commit()
+            logger.info(f"{len(ratings)} ratings enregistrés")
+            return True
+
+        except Exception as e:
+            self.connection.rollback()
+            logger.error(f"Erreur lors du remplacement des ratings: {e}")
+            return False
+
+    async def get_player_stats(self, game_name: str, tag_line: str, order_by: str = 'score',
+                               include_history: bool = True) -> dict:
+        """
+        Récupère les statistiques et l'historique des parties d'un joueur
+        
+        Args:
+            order_by: Critère du classement renvoyé dans 'rank' ('score' ou 'rating')
+            include_history: Ajoute toutes les parties dans 'match_history' (page web) ;
+                le bot pagine l'historique à part (get_player_history_page)
+        """
         try:
             logger.info(f"Début de la récupération des stats pour {game_name}#{tag_line}")
             
@@ -191,6 +596,64 @@ class Database:
                     'avg_assists', 'avg_score', 'best_score', 'total_score'
                 ], stats_row))
 
+                # Champs dérivés attendus par /stats
+                total_games = stats['total_games'] or 0
+                wins = stats['wins'] or 0
+                stats['losses'] = total_games - wins
+                stats['winrate'] = (wins / total_games * 100) if total_games else 0
+                stats['kda_ratio'] = (
+                    float((stats['avg_kills'] or 0) + (stats['avg_assists'] or 0))
+                    / max(float(stats['avg_deaths'] or 0), 1)
+                )
+
+                # Rating et classement selon le critère demandé
+                cursor.execute("""
+                    SELECT rating, deviation
+                    FROM player_ratings
+                    WHERE player_id = %s
+                """, (player_id,))
+                rating_row = cursor.fetchone()
+                stats['rating'] = rating_row[0] if rating_row else None
+                stats['rating_deviation'] = rating_row[1] if rating_row else None
+
+                if order_by == 'rating':
+                    cursor.execute("""
+                        SELECT rank FROM (
+                            SELECT player_id, RANK() OVER (ORDER BY rating DESC) AS rank
+                            FROM player_ratings
+                        ) ranked
+                        WHERE player_id = %s
+                    """, (player_id,))
+                else:
+                    cursor.execute("""
+                        SELECT rank FROM (
+                            SELECT player_id, RANK() OVER (ORDER BY SUM(score) DESC) AS rank
+                            FROM player_matches
+                            GROUP BY player_id
+                        ) ranked
+                        WHERE player_id = %s
+                    """, (player_id,))
+                rank_row = cursor.fetchone()
+                stats['rank'] = rank_row[0] if rank_row else '-'
+
+                cursor.execute("""
+                    SELECT champion_name,
+                           COUNT(*) AS games,
+                           AVG(CASE WHEN win THEN 100.0 ELSE 0 END) AS winrate
+                    FROM player_matches
+                    WHERE player_id = %s
+                    GROUP BY champion_name
+                    ORDER BY games DESC
+                    LIMIT 3
+                """, (player_id,))
+                stats['top_champions'] = [
+                    {'champion_name': row[0], 'games': row[1], 'winrate': float(row[2])}
+                    for row in cursor.fetchall()
+                ]
+
+                if not include_history:
+                    return stats
+
                 logger.info("Récupération des parties récentes...")
                 # Récupérer l'historique
                 cursor.execute("""
@@ -238,24 +701,37 @@ class Database:
             logger.exception(e)
             return None
 
-    async def get_leaderboard(self, limit: int = 10) -> list:
-        """Récupère le classement des meilleurs joueurs"""
+    async def get_leaderboard(self, limit: int = 10, order_by: str = 'score') -> list:
+        """
+        Récupère le classement des meilleurs joueurs
+        
+        Args:
+            limit: Nombre de joueurs
+            order_by: 'score' (somme des points) ou 'rating' (rating de compétence)
+        """
         try:
+            order_clause = LEADERBOARD_ORDERS.get(order_by)
+            if not order_clause:
+                raise ValueError(f"Critère de classement inconnu: {order_by}")
+
             with self.connection.cursor() as cursor:
-                cursor.execute("""
+                cursor.execute(f"""
                     SELECT 
                         p.summoner_name,
                         p.tag_line,
                         COUNT(*) as total_games,
                         SUM(CASE WHEN win THEN 1 ELSE 0 END) as wins,
                         SUM(score) as total_score,
-                        AVG(score) as avg_score
+                        AVG(score) as avg_score,
+                        COALESCE(r.rating, %s) as rating,
+                        COALESCE(r.deviation, %s) as rating_deviation
                     FROM player_matches pm
                     JOIN players p ON p.id = pm.player_id
-                    GROUP BY p.id, p.summoner_name, p.tag_line
-                    ORDER BY total_score DESC
+                    LEFT JOIN player_ratings r ON r.player_id = p.id
+                    GROUP BY p.id, p.summoner_name, p.tag_line, r.rating, r.deviation
+                    ORDER BY {order_clause}
                     LIMIT %s
-                """, (limit,))
+                """, (DEFAULT_RATING, DEFAULT_DEVIATION, limit))
                 
                 players = [dict(zip([column[0] for column in cursor.description], row))
                           for row in cursor.fetchall()]
@@ -285,7 +761,7 @@ class Database:
                     JOIN matches m ON m.id = pm.match_id
                     WHERE p.summoner_name = %s 
                     AND p.tag_line = %s
-                    ORDER BY m.created_at DESC, m.id DESC
+                    ORDER BY pm.match_id DESC
                     LIMIT 1
                 """, (game_name, tag_line))
                 
@@ -363,7 +839,8 @@ class Database:
                         m.created_at,
                         pm.kills,
                         pm.deaths,
-                        pm.assists
+                        pm.assists,
+                        m.match_id
                     FROM player_matches pm
                     JOIN players p ON p.id = pm.player_id
                     JOIN matches m ON m.id = pm.match_id
@@ -378,7 +855,8 @@ class Database:
                         'champion': row[1],
                         'win': row[2],
                         'date': row[3].strftime('%Y-%m-%d %H:%M'),
-                        'kda': f"{row[4]}/{row[5]}/{row[6]}"
+                        'kda': f"{row[4]}/{row[5]}/{row[6]}",
+                        'match_id': row[7]
                     }
                     for row in cursor.fetchall()
                 ]
@@ -389,6 +867,319 @@ class Database:
             logger.error(f"Erreur lors de la récupération de l'historique pour {game_name}#{tag_line}: {e}")
             return []
 
+    async def get_player_history_page(self, game_name: str, tag_line: str,
+                                      before: int = None, limit: int = 10) -> list:
+        """
+        Page de l'historique d'un joueur, des parties les plus récentes aux plus
+        anciennes, par pagination par curseur.
+
+        Les ids de matches croissent avec leur date d'insertion : l'index
+        (player_id, match_id) sert directement la page, sans parcourir les
+        parties des autres joueurs.
+
+        Args:
+            before: Curseur (id de la partie) de la dernière ligne de la page précédente
+            limit: Nombre de parties à retourner
+
+        Returns:
+            Liste de parties, chacune avec son curseur
+        """
+        try:
+            with self.connection.cursor() as cursor:
+                keyset = "AND pm.match_id < %s" if before is not None else ""
+                cursor.execute(f"""
+                    SELECT
+                        m.created_at,
+                        m.id,
+                        m.match_id,
+                        pm.score,
+                        pm.champion_name,
+                        pm.win,
+                        pm.kills,
+                        pm.deaths,
+                        pm.assists
+                    FROM player_matches pm
+                    JOIN players p ON p.id = pm.player_id
+                    JOIN matches m ON m.id = pm.match_id
+                    WHERE p.summoner_name = %s
+                    AND p.tag_line = %s
+                    {keyset}
+                    ORDER BY pm.match_id DESC
+                    LIMIT %s
+                """, (game_name, tag_line, *(() if before is None else (before,)), limit))
+
+                return [
+                    {
+                        'cursor': row[1],
+                        'match_id': row[2],
+                        'score': row[3],
+                        'champion': row[4],
+                        'win': row[5],
+                        'date': row[0].strftime('%Y-%m-%d %H:%M'),
+                        'kda': f"{row[6]}/{row[7]}/{row[8]}"
+                    }
+                    for row in cursor.fetchall()
+                ]
+
+        except Exception as e:
+            self.connection.rollback()
+            logger.error(f"Erreur lors de la récupération de l'historique pour {game_name}#{tag_line}: {e}")
+            return []
+
+    async def get_champion_baselines(self) -> list:
+        """
+        Récupère tous les sketches de percentiles par champion.
+
+        Returns:
+            Liste de tuples (champion_id, stat, digest)
+        """
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("""
+                    SELECT champion_id, stat, digest
+                    FROM champion_stat_baselines
+                """)
+                return [(row[0], row[1], bytes(row[2])) for row in cursor.fetchall()]
+
+        except Exception as e:
+            logger.error(f"Erreur lors de la récupération des baselines: {e}")
+            return []
+
+    async def is_match_baselined(self, match_id: str) -> bool:
+        """Vérifie si une partie a déjà alimenté les baselines"""
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("""
+                    SELECT EXISTS(SELECT 1 FROM champion_baseline_matches WHERE match_id = %s)
+                """, (match_id,))
+                return cursor.fetchone()[0]
+        except Exception as e:
+            logger.error(f"Erreur lors de la vérification des baselines pour {match_id}: {e}")
+            return False
+
+    async def store_champion_baselines(self, match_id: str, baselines: list) -> bool:
+        """
+        Enregistre les sketches mis à jour par une partie.
+        La partie est marquée comme traitée dans la même transaction pour
+        qu'elle ne soit jamais comptée deux fois.
+
+        Args:
+            match_id: ID Riot de la partie
+            baselines: Liste de tuples (champion_id, stat, sample_count, digest)
+
+        Returns:
+            False si la partie avait déjà été comptée (rien n'est écrit)
+        """
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO champion_baseline_matches (match_id)
+                    VALUES (%s)
+                    ON CONFLICT (match_id) DO NOTHING
+                    RETURNING match_id
+                """, (match_id,))
+
+                if not cursor.fetchone():
+                    self.connection.rollback()
+                    logger.info(f"Match {match_id} déjà comptabilisé dans les baselines")
+                    return False
+
+                execute_values(cursor, """
+                    INSERT INTO champion_stat_baselines (champion_id, stat, sample_count, digest)
+                    VALUES %s
+                    ON CONFLICT (champion_id, stat) DO UPDATE
+                    SET sample_count = EXCLUDED.sample_count,
+                        digest = EXCLUDED.digest,
+                        updated_at = CURRENT_TIMESTAMP
+                """, [(champion_id, stat, count, psycopg2.Binary(digest))
+                      for champion_id, stat, count, digest in baselines])
+
+            self.connection.commit()
+            logger.info(f"Baselines mises à jour pour le match {match_id} ({len(baselines)} sketches)")
+            return True
+
+        except Exception as e:
+            self.connection.rollback()
+            logger.error(f"Erreur lors du stockage des baselines: {e}")
+            return False
+
+    async def get_publish_routes(self) -> list:
+        """
+        Récupère les routes de publication actives.
+
+        Returns:
+            Liste de dictionnaires {id, name, webhook_url, guild_id, player_id}
+        """
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("""
+                    SELECT id, name, webhook_url, guild_id, player_id
+                    FROM publish_routes
+                    WHERE enabled
+                    ORDER BY id
+                """)
+                return [
+                    dict(zip(['id', 'name', 'webhook_url', 'guild_id', 'player_id'], row))
+                    for row in cursor.fetchall()
+                ]
+
+        except Exception as e:
+            logger.error(f"Erreur lors de la récupération des routes de publication: {e}")
+            return []
+
+    async def get_player_guilds(self) -> dict:
+        """
+        Récupère les serveurs Discord de chaque joueur.
+
+        Returns:
+            Dictionnaire {player_id: {guild_id, ...}}
+        """
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("SELECT player_id, guild_id FROM player_guilds")
+                guilds = {}
+                for player_id, guild_id in cursor.fetchall():
+                    guilds.setdefault(player_id, set()).add(guild_id)
+                return guilds
+
+        except Exception as e:
+            logger.error(f"Erreur lors de la récupération des serveurs des joueurs: {e}")
+            return {}
+
+    async def set_publish_route(self, name: str, webhook_url: str, guild_id: str = None,
+                                player_id: int = None) -> bool:
+        """
+        Crée ou remplace une route de publication.
+
+        Args:
+            name: Nom unique de la route (canal de publish_outbox)
+            webhook_url: Webhook Discord de destination
+            guild_id: Publie les parties des joueurs de ce serveur
+            player_id: Publie les parties de ce joueur
+                (sans guild_id ni player_id : toutes les parties)
+        """
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO publish_routes (name, webhook_url, guild_id, player_id)
+                    VALUES (%s, %s, %s, %s)
+                    ON CONFLICT (name) DO UPDATE
+                    SET webhook_url = EXCLUDED.webhook_url,
+                        guild_id = EXCLUDED.guild_id,
+                        player_id = EXCLUDED.player_id,
+                        enabled = TRUE,
+                        updated_at = CURRENT_TIMESTAMP
+                """, (name, webhook_url, guild_id, player_id))
+            self.connection.commit()
+            logger.info(f"Route de publication {name} enregistrée")
+            return True
+
+        except Exception as e:
+            self.connection.rollback()
+            logger.error(f"Erreur lors de l'enregistrement de la route {name}: {e}")
+            return False
+
+    async def disable_publish_route(self, name: str) -> bool:
+        """Désactive une route de publication"""
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("""
+                    UPDATE publish_routes SET enabled = FALSE, updated_at = CURRENT_TIMESTAMP
+                    WHERE name = %s
+                """, (name,))
+                updated = cursor.rowcount > 0
+            self.connection.commit()
+            return updated
+
+        except Exception as e:
+            self.connection.rollback()
+            logger.error(f"Erreur lors de la désactivation de la route {name}: {e}")
+            return False
+
+    async def claim_outbox(self, limit: int = 10, lease_seconds: int = 300) -> list:
+        """
+        Réserve des messages à publier. Plusieurs workers peuvent tourner en
+        parallèle : les lignes déjà réservées sont ignorées (SKIP LOCKED).
+        Un message réservé depuis plus de lease_seconds (worker arrêté) est
+        de nouveau disponible.
+
+        Returns:
+            Liste de dictionnaires {id, match_id, channel, payload, attempts}
+        """
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("""
+                    UPDATE publish_outbox o
+                    SET status = %s, claimed_at = CURRENT_TIMESTAMP, attempts = o.attempts + 1
+                    FROM (
+                        SELECT id FROM publish_outbox
+                        WHERE (status = %s AND next_attempt_at <= CURRENT_TIMESTAMP)
+                           OR (status = %s AND claimed_at < CURRENT_TIMESTAMP - make_interval(secs => %s))
+                        ORDER BY next_attempt_at, id
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                    ) claimed
+                    WHERE o.id = claimed.id
+                    RETURNING o.id, o.match_id, o.channel, o.payload, o.attempts
+                """, (OUTBOX_SENDING, OUTBOX_PENDING, OUTBOX_SENDING, lease_seconds, limit))
+                rows = cursor.fetchall()
+            self.connection.commit()
+            return [
+                {'id': row[0], 'match_id': row[1], 'channel': row[2], 'payload': row[3], 'attempts': row[4]}
+                for row in sorted(rows)
+            ]
+
+        except Exception as e:
+            self.connection.rollback()
+            logger.error(f"Erreur lors de la réservation des messages à publier: {e}")
+            return []
+
+    async def mark_outbox_sent(self, outbox_id: int) -> bool:
+        """Marque un message comme publié"""
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("""
+                    UPDATE publish_outbox
+                    SET status = %s, sent_at = CURRENT_TIMESTAMP, last_error = NULL
+                    WHERE id = %s
+                """, (OUTBOX_SENT, outbox_id))
+            self.connection.commit()
+            return True
+
+        except Exception as e:
+            self.connection.rollback()
+            logger.error(f"Erreur lors de la mise à jour du message {outbox_id}: {e}")
+            return False
+
+    async def mark_outbox_failed(self, outbox_id: int, error: str, retry_in: float = None) -> bool:
+        """
+        Enregistre l'échec d'une publication.
+
+        Args:
+            retry_in: Délai en secondes avant la prochaine tentative,
+                None pour abandonner définitivement
+        """
+        try:
+            with self.connection.cursor() as cursor:
+                if retry_in is None:
+                    cursor.execute("""
+                        UPDATE publish_outbox SET status = %s, last_error = %s WHERE id = %s
+                    """, (OUTBOX_FAILED, error, outbox_id))
+                else:
+                    cursor.execute("""
+                        UPDATE publish_outbox
+                        SET status = %s, last_error = %s,
+                            next_attempt_at = CURRENT_TIMESTAMP + make_interval(secs => %s)
+                        WHERE id = %s
+                    """, (OUTBOX_PENDING, error, retry_in, outbox_id))
+            self.connection.commit()
+            return True
+
+        except Exception as e:
+            self.connection.rollback()
+            logger.error(f"Erreur lors de la mise à jour du message {outbox_id}: {e}")
+            return False
+
     def close(self):
         """Ferme la connexion à la base de données."""
         if self.connection:
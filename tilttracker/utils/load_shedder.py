@@ -0,0 +1,130 @@
+# tilttracker/utils/load_shedder.py
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Tuple
+from tilttracker.utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Qui passe en premier quand les commandes lourdes et l'ingestion se disputent
+# le budget Riot et la base
+PRIORITY_INGEST = 'ingest'
+PRIORITY_COMMANDS = 'commands'
+
+
+class Overloaded(Exception):
+    """Commande refusée immédiatement faute de capacité"""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class LoadShedder:
+    """
+    Limites de concurrence des commandes lourdes (/graph, /register, /stats).
+
+    Une commande est admise ou refusée sans attente : limite globale, limite
+    par utilisateur et délai minimal entre deux appels d'un même utilisateur.
+    Selon la priorité configurée, l'ingestion des parties réduit la limite
+    globale des commandes (priorité à l'ingestion) ou attend que les commandes
+    en cours se terminent (priorité aux commandes).
+    """
+
+    def __init__(self, global_limit: Optional[int] = None, user_limit: Optional[int] = None,
+                 user_cooldown: Optional[float] = None, priority: Optional[str] = None,
+                 ingest_limit: Optional[int] = None, ingest_max_wait: Optional[float] = None,
+                 clock=time.monotonic):
+        self.global_limit = global_limit or int(os.getenv('HEAVY_COMMAND_GLOBAL_CONCURRENCY', '4'))
+        self.user_limit = user_limit or int(os.getenv('HEAVY_COMMAND_USER_CONCURRENCY', '1'))
+        self.user_cooldown = user_cooldown if user_cooldown is not None else \
+            float(os.getenv('HEAVY_COMMAND_USER_COOLDOWN', '3'))
+        self.priority = priority or os.getenv('LOAD_PRIORITY', PRIORITY_INGEST)
+        if self.priority not in (PRIORITY_INGEST, PRIORITY_COMMANDS):
+            raise ValueError(f"LOAD_PRIORITY invalide: {self.priority}")
+        self.ingest_limit = ingest_limit if ingest_limit is not None else \
+            int(os.getenv('HEAVY_COMMAND_CONCURRENCY_DURING_INGEST', '1'))
+        self.ingest_max_wait = ingest_max_wait if ingest_max_wait is not None else \
+            float(os.getenv('INGEST_MAX_WAIT_SECONDS', '30'))
+        self.clock = clock
+
+        self.in_flight = 0
+        self.by_user: Dict[int, int] = {}
+        self.last_started: Dict[Tuple[int, str], float] = {}
+        self.ingesting = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.in_flight_gauge = REGISTRY.gauge('heavy_commands_in_flight', "Commandes lourdes en cours")
+
+    @property
+    def limit(self) -> int:
+        """Limite globale actuelle des commandes lourdes"""
+        if self.priority == PRIORITY_INGEST and self.ingesting:
+            return min(self.ingest_limit, self.global_limit)
+        return self.global_limit
+
+    def _shed(self, command: str, reason: str, message: str, retry_after: float):
+        REGISTRY.counter('heavy_commands_shed_total', "Commandes lourdes refusées",
+                         command=command, reason=reason).inc()
+        logger.info(f"Commande /{command} refusée ({reason})")
+        raise Overloaded(message, retry_after)
+
+    def admit(self, user_id: int, command: str) -> None:
+        """Réserve une place pour la commande ou lève Overloaded"""
+        now = self.clock()
+        last = self.last_started.get((user_id, command))
+        if last is not None and now - last < self.user_cooldown:
+            self._shed(command, 'cooldown', "Doucement, cette commande vient d'être lancée.",
+                       self.user_cooldown - (now - last))
+        if self.by_user.get(user_id, 0) >= self.user_limit:
+            self._shed(command, 'user', "Une de tes commandes est déjà en cours.", 2.0)
+        if self.in_flight >= self.limit:
+            self._shed(command, 'global', "Le bot est très sollicité en ce moment.", 5.0)
+
+        self.in_flight += 1
+        self.by_user[user_id] = self.by_user.get(user_id, 0) + 1
+        self.last_started[(user_id, command)] = now
+        if len(self.last_started) > 1000:
+            self.last_started = {key: started for key, started in self.last_started.items()
+                                 if now - started < self.user_cooldown}
+        self._idle.clear()
+        self.in_flight_gauge.set(self.in_flight)
+
+    def release(self, user_id: int) -> None:
+        self.in_flight -= 1
+        remaining = self.by_user.get(user_id, 1) - 1
+        if remaining:
+            self.by_user[user_id] = remaining
+        else:
+            self.by_user.pop(user_id, None)
+        if not self.in_flight:
+            self._idle.set()
+        self.in_flight_gauge.set(self.in_flight)
+
+    @asynccontextmanager
+    async def command(self, user_id: int, command: str):
+        """Exécute une commande lourde si elle est admise"""
+        self.admit(user_id, command)
+        try:
+            yield
+        finally:
+            self.release(user_id)
+
+    @asynccontextmanager
+    async def ingest(self):
+        """Traitement d'une partie par le watcher"""
+        if self.priority == PRIORITY_COMMANDS and not self._idle.is_set():
+            # Laisser passer les commandes en cours, sans bloquer l'ingestion indéfiniment
+            try:
+                await asyncio.wait_for(self._idle.wait(), self.ingest_max_wait)
+            except asyncio.TimeoutError:
+                logger.warning("Ingestion reprise malgré des commandes lourdes en cours")
+        self.ingesting += 1
+        try:
+            yield
+        finally:
+            self.ingesting -= 1
@@ -0,0 +1,173 @@
+# tilttracker/utils/metrics.py
+import bisect
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# Bornes par défaut des histogrammes de durées (secondes)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _label_key(labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: Tuple[Tuple[str, str], ...], extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(key) + ([extra] if extra else [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+
+
+class Counter:
+    """Compteur monotone"""
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+
+class Gauge:
+    """Valeur instantanée"""
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Histogram:
+    """Histogramme à bornes fixes (cumulatif au rendu, comme Prometheus)"""
+    __slots__ = ('buckets', 'counts', 'sum', 'count', '_lock')
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.sum += value
+            self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimation d'un quantile (borne supérieure du bucket atteint)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float('inf')
+
+
+class MetricsRegistry:
+    """
+    Registre des métriques du processus. Une métrique est identifiée par son
+    nom et ses labels ; elle est créée au premier appel.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, kind: type, name: str, help_text: str, labels: Dict[str, str], **kwargs):
+        with self._lock:
+            family = self._metrics.setdefault(name, {'type': kind, 'help': help_text, 'children': {}})
+            if family['type'] is not kind:
+                raise ValueError(f"Métrique {name} déjà déclarée avec un autre type")
+            key = _label_key(labels)
+            if key not in family['children']:
+                family['children'][key] = kind(**kwargs)
+            return family['children'][key]
+
+    def counter(self, name: str, help_text: str = "", **labels) -> Counter:
+        return self._get(Counter, name, help_text, labels)
+
+    def gauge(self, name: str, help_text: str = "", **labels) -> Gauge:
+        return self._get(Gauge, name, help_text, labels)
+
+    def histogram(self, name: str, help_text: str = "", buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+                  **labels) -> Histogram:
+        return self._get(Histogram, name, help_text, labels, buckets=buckets)
+
+    def snapshot(self) -> Dict[str, List[Dict]]:
+        """Valeurs actuelles, par métrique puis par combinaison de labels"""
+        result = {}
+        with self._lock:
+            families = {name: dict(family['children']) for name, family in self._metrics.items()}
+        for name, children in families.items():
+            entries = []
+            for key, metric in children.items():
+                entry = {'labels': dict(key)}
+                if isinstance(metric, Histogram):
+                    entry.update({
+                        'count': metric.count,
+                        'sum': metric.sum,
+                        'p50': metric.quantile(0.5),
+                        'p95': metric.quantile(0.95),
+                        'p99': metric.quantile(0.99),
+                    })
+                else:
+                    entry['value'] = metric.value
+                entries.append(entry)
+            result[name] = entries
+        return result
+
+    def render(self) -> str:
+        """Format texte Prometheus"""
+        lines = []
+        with self._lock:
+            families = [(name, family['type'], family['help'], dict(family['children']))
+                        for name, family in sorted(self._metrics.items())]
+        for name, kind, help_text, children in families:
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind.__name__.lower()}")
+            for key, metric in children.items():
+                if isinstance(metric, Histogram):
+                    cumulative = 0
+                    for bound, count in zip(metric.buckets + (float('inf'),), metric.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float('inf') else repr(bound)
+                        lines.append(f"{name}_bucket{_format_labels(key, ('le', le))} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {metric.sum}")
+                    lines.append(f"{name}_count{_format_labels(key)} {metric.count}")
+                else:
+                    lines.append(f"{name}{_format_labels(key)} {metric.value}")
+        return "\n".join(lines) + "\n"
+
+
+# Registre partagé par tout le processus
+REGISTRY = MetricsRegistry()
+
+
+async def start_metrics_server(port: int, host: str = '0.0.0.0', registry: MetricsRegistry = REGISTRY):
+    """
+    Expose le registre au format Prometheus sur GET /metrics.
+
+    Returns:
+        Le runner aiohttp, à nettoyer (cleanup()) à l'arrêt
+    """
+    from aiohttp import web
+
+    async def metrics(request):
+        return web.Response(text=registry.render(), content_type='text/plain', charset='utf-8')
+
+    app = web.Application()
+    app.router.add_get('/metrics', metrics)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
@@ -0,0 +1,63 @@
+# tilttracker/utils/riot_id_index.py
+import bisect
+from typing import Iterable, List, Tuple
+
+
+class RiotIdIndex:
+    """
+    Index en mémoire des Riot ID inscrits (nom#tag) pour l'autocomplétion.
+
+    Tableau trié de clés en minuscules : une recherche par préfixe est une
+    bisection suivie d'un parcours des résultats, sans requête SQL.
+    """
+
+    def __init__(self, riot_ids: Iterable[Tuple[str, str]] = ()):
+        self._keys: List[str] = []
+        self._ids: List[Tuple[str, str]] = []
+        self.load(riot_ids)
+
+    @staticmethod
+    def _key(summoner_name: str, tag_line: str) -> str:
+        return f"{summoner_name}#{tag_line}".casefold()
+
+    def load(self, riot_ids: Iterable[Tuple[str, str]]) -> None:
+        """Remplace le contenu de l'index"""
+        entries = sorted({self._key(name, tag): (name, tag) for name, tag in riot_ids}.items())
+        self._keys = [key for key, _ in entries]
+        self._ids = [riot_id for _, riot_id in entries]
+
+    def add(self, summoner_name: str, tag_line: str) -> None:
+        """Ajoute (ou met à jour) un Riot ID"""
+        key = self._key(summoner_name, tag_line)
+        position = bisect.bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            self._ids[position] = (summoner_name, tag_line)
+            return
+        self._keys.insert(position, key)
+        self._ids.insert(position, (summoner_name, tag_line))
+
+    def remove(self, summoner_name: str, tag_line: str) -> None:
+        """Retire un Riot ID (renommage), sans effet s'il est absent"""
+        key = self._key(summoner_name, tag_line)
+        position = bisect.bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            del self._keys[position]
+            del self._ids[position]
+
+    def search(self, prefix: str, limit: int = 25) -> List[Tuple[str, str]]:
+        """Riot ID commençant par le préfixe (nom, ou nom#début du tag)"""
+        prefix = prefix.casefold()
+        position = bisect.bisect_left(self._keys, prefix)
+        results = []
+        while position < len(self._keys) and len(results) < limit and self._keys[position].startswith(prefix):
+            results.append(self._ids[position])
+            position += 1
+        return results
+
+    def tags_for(self, summoner_name: str, prefix: str = "", limit: int = 25) -> List[str]:
+        """Tags connus pour un nom d'invocateur exact"""
+        return [tag for name, tag in self.search(f"{summoner_name}#{prefix}", limit)
+                if name.casefold() == summoner_name.casefold()]
+
+    def __len__(self) -> int:
+        return len(self._keys)
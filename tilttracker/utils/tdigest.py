@@ -0,0 +1,205 @@
+import math
+import struct
+from array import array
+from typing import List, Optional, Tuple
+
+# En-tête binaire : compression, nombre d'échantillons, min, max, nombre de centroïdes
+_HEADER = struct.Struct('<dddd I')
+
+
+class TDigest:
+    """
+    Sketch de quantiles en flux (t-digest "merging").
+
+    Les valeurs sont accumulées dans un buffer puis fusionnées en centroïdes
+    dont la taille est bornée par la fonction d'échelle k1 : les queues de
+    distribution restent précises tandis que le centre est plus compressé.
+    La taille mémoire est en O(compression) quel que soit le nombre de valeurs.
+    """
+
+    __slots__ = ('compression', 'means', 'weights', 'count', 'min', 'max', '_buffer')
+
+    def __init__(self, compression: float = 100):
+        self.compression = compression
+        self.means: List[float] = []
+        self.weights: List[float] = []
+        self.count = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer: List[Tuple[float, float]] = []
+
+    def update(self, value: float, weight: float = 1.0) -> None:
+        """Ajoute une valeur au sketch"""
+        value = float(value)
+        self._buffer.append((value, weight))
+        self.count += weight
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self._buffer) >= self.compression * 4:
+            self.compress()
+
+    def merge(self, other: 'TDigest') -> None:
+        """Fusionne un autre sketch dans celui-ci"""
+        other.compress()
+        self._buffer.extend(zip(other.means, other.weights))
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.compress()
+
+    def _k(self, q: float) -> float:
+        q = min(max(q, 0.0), 1.0)
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def compress(self) -> None:
+        """Fusionne le buffer dans les centroïdes"""
+        if not self._buffer:
+            return
+
+        items = sorted(list(zip(self.means, self.weights)) + self._buffer)
+        self._buffer = []
+
+        means = []
+        weights = []
+        cur_mean, cur_weight = items[0]
+        cumulative = 0.0
+        k_left = self._k(0.0)
+        for mean, weight in items[1:]:
+            q_right = (cumulative + cur_weight + weight) / self.count
+            if self._k(q_right) - k_left <= 1.0:
+                cur_weight += weight
+                cur_mean += (mean - cur_mean) * weight / cur_weight
+            else:
+                means.append(cur_mean)
+                weights.append(cur_weight)
+                cumulative += cur_weight
+                k_left = self._k(cumulative / self.count)
+                cur_mean, cur_weight = mean, weight
+        means.append(cur_mean)
+        weights.append(cur_weight)
+
+        self.means = means
+        self.weights = weights
+
+    def _points(self) -> Tuple[List[float], List[float]]:
+        """
+        Fonction de répartition linéaire par morceaux :
+        (min, 0), puis le centre de chaque centroïde, puis (max, 1).
+        """
+        self.compress()
+        xs = [self.min]
+        ps = [0.0]
+        cumulative = 0.0
+        for mean, weight in zip(self.means, self.weights):
+            center = (cumulative + weight / 2) / self.count
+            if mean > xs[-1]:
+                xs.append(mean)
+                ps.append(center)
+            else:
+                ps[-1] = max(ps[-1], center)
+            cumulative += weight
+        if self.max > xs[-1]:
+            xs.append(self.max)
+            ps.append(1.0)
+        else:
+            ps[-1] = 1.0
+        return xs, ps
+
+    def cdf(self, value: float) -> float:
+        """Proportion estimée des valeurs inférieures ou égales à `value` (0-1)"""
+        if not self.count:
+            return 0.5
+        if value < self.min:
+            return 0.0
+        if value >= self.max:
+            return 1.0
+
+        xs, ps = self._points()
+        for i in range(1, len(xs)):
+            if value < xs[i]:
+                ratio = (value - xs[i - 1]) / (xs[i] - xs[i - 1])
+                return ps[i - 1] + (ps[i] - ps[i - 1]) * ratio
+        return 1.0
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Valeur estimée du quantile `q` (0-1)"""
+        if not self.count:
+            return None
+        xs, ps = self._points()
+        if len(xs) == 1:
+            return xs[0]
+        q = min(max(q, 0.0), 1.0)
+        for i in range(1, len(ps)):
+            if q <= ps[i]:
+                if ps[i] == ps[i - 1]:
+                    return xs[i]
+                ratio = (q - ps[i - 1]) / (ps[i] - ps[i - 1])
+                return xs[i - 1] + (xs[i] - xs[i - 1]) * ratio
+        return xs[-1]
+
+    def percentile_table(self, resolution: int = 128) -> 'PercentileTable':
+        """Construit une table de correspondance valeur -> percentile en O(1)"""
+        return PercentileTable(self, resolution)
+
+    def to_bytes(self) -> bytes:
+        """Sérialise le sketch (centroïdes en float32)"""
+        self.compress()
+        header = _HEADER.pack(self.compression, self.count, self.min, self.max, len(self.means))
+        return header + array('f', self.means).tobytes() + array('f', self.weights).tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'TDigest':
+        """Reconstruit un sketch sérialisé avec to_bytes"""
+        compression, count, min_value, max_value, size = _HEADER.unpack_from(data)
+        offset = _HEADER.size
+        means = array('f')
+        means.frombytes(data[offset:offset + size * 4])
+        weights = array('f')
+        weights.frombytes(data[offset + size * 4:offset + size * 8])
+
+        digest = cls(compression)
+        digest.means = list(means)
+        digest.weights = list(weights)
+        digest.count = count
+        digest.min = min_value
+        digest.max = max_value
+        return digest
+
+
+class PercentileTable:
+    """
+    Table précalculée de la fonction de répartition d'un TDigest sur une
+    grille régulière entre min et max. Une recherche se fait en O(1) :
+    calcul de l'indice de case puis interpolation linéaire.
+    """
+
+    __slots__ = ('low', 'high', 'inv_step', 'values')
+
+    def __init__(self, digest: TDigest, resolution: int = 128):
+        self.low = digest.min
+        self.high = digest.max
+        width = self.high - self.low
+        if not digest.count or width <= 0:
+            self.inv_step = 0.0
+            self.values = array('d', [50.0, 50.0])
+            return
+
+        step = width / resolution
+        self.inv_step = 1 / step
+        self.values = array('d', (digest.cdf(self.low + i * step) * 100 for i in range(resolution)))
+        self.values.append(100.0)
+
+    def lookup(self, value: float) -> float:
+        """Percentile (0-100) de `value`"""
+        if not self.inv_step:
+            return self.values[0]
+        if value <= self.low:
+            return 0.0
+        if value >= self.high:
+            return 100.0
+        position = (value - self.low) * self.inv_step
+        index = int(position)
+        lower = self.values[index]
+        return lower + (self.values[index + 1] - lower) * (position - index)